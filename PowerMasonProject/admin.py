@@ -1,5 +1,161 @@
-from django.contrib import admin
-from .models import Project
+"""
+Admin for large project tables.
+
+Nothing on the changelist scans the table:
+
+* the location and month filters list their choices from the portfolio
+  summary rows (cached per ``PROJECTS`` version) instead of ``SELECT
+  DISTINCT`` over every project;
+* the paginator takes the row count from the same summary rows when the
+  list is unfiltered or filtered on one status, location or month, unless
+  they say 0.  Otherwise it counts at most ``COUNT_LIMIT`` rows, or up to one row past
+  the requested page when that is further; a count stopped at its limit is
+  shown as "N+" and the next page stays reachable, so every row can be
+  paged to.  The second, unfiltered count for "x of y selected" is
+  switched off;
+* search is a case-insensitive prefix match on ``proj_id``, ``name`` and
+  ``location``, written as a range over ``LOWER(column)`` so any backend
+  can use the functional indexes on those expressions;
+* the actions (status recompute, export) run on the whole selection in a
+  few statements, and facet counts are off.
+"""
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import (
+    ALL_VAR, ERROR_FLAG, IS_FACETS_VAR, IS_POPUP_VAR, ORDER_VAR, PAGE_VAR, SEARCH_VAR, TO_FIELD_VAR,
+)
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils.functional import cached_property
+
+from .caching import PROJECTS, cached
+from .exports import export_response
+from .models import PortfolioSummary, Project
+from .portfolio import SUMMARY_FIELDS, apply_project_changes, summary_count, summary_keys, summary_values
+from .status import refresh_statuses
+
+# Filtered changelists count at least this many rows before giving up
+COUNT_LIMIT = 10_000
+# Sorts after every character, closing a prefix range
+PREFIX_END = "\U0010ffff"
+PREFIX_SEARCH_FIELDS = ("proj_id", "name", "location")
+# Query parameter of the "unspecified" choice of a summary filter
+UNSPECIFIED = "__none__"
+
+
+class SummaryListFilter(admin.SimpleListFilter):
+    """
+    Filter on a project field whose values are keys of a ``PortfolioSummary``
+    dimension.
+    """
+    dimension = None
+    field_name = None
+
+    def lookups(self, request, model_admin):
+        keys = cached(PROJECTS, f"admin_choices_{self.dimension}", lambda: summary_keys(self.dimension))
+        return [(key or UNSPECIFIED, key or "Unspecified") for key in keys]
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if not value:
+            return queryset
+        if value == UNSPECIFIED:
+            return queryset.filter(Q(**{f"{self.field_name}__isnull": True}) | Q(**{self.field_name: ""}))
+        return queryset.filter(**{self.field_name: value})
+
+
+class LocationFilter(SummaryListFilter):
+    title = "location"
+    parameter_name = "location"
+    dimension = PortfolioSummary.LOCATION
+    field_name = "location"
+
+
+class MonthFilter(SummaryListFilter):
+    title = "progress report month"
+    parameter_name = "month"
+    dimension = PortfolioSummary.MONTH
+    field_name = "progress_report_month_year"
+
+
+# Changelist filter parameter -> summary dimension counting its rows
+SUMMARY_FILTERS = {
+    "status__exact": PortfolioSummary.STATUS,
+    LocationFilter.parameter_name: PortfolioSummary.LOCATION,
+    MonthFilter.parameter_name: PortfolioSummary.MONTH,
+}
+# Changelist parameters that do not filter (search is checked separately)
+NON_FILTER_PARAMS = {ALL_VAR, ERROR_FLAG, IS_FACETS_VAR, IS_POPUP_VAR, ORDER_VAR, PAGE_VAR, SEARCH_VAR, TO_FIELD_VAR}
+
+
+class SummaryCountPaginator(Paginator):
+    """
+    Paginator taking a known row count, or counting at most ``count_limit``
+    rows of the queryset.  A count that reaches the limit is a lower bound
+    (``count_is_lower_bound``).
+
+    A known count of 0 is counted too: an empty summary may just be stale
+    (projects written without ``apply_project_changes``), and counting the
+    rows of an empty table costs nothing.
+    """
+
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True, known_count=None,
+                 count_limit=COUNT_LIMIT):
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page)
+        self.known_count = known_count
+        self.count_limit = count_limit
+
+    @cached_property
+    def count(self):
+        if self.known_count:
+            return self.known_count
+        return self.object_list.order_by()[:self.count_limit].count()
+
+    @property
+    def count_is_lower_bound(self):
+        return not self.known_count and self.count >= self.count_limit
+
+
+def _count_limit(params, per_page):
+    """
+    ``COUNT_LIMIT``, or enough rows to reach one row past the requested page.
+    """
+    try:
+        page = max(int(params.get(PAGE_VAR, 1)), 1)
+    except ValueError:
+        page = 1
+    return max(COUNT_LIMIT, page * per_page + 1)
+
+
+def _known_count(params):
+    """
+    The changelist's row count when the summary rows hold it exactly.
+    """
+    filters = {name: value for name, value in params.items() if name not in NON_FILTER_PARAMS}
+    if not filters:
+        return summary_count()
+    if len(filters) == 1:
+        (name, value), = filters.items()
+        if name in SUMMARY_FILTERS:
+            return summary_count(SUMMARY_FILTERS[name], "" if value == UNSPECIFIED else value)
+    return None
+
+
+@admin.action(description="Recompute the status of the selected projects")
+def recompute_status(modeladmin, request, queryset):
+    changed = refresh_statuses(queryset)
+    modeladmin.message_user(request, f"{len(changed)} project status(es) changed.", messages.SUCCESS)
+
+
+@admin.action(description="Export the selected projects to CSV")
+def export_csv(modeladmin, request, queryset):
+    return export_response("projects", "csv", {}, projects=queryset)
+
+
+@admin.action(description="Export the selected projects to Excel")
+def export_xlsx(modeladmin, request, queryset):
+    return export_response("projects", "xlsx", {}, projects=queryset)
+
 
 class ProjectAdmin(admin.ModelAdmin):
     # Fields to display in the admin list view
@@ -14,14 +170,25 @@ class ProjectAdmin(admin.ModelAdmin):
         "accomplished_before_period",
         "accomplished_this_period",
         "approved_contract",
-        "total_expense"
+        "total_expense",
+        "status",
+        "created_by",
     )
+    list_select_related = ("created_by",)
+    # Served by the (start_date, id) indexes, alone or behind a filter
+    ordering = ("-start_date", "-id")
 
     # Fields to filter by in the admin interface
-    list_filter = ("start_date", "report_date", "location", "progress_report_month_year") # Add to filters
+    list_filter = ("status", "start_date", "report_date", LocationFilter, MonthFilter)
 
-    # Fields to search by in the admin interface
-    search_fields = ("proj_id", "name", "location", "progress_report_month_year") # Add to search fields
+    # Fields to search by in the admin interface; see get_search_results
+    search_fields = PREFIX_SEARCH_FIELDS
+    search_help_text = "Project ID, name or location prefix."
+
+    show_full_result_count = False
+    # Facet counts would run a COUNT per filter choice
+    show_facets = admin.ShowFacets.NEVER
+    actions = (recompute_status, export_csv, export_xlsx)
 
     # Fields to display in the detail view when editing a Project
     fieldsets = (
@@ -46,5 +213,38 @@ class ProjectAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        term = term.lower()
+        condition = Q()
+        for field in PREFIX_SEARCH_FIELDS:
+            condition |= Q(**{f"{field}_lower__gte": term, f"{field}_lower__lt": term + PREFIX_END})
+        lowered = {f"{field}_lower": Lower(field) for field in PREFIX_SEARCH_FIELDS}
+        return queryset.alias(**lowered).filter(condition), False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        known_count = None if request.GET.get(SEARCH_VAR) else _known_count(request.GET)
+        return SummaryCountPaginator(queryset, per_page, orphans, allow_empty_first_page, known_count=known_count,
+                                     count_limit=_count_limit(request.GET, per_page))
+
+    # Keep the dashboard's portfolio aggregates in step with admin edits
+    def save_model(self, request, obj, form, change):
+        old = summary_values(Project.objects.get(pk=obj.pk)) if change else None
+        super().save_model(request, obj, form, change)
+        apply_project_changes([(old, summary_values(obj))])
+
+    def delete_model(self, request, obj):
+        old = summary_values(obj)
+        super().delete_model(request, obj)
+        apply_project_changes([(old, None)])
+
+    def delete_queryset(self, request, queryset):
+        # The changelist queryset joins created_by, which only() would defer
+        old = [summary_values(project) for project in queryset.select_related(None).only(*SUMMARY_FIELDS)]
+        super().delete_queryset(request, queryset)
+        apply_project_changes([(values, None) for values in old])
+
 # Register your Project model with the ProjectAdmin configuration
 admin.site.register(Project, ProjectAdmin)
\ No newline at end of file
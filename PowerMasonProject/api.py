@@ -0,0 +1,220 @@
+"""
+Read-only JSON API over the project portfolio.
+
+``api/projects/`` returns one keyset page at a time with field selection,
+the project-list filters and cursor links.  ``api/projects/export/`` streams
+the whole (filtered) portfolio from a server-side iterator, so memory stays
+flat whatever the row count.  Both are gzip-compressed for clients that
+accept it.  ``api/costs/`` totals the imported cost line items per project,
+category or month (see ``costs``).  ``api/estimate/`` answers cost
+estimates from the fitted estimator (see ``estimation``).
+``api/cache/`` reports the view cache's hit and miss counters.
+"""
+from urllib.parse import urlencode
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import require_GET
+
+from .caching import PROJECTS, cache_stats, cached
+from .costs import COST_AGGREGATIONS, COST_GROUPS
+from .estimation import budget_param, estimate
+from .filters import date_param, filter_projects
+from .models import Project
+from .pagination import DEFAULT_PAGE_SIZE, keyset_page
+
+# Fields clients may select; the default is all of them
+API_FIELDS = (
+    "proj_id",
+    "name",
+    "location",
+    "status",
+    "start_date",
+    "end_date",
+    "report_date",
+    "progress_report_month_year",
+    "accomplished_to_date",
+    "accomplished_before_period",
+    "accomplished_this_period",
+    "approved_contract",
+    "total_expense",
+    "updated_at",
+)
+API_SORTS = ("proj_id", "start_date", "report_date", "updated_at")
+API_DEFAULT_SORT = "proj_id"
+
+# Rows fetched per database round trip and serialized per streamed chunk
+EXPORT_CHUNK_SIZE = 2000
+
+COST_DEFAULT_LIMIT = 100
+
+
+class APIError(Exception):
+    pass
+
+
+def _selected_fields(params):
+    requested = [name.strip() for name in params.get("fields", "").split(",") if name.strip()]
+    unknown = [name for name in requested if name not in API_FIELDS]
+    if unknown:
+        raise APIError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(API_FIELDS)}.")
+    return requested or list(API_FIELDS)
+
+
+def _sort(params):
+    sort = params.get("sort", API_DEFAULT_SORT)
+    if sort.lstrip("-") not in API_SORTS:
+        raise APIError(f"Cannot sort by '{sort}'. Available: {', '.join(API_SORTS)} (prefix '-' to reverse).")
+    return sort
+
+
+def _error(message):
+    return JsonResponse({"error": message}, status=400)
+
+
+@gzip_page
+@require_GET
+def project_collection(request):
+    """
+    One page of projects.  Query parameters: ``fields`` (comma separated),
+    ``sort``, ``per_page``, the project-list filters, and the ``after`` /
+    ``before`` cursors from the ``next`` / ``previous`` links.
+    """
+    params = request.GET
+    try:
+        fields = _selected_fields(params)
+        sort = _sort(params)
+        per_page = int(params.get("per_page", DEFAULT_PAGE_SIZE))
+    except APIError as e:
+        return _error(str(e))
+    except ValueError:
+        return _error("per_page must be an integer.")
+
+    field_name = sort.lstrip("-")
+    queryset, filters = filter_projects(Project.objects.only(*set(fields) | {field_name}), params)
+    page = keyset_page(
+        queryset, field_name, descending=sort.startswith("-"),
+        after=params.get("after"), before=params.get("before"), per_page=per_page,
+    )
+
+    base = dict(filters, sort=sort, per_page=per_page)
+    if "fields" in params:
+        base["fields"] = ",".join(fields)
+
+    def link(**cursor):
+        return request.build_absolute_uri(f"{request.path}?{urlencode(dict(base, **cursor))}")
+
+    return JsonResponse({
+        "results": [{name: getattr(project, name) for name in fields} for project in page["items"]],
+        "next": link(after=page["next_cursor"]) if page["next_cursor"] else None,
+        "previous": link(before=page["previous_cursor"]) if page["previous_cursor"] else None,
+    })
+
+
+def iter_export(queryset, fields, lines=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield the rows of ``queryset`` as encoded JSON, ``chunk_size`` rows per
+    chunk: one array, or one object per line with ``lines``.
+    """
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+    rows = queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+    chunk = [] if lines else ["["]
+    for index, row in enumerate(rows):
+        text = encoder.encode(dict(zip(fields, row)))
+        if lines:
+            chunk.append(text + "\n")
+        else:
+            chunk.append("," + text if index else text)
+        if len(chunk) >= chunk_size:
+            yield "".join(chunk).encode()
+            chunk = []
+    if not lines:
+        chunk.append("]")
+    if chunk:
+        yield "".join(chunk).encode()
+
+
+@gzip_page
+@require_GET
+def project_export(request):
+    """
+    The whole filtered portfolio as one streamed download.  ``format=ndjson``
+    gives JSON Lines instead of an array; ``fields`` and the filters work as
+    for the collection.
+    """
+    params = request.GET
+    try:
+        fields = _selected_fields(params)
+        sort = _sort(params)
+    except APIError as e:
+        return _error(str(e))
+    lines = params.get("format") == "ndjson"
+
+    tiebreak = "-pk" if sort.startswith("-") else "pk"
+    queryset, _ = filter_projects(Project.objects.order_by(sort, tiebreak), params)
+    response = StreamingHttpResponse(
+        iter_export(queryset, fields, lines=lines),
+        content_type="application/x-ndjson" if lines else "application/json",
+    )
+    response["Content-Disposition"] = f'attachment; filename="projects.{"ndjson" if lines else "json"}"'
+    return response
+
+
+def _cost_params(params):
+    group = params.get("group", COST_GROUPS[0])
+    if group not in COST_GROUPS:
+        raise APIError(f"Cannot group by '{group}'. Available: {', '.join(COST_GROUPS)}.")
+    try:
+        limit = int(params.get("limit", COST_DEFAULT_LIMIT))
+    except ValueError:
+        raise APIError("limit must be an integer.")
+    filters = {
+        "start": date_param(params, "start"),
+        "end": date_param(params, "end"),
+        "category": params.get("category") or None,
+        "proj_id": params.get("proj_id") or None,
+    }
+    return group, max(limit, 0), filters
+
+
+@gzip_page
+@require_GET
+def cost_summary(request):
+    """
+    Cost line item totals: item count, contract amount and expense per
+    ``group`` (``project``, ``category`` or ``period``), at most ``limit``
+    rows.  ``start`` / ``end`` (report dates, ``YYYY-MM-DD``), ``category``
+    and ``proj_id`` narrow the items.
+    """
+    try:
+        group, limit, filters = _cost_params(request.GET)
+    except APIError as e:
+        return _error(str(e))
+
+    params = dict(filters, group=group, limit=limit)
+    results = cached(PROJECTS, "api_costs", lambda: COST_AGGREGATIONS[group](limit, **filters), params)
+    return JsonResponse({"group": group, "results": results})
+
+
+@require_GET
+def project_estimate(request):
+    """
+    Estimated cost at completion for an approved contract of ``budget`` at
+    ``location`` (optional), with a low-high range, the number of projects
+    it was fitted on and whether the location's own line was used.  It is
+    null while too few projects are known.
+    """
+    budget = budget_param(request.GET)
+    if budget is None:
+        return _error("budget must be a positive amount.")
+    location = request.GET.get("location") or None
+    return JsonResponse({"budget": budget, "location": location, **estimate(budget, location)})
+
+
+@require_GET
+def cache_statistics(request):
+    """
+    Hit and miss counters of the view cache in this server process.
+    """
+    return JsonResponse({"namespaces": cache_stats()})
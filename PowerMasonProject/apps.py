@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PowermasonprojectConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'PowerMasonProject'
+
+    def ready(self):
+        # Connect the cache invalidation and query counting signal handlers
+        from . import caching, instrumentation  # noqa: F401
@@ -0,0 +1,145 @@
+"""
+Performance benchmarks for PowerMason.
+
+Each module in this package exposes ``run(size, repeat)`` returning a list of
+result dicts; they are executed with ``python manage.py benchmark <name>``.
+``suite`` runs the import-path benchmarks together.  With ``--json PATH`` each
+run is appended to a JSON Lines history keyed by git commit, and every result
+is compared with the latest run of it at another commit.
+"""
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def measure(func, *args, repeat=3, **kwargs):
+    """
+    Call ``func`` ``repeat`` times and report the best wall time in seconds and
+    the largest peak of traced Python memory in bytes.
+    """
+    best = None
+    peak = 0
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        tracemalloc.start()
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        best = elapsed if best is None else min(best, elapsed)
+    return {"seconds": best, "peak_bytes": peak, "result": result}
+
+
+@contextmanager
+def scratch_database(on_disk=False):
+    """
+    Point the default connection at a throwaway test database (in memory for
+    SQLite) for benchmarks that need to write rows.
+
+    ``on_disk`` puts a SQLite test database in a temporary file instead, for
+    benchmarks writing from several threads at once: the shared in-memory
+    database fails them with "database table is locked" rather than waiting.
+    """
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    test_settings = connection.settings_dict["TEST"]
+    old_test_name = test_settings.get("NAME")
+    with tempfile.TemporaryDirectory() as directory:
+        if on_disk and connection.vendor == "sqlite":
+            test_settings["NAME"] = os.path.join(directory, "benchmark.sqlite3")
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            test_settings["NAME"] = old_test_name
+
+
+def peak_rss_bytes():
+    """
+    High-water mark of this process's resident set size, or None where the
+    platform cannot tell.  It never goes down, so measure the cheap cases first.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_commit():
+    """
+    ``(short hash, dirty)`` of the checkout, or ``(None, False)`` outside git.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=root, capture_output=True, text=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return commit, bool(status.strip())
+
+
+def load_history(path):
+    """
+    The recorded runs in the JSON Lines file at ``path``, oldest first.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def record_run(path, benchmark, size, repeat, results):
+    """
+    Append a run to the history at ``path`` and return it.
+    """
+    commit, dirty = current_commit()
+    run = {
+        "benchmark": benchmark,
+        "size": size,
+        "repeat": repeat,
+        "commit": commit,
+        "dirty": dirty,
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(json.dumps(run, sort_keys=True) + "\n")
+    return run
+
+
+def baseline_results(history, benchmark, size, commit):
+    """
+    Result name -> ``(seconds, commit)`` from the latest clean run of
+    ``benchmark`` at ``size`` recorded at a commit other than ``commit``.
+    """
+    baseline = {}
+    for run in history:
+        if run["benchmark"] != benchmark or run["size"] != size or run["commit"] == commit or run["dirty"]:
+            continue
+        for result in run["results"]:
+            baseline[result["name"]] = (result["seconds"], run["commit"])
+    return baseline
@@ -0,0 +1,86 @@
+"""
+Benchmark: the project changelist with the previous admin configuration
+(``SELECT DISTINCT`` filter choices, ``icontains`` search over four columns,
+full counts) versus ``ProjectAdmin``, unfiltered, filtered on a location and
+searched.  Times whole requests, rendering included, and reports the
+queries each one ran and their share of the time.  Runs in a scratch
+database.
+"""
+import random
+import time
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from . import scratch_database
+from ..admin import ProjectAdmin
+from ..models import Project
+from ..portfolio import rebuild_portfolio_summary
+from .api import synthetic_projects
+
+
+class LegacyProjectAdmin(admin.ModelAdmin):
+    list_display = (
+        "proj_id", "name", "location", "start_date", "report_date", "progress_report_month_year",
+        "accomplished_to_date", "accomplished_before_period", "accomplished_this_period",
+        "approved_contract", "total_expense",
+    )
+    list_filter = ("start_date", "report_date", "location", "progress_report_month_year")
+    search_fields = ("proj_id", "name", "location", "progress_report_month_year")
+
+
+def _projects(count):
+    rng = random.Random(4)
+    for project in synthetic_projects(0, count):
+        project.progress_report_month_year = f"{rng.choice(['JANUARY', 'JUNE', 'DECEMBER'])} {rng.randint(2019, 2024)}"
+        yield project
+
+
+def _changelist(model_admin, request, repeat):
+    best = None
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = model_admin.changelist_view(request)
+            response.render()
+            seconds = time.perf_counter() - started
+        if best is None or seconds < best[0]:
+            best = (seconds, queries.captured_queries, len(response.content))
+    seconds, queries, size = best
+    return {"seconds": seconds, "bytes": size, "queries": len(queries),
+            "sql_ms": sum(float(query["time"]) for query in queries) * 1000}
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of projects (at most 1000000).
+    """
+    size = min(size, 1_000_000)
+    results = []
+    with scratch_database():
+        Project.objects.bulk_create(_projects(size), batch_size=5000)
+        rebuild_portfolio_summary()
+        user = User.objects.create_superuser("benchmark", "benchmark@example.com", "benchmark")
+        location = Project.objects.values_list("location", flat=True).first()
+        factory = RequestFactory()
+        site = admin.AdminSite()
+
+        for query_name, params in (
+            ("list", {}),
+            ("location", {"location": location}),
+            ("search", {"q": "Synthetic project 12"}),
+        ):
+            for admin_name, model_admin in (
+                ("legacy", LegacyProjectAdmin(Project, site)),
+                ("optimized", ProjectAdmin(Project, site)),
+            ):
+                request = factory.get("/admin/PowerMasonProject/project/", params)
+                request.user = user
+                # The first request fills the filter choice cache
+                _changelist(model_admin, request, 1)
+                results.append({"name": f"admin.{query_name}.{admin_name}", "size": size,
+                                **_changelist(model_admin, request, repeat)})
+    return results
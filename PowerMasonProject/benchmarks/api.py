@@ -0,0 +1,70 @@
+"""
+Benchmark: memory of the streamed JSON export as the portfolio grows,
+against building the whole list in one JsonResponse.
+
+Runs in a scratch database filled with synthetic projects.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.http import JsonResponse
+from django.test import RequestFactory
+
+from . import measure, scratch_database
+from .. import api
+from ..models import Project
+
+
+def synthetic_projects(start, count, seed=0):
+    rng = random.Random(seed + start)
+    statuses = [value for value, _ in Project.STATUS_CHOICES]
+    for index in range(start, start + count):
+        contract = Decimal(rng.randint(10**6, 10**9)) / 100
+        yield Project(
+            proj_id=f"BENCH-{index:07d}",
+            name=f"Synthetic project {index}",
+            location=f"Site {rng.randint(1, 200)}",
+            start_date=date(2018, 1, 1) + timedelta(days=rng.randrange(2000)),
+            report_date=date(2023, 1, 1) + timedelta(days=rng.randrange(600)),
+            progress_report_month_year="PROGRESS REPORT",
+            accomplished_to_date=Decimal(rng.randint(0, 10000)) / 100,
+            approved_contract=contract,
+            total_expense=contract * Decimal(rng.randint(0, 120)) / 100,
+            status=rng.choice(statuses),
+        )
+
+
+def _stream_export(factory):
+    response = api.project_export(factory.get("/api/projects/export/", headers={"Accept-Encoding": "gzip"}))
+    return sum(len(chunk) for chunk in response.streaming_content)
+
+
+def _buffered_export():
+    rows = list(Project.objects.order_by("proj_id", "pk").values(*api.API_FIELDS))
+    return len(JsonResponse(rows, safe=False).content)
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of projects exported; the export is also timed at
+    a tenth of that to show memory does not grow with the row count.
+    """
+    factory = RequestFactory()
+    results = []
+    with scratch_database():
+        written = 0
+        for rows in (max(size // 10, 1), size):
+            Project.objects.bulk_create(synthetic_projects(written, rows - written), batch_size=5000)
+            written = rows
+            streamed = measure(_stream_export, factory, repeat=repeat)
+            buffered = measure(_buffered_export, repeat=repeat)
+            results.append({"name": "api.export.streamed", "size": rows, "bytes": streamed["result"],
+                            "seconds": streamed["seconds"], "peak_bytes": streamed["peak_bytes"]})
+            results.append({"name": "api.export.buffered", "size": rows, "bytes": buffered["result"],
+                            "seconds": buffered["seconds"], "peak_bytes": buffered["peak_bytes"]})
+
+    small, large = results[0]["peak_bytes"], results[2]["peak_bytes"]
+    if large > 2 * small + 1024 * 1024:
+        raise AssertionError(f"Streamed export memory grew with the row count ({small} -> {large} bytes).")
+    return results
@@ -0,0 +1,53 @@
+"""
+Benchmark: render time of the project list and dashboard with a cold view
+cache (every request invalidated first, as after an import) against a warm one.
+
+Runs in a scratch database filled with synthetic projects.
+"""
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+
+from . import measure, scratch_database
+from .. import caching, views
+from ..models import Project
+from ..portfolio import rebuild_portfolio_summary
+from .api import synthetic_projects
+
+PAGES = (
+    ("dashboard", "/"),
+    ("projects", "/projects/"),
+    ("projects.filtered", "/projects/?status=Delayed&sort=report_date&per_page=200"),
+    ("reports", "/reports/"),
+)
+
+
+def _get(factory, view, path, invalidate):
+    if invalidate:
+        caching.bump(caching.PROJECTS)
+    request = factory.get(path)
+    request.user = AnonymousUser()
+    return len(view(request).content)
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of projects; each page is requested 100 times per
+    measurement.
+    """
+    factory = RequestFactory()
+    results = []
+    with scratch_database():
+        Project.objects.bulk_create(synthetic_projects(0, size), batch_size=5000)
+        rebuild_portfolio_summary()
+        for name, path in PAGES:
+            view = getattr(views, name.split(".")[0])
+            for kind, invalidate in (("cold", True), ("warm", False)):
+                caching.reset_stats()
+                timing = measure(lambda: [_get(factory, view, path, invalidate) for _ in range(100)], repeat=repeat)
+                stats = caching.cache_stats()[caching.PROJECTS]
+                if (stats["hits"] > 0) if invalidate else (stats["misses"] > 1):
+                    raise AssertionError(f"{name}.{kind}: unexpected cache stats {stats}.")
+                results.append({"name": f"caching.{name}.{kind}", "size": size, "bytes": timing["result"][0],
+                                "seconds": timing["seconds"], "peak_bytes": timing["peak_bytes"],
+                                "per_second": 100 / timing["seconds"]})
+    return results
@@ -0,0 +1,148 @@
+"""
+Load test: concurrent imports and page reads against one SQLite file, with
+SQLite's stock connection settings and with the tuned ones from
+``powermason_django/database.py``.
+
+Every profile gets a fresh database in a temporary directory.  Worker
+processes configure Django from the ``DB_*`` / ``SQLITE_*`` environment
+variables, as separate server workers would, then half of them import
+projects through ``save_project`` while the other half read the dashboard
+and the project list.  Reported: writes per second, p95 write latency and
+how many operations failed with "database is locked".
+"""
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+
+PROFILES = {
+    # What Django and sqlite3 do without OPTIONS (5 s busy timeout)
+    "stock": {
+        "SQLITE_JOURNAL_MODE": "DELETE",
+        "SQLITE_SYNCHRONOUS": "FULL",
+        "SQLITE_BUSY_TIMEOUT_MS": "5000",
+        "SQLITE_MMAP_SIZE": "0",
+        "SQLITE_TRANSACTION_MODE": "",
+    },
+    # The defaults of powermason_django.database, with WAL switched on
+    "tuned": {"SQLITE_JOURNAL_MODE": "WAL"},
+}
+WORKERS = 4
+READS_PER_WRITE = 2
+
+
+def _setup(env):
+    os.environ.update(env)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "powermason_django.settings")
+    import django
+
+    django.setup()
+
+
+def _migrate():
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+
+
+def _fields(index):
+    contract = Decimal(1_000_000 + index * 1000)
+    expense = contract * Decimal(index % 100) / 100
+    return {
+        "proj_id": f"LOAD-{index:06d}",
+        "name": f"Load test project {index}",
+        "location": f"Site {index % 50}",
+        "start_date": date(2020, 1, 1) + timedelta(days=index % 1000),
+        "report_date": date(2024, 1, 1) + timedelta(days=index % 300),
+        "progress_report_month_year": "PROGRESS REPORT",
+        "accomplished_to_date": Decimal(index % 100),
+        "accomplished_before_period": Decimal(0),
+        "accomplished_this_period": Decimal(index % 100),
+        "approved_contract": contract,
+        "total_expense": expense,
+    }
+
+
+def _is_locked(error):
+    return "locked" in str(error) or "busy" in str(error)
+
+
+def _write(indexes):
+    from django.db import OperationalError
+
+    from ..importers import save_project
+
+    latencies, locked = [], 0
+    for index in indexes:
+        started = time.perf_counter()
+        try:
+            save_project(_fields(index))
+        except OperationalError as e:
+            if not _is_locked(e):
+                raise
+            locked += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+    return latencies, locked
+
+
+def _read(count):
+    from django.db import OperationalError
+
+    from ..models import Project
+    from ..pagination import keyset_page
+    from ..portfolio import dashboard_summary
+
+    locked = 0
+    for _ in range(count):
+        try:
+            dashboard_summary()
+            keyset_page(Project.objects.all(), "start_date", descending=True, after=None, before=None)
+        except OperationalError as e:
+            if not _is_locked(e):
+                raise
+            locked += 1
+    return [], locked
+
+
+def _run_profile(profile, size):
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(PROFILES[profile], DB_ENGINE="sqlite", DB_NAME=os.path.join(directory, "load.sqlite3"))
+        with ProcessPoolExecutor(1, mp_context=context, initializer=_setup, initargs=(env,)) as pool:
+            pool.submit(_migrate).result()
+
+        writers = WORKERS // 2
+        batches = [range(worker, size, writers) for worker in range(writers)]
+        reads = max(size * READS_PER_WRITE // (WORKERS - writers), 1)
+        with ProcessPoolExecutor(WORKERS, mp_context=context, initializer=_setup, initargs=(env,)) as pool:
+            # Let every worker finish django.setup() before the clock starts
+            list(pool.map(time.sleep, [0.5] * WORKERS))
+            started = time.perf_counter()
+            futures = [pool.submit(_write, list(batch)) for batch in batches]
+            futures += [pool.submit(_read, reads) for _ in range(WORKERS - writers)]
+            outcomes = [future.result() for future in futures]
+            elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for worker_latencies, _ in outcomes for latency in worker_latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+    return {
+        "name": f"contention.{profile}",
+        "size": size,
+        "seconds": elapsed,
+        "per_second": len(latencies) / elapsed,
+        "locked": sum(locked for _, locked in outcomes),
+        "p95_ms": p95 * 1000,
+    }
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of projects imported per profile; ``repeat`` is
+    ignored, each profile needs a fresh database.
+    """
+    size = min(size, 5000)
+    return [_run_profile(profile, size) for profile in PROFILES]
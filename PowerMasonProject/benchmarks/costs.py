@@ -0,0 +1,91 @@
+"""
+Benchmark: storing cost line items with ``record_cost_items`` (batched
+``bulk_create``) versus one ``save()`` per item, and the latency of the cost
+aggregations over hundreds of thousands of items.
+
+Every project gets the 96 items of a synthetic bill of quantities (eight
+divisions of twelve lines).  Runs in a scratch database.
+"""
+import random
+import time
+from decimal import Decimal
+
+from . import measure, scratch_database
+from ..costs import COST_AGGREGATIONS, record_cost_items
+from ..models import CostItem, Project
+from .api import synthetic_projects
+from .workbooks import DIVISIONS
+
+ITEMS_PER_DIVISION = 12
+# Items saved one by one; per-row saves of the whole set would take minutes
+PER_ROW_ITEMS = 5000
+
+
+def synthetic_items(seed):
+    rng = random.Random(seed)
+    items = []
+    for division, name in enumerate(DIVISIONS):
+        for line in range(ITEMS_PER_DIVISION):
+            quantity = Decimal(rng.randint(1, 500))
+            amount = Decimal(rng.randint(5_000, 5_000_000)) / 100
+            accomplished = Decimal(rng.randint(0, int(quantity)))
+            items.append({
+                "row": 10 + division * (ITEMS_PER_DIVISION + 1) + line + 1,
+                "item": str(line + 1),
+                "description": f"Line item {line + 1}",
+                "category": f"{division + 1} - {name}",
+                "quantity": quantity,
+                "amount": amount,
+                "accomplished": accomplished,
+                "expense": (accomplished / quantity * amount).quantize(Decimal("0.01")),
+            })
+    return items
+
+
+def per_row_save(reports):
+    for project, items in reports:
+        for item in items:
+            CostItem(
+                project=project, report_date=project.report_date, row=item["row"], item_no=item["item"],
+                description=item["description"], category=item["category"], quantity=item["quantity"],
+                amount=item["amount"], accomplished=item["accomplished"], expense=item["expense"],
+            ).save()
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of projects (at most 10000, 960000 items).
+    """
+    size = min(size, 10_000)
+    results = []
+    with scratch_database():
+        Project.objects.bulk_create(synthetic_projects(0, size), batch_size=5000)
+        projects = list(Project.objects.order_by("pk"))
+        reports = [(project, synthetic_items(project.pk)) for project in projects]
+        item_count = sum(len(items) for _, items in reports)
+
+        per_row_reports = reports[:max(1, PER_ROW_ITEMS // len(reports[0][1]))]
+        per_row_count = sum(len(items) for _, items in per_row_reports)
+        # Timed without tracemalloc, which would dominate both
+        for name, store, count in (
+            ("costs.record.per_row", lambda: per_row_save(per_row_reports), per_row_count),
+            ("costs.record.bulk", lambda: record_cost_items(reports), item_count),
+        ):
+            best = None
+            for _ in range(repeat):
+                CostItem.objects.all().delete()
+                started = time.perf_counter()
+                store()
+                seconds = time.perf_counter() - started
+                best = seconds if best is None else min(best, seconds)
+            if CostItem.objects.count() != count:
+                raise AssertionError(f"{name}: not every item was stored.")
+            results.append({"name": name, "size": count, "seconds": best, "per_second": count / best})
+
+        for group, aggregate in COST_AGGREGATIONS.items():
+            timing = measure(aggregate, 100, repeat=repeat)
+            results.append({"name": f"costs.aggregate.{group}", "size": item_count, "seconds": timing["seconds"]})
+        timing = measure(COST_AGGREGATIONS["category"], 100, proj_id=projects[-1].proj_id, repeat=repeat)
+        results.append({"name": "costs.aggregate.category_one_project", "size": item_count,
+                        "seconds": timing["seconds"]})
+    return results
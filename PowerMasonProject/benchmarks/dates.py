@@ -0,0 +1,87 @@
+"""
+Microbenchmark: shape-dispatched, cached date parsing versus the original
+try-every-strptime-format loop, on a realistic mix of report dates.
+"""
+import random
+from datetime import date, datetime, timedelta
+
+from . import measure
+from ..dates import DATE_FORMATS, clear_cache, parse_date_string
+
+# Share of the inputs per format; batch imports are dominated by one or two
+INPUT_MIX = (
+    ("%m/%d/%Y", 0.45),
+    ("%Y-%m-%d", 0.25),
+    ("%B %d, %Y", 0.10),
+    ("%d %b %Y", 0.08),
+    ("%Y-%m-%d %H:%M:%S", 0.07),
+    ("%d-%m-%Y", 0.04),
+)
+
+
+def legacy_parse_date_string(date_str):
+    """
+    The original parser: normalize, then try every format (duplicates included).
+    """
+    for old, new in {"SEPT": "SEP", "Sept": "SEP"}.items():
+        date_str = date_str.replace(old, new)
+    for fmt in DATE_FORMATS + ("%B %d, %Y", "%b %d, %Y"):
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Date string '{date_str}' does not match any expected format.  Input was: '{date_str}'")
+
+
+def synthetic_dates(count, seed=0):
+    """
+    Report dates over three years in the formats of ``INPUT_MIX``, with about
+    one unparseable string in a hundred.
+    """
+    rng = random.Random(seed)
+    formats, weights = zip(*INPUT_MIX)
+    start = date(2022, 1, 1)
+    values = []
+    for _ in range(count):
+        if rng.random() < 0.01:
+            values.append(rng.choice(["TBA", "n/a", "2023-13-45", "31/31/2023"]))
+            continue
+        day = datetime.combine(start + timedelta(days=rng.randrange(3 * 365)), datetime.min.time())
+        values.append(day.strftime(rng.choices(formats, weights)[0]))
+    return values
+
+
+def _parse_all(parser, values):
+    parsed = []
+    for value in values:
+        try:
+            parsed.append(parser(value))
+        except ValueError:
+            parsed.append(None)
+    return parsed
+
+
+def _parse_all_cold(values):
+    clear_cache()
+    return _parse_all(parse_date_string, values)
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of date strings parsed.
+    """
+    values = synthetic_dates(size)
+    legacy = measure(_parse_all, legacy_parse_date_string, values, repeat=repeat)
+    cold = measure(_parse_all_cold, values, repeat=repeat)
+    warm = measure(_parse_all, parse_date_string, values, repeat=repeat)
+    # The old normalization turned "September" into "SEPember"; only compare
+    # the strings it could read
+    for old, new, cached in zip(legacy["result"], cold["result"], warm["result"]):
+        if new != cached or (old is not None and old != new):
+            raise AssertionError("Dispatched date parsing differs from the strptime loop.")
+
+    return [
+        {"name": name, "size": size, "seconds": result["seconds"], "peak_bytes": result["peak_bytes"],
+         "per_second": size / max(result["seconds"], 1e-9)}
+        for name, result in (("dates.legacy", legacy), ("dates.dispatched", cold), ("dates.cached", warm))
+    ]
@@ -0,0 +1,110 @@
+"""
+Benchmark: fitting the estimator from scratch (``rebuild_estimator``) versus
+folding a batch of imported projects into its sums, and the latency of an
+estimate with the solved lines cached and right after a write.
+
+The incrementally updated lines are checked against a full refit and
+against ``numpy.polyfit`` on the same samples.  Runs in a scratch database.
+"""
+import random
+import statistics
+import time
+from decimal import Decimal
+
+import numpy as np
+
+from . import measure, scratch_database
+from ..caching import PROJECTS, bump
+from ..estimation import COST, estimate, fitted_lines, rebuild_estimator
+from ..models import Project
+from ..portfolio import apply_project_changes, summary_values
+from .api import synthetic_projects
+
+IMPORT_BATCH = 100
+QUERIES = 1000
+LOCATIONS = ("Manila", "Cebu", "Davao", "Iloilo", "Baguio")
+
+
+def _projects(count):
+    rng = random.Random(2)
+    for project in synthetic_projects(0, count):
+        project.location = rng.choice(LOCATIONS)
+        yield project
+
+
+def _import_batch(projects, rng):
+    """
+    ``(old, new)`` summary values for re-imports of ``projects`` with more
+    progress and expense.
+    """
+    changes = []
+    for project in projects:
+        old = summary_values(project)
+        new = dict(old, accomplished_to_date=min(old["accomplished_to_date"] + 5, Decimal("100")),
+                   total_expense=old["total_expense"] * Decimal("1.05"))
+        changes.append((old, new))
+        project.accomplished_to_date, project.total_expense = new["accomplished_to_date"], new["total_expense"]
+    return changes
+
+
+def _polyfit_slope():
+    rows = Project.objects.values_list("approved_contract", "total_expense", "accomplished_to_date")
+    x, y = [], []
+    for contract, expense, progress in rows.iterator():
+        if progress >= 10:
+            x.append(float(contract) / 1e6)
+            y.append(float(expense) * 100 / float(progress))
+    return np.polyfit(x, y, 1)[0]
+
+
+def _check(lines, reference):
+    slope = lines[COST][""]["slope"]
+    if not np.isclose(slope, reference, rtol=1e-6):
+        raise AssertionError(f"Cost slope {slope} differs from {reference}.")
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of projects (at most 1000000).
+    """
+    size = min(size, 1_000_000)
+    rng = random.Random(3)
+    results = []
+    with scratch_database():
+        Project.objects.bulk_create(_projects(size), batch_size=5000)
+
+        timing = measure(rebuild_estimator, repeat=repeat)
+        results.append({"name": "estimation.fit_full", "size": size, "seconds": timing["seconds"],
+                        "peak_bytes": timing["peak_bytes"], "per_second": size / timing["seconds"]})
+
+        batch = list(Project.objects.order_by("?")[:IMPORT_BATCH])
+        best = None
+        for _ in range(repeat):
+            changes = _import_batch(batch, rng)
+            started = time.perf_counter()
+            apply_project_changes(changes)
+            seconds = time.perf_counter() - started
+            best = seconds if best is None else min(best, seconds)
+            Project.objects.bulk_update(batch, ["accomplished_to_date", "total_expense"])
+        results.append({"name": "estimation.refit_incremental", "size": len(batch), "seconds": best,
+                        "per_second": len(batch) / best})
+
+        bump(PROJECTS)
+        incremental = fitted_lines()
+        rebuild_estimator()
+        refit = fitted_lines()
+        _check(incremental, refit[COST][""]["slope"])
+        _check(refit, _polyfit_slope())
+
+        for name, before in (("estimation.query_cached", lambda: None), ("estimation.query_after_write", lambda: bump(PROJECTS))):
+            times = []
+            for index in range(QUERIES if name.endswith("cached") else min(QUERIES, 100)):
+                budget = Decimal(rng.randint(10**6, 10**9)) / 100
+                location = LOCATIONS[index % len(LOCATIONS)]
+                before()
+                started = time.perf_counter()
+                estimate(budget, location)
+                times.append(time.perf_counter() - started)
+            results.append({"name": name, "size": size, "seconds": statistics.fmean(times),
+                            "p95_ms": statistics.quantiles(times, n=20)[-1] * 1000})
+    return results
@@ -0,0 +1,57 @@
+"""
+Benchmark: vectorized expense calculation versus the per-row Decimal loop.
+"""
+import random
+from decimal import Decimal, ROUND_HALF_UP
+
+from . import measure
+from ..expenses import calculate_expense, safe_decimal
+
+
+def legacy_total_expense(c_values, e_values, f_values):
+    """
+    The original row-by-row computation from import_excel.
+    """
+    total_expense = Decimal('0.00')
+    for f_value, c_value, e_value in zip(f_values, c_values, e_values):
+        try:
+            if f_value is not None and c_value is not None and e_value is not None:
+                f_value = safe_decimal(f_value)
+                c_value = safe_decimal(c_value)
+                e_value = safe_decimal(e_value)
+                if c_value != Decimal('0.00'):
+                    total_expense += (f_value / c_value) * e_value
+        except Exception:
+            continue
+    return total_expense.quantize(Decimal('0.00'), rounding=ROUND_HALF_UP)
+
+
+def synthetic_columns(rows, seed=0):
+    """
+    C, E and F columns with the blanks, zeros and stray text real sheets have.
+    """
+    rng = random.Random(seed)
+    c_values, e_values, f_values = [], [], []
+    for _ in range(rows):
+        roll = rng.random()
+        quantity = rng.randint(1, 500)
+        c_values.append(None if roll < 0.05 else 0 if roll < 0.07 else quantity)
+        e_values.append("=C12*D12" if 0.07 <= roll < 0.08 else round(quantity * rng.uniform(50, 5000), 2))
+        f_values.append("n/a" if 0.08 <= roll < 0.09 else rng.uniform(0, quantity))
+    return c_values, e_values, f_values
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of rows in the bill-of-quantities block.
+    """
+    columns = synthetic_columns(size)
+    legacy = measure(legacy_total_expense, *columns, repeat=repeat)
+    vectorized = measure(calculate_expense, *columns, repeat=repeat)
+    if legacy["result"] != vectorized["result"][0]:
+        raise AssertionError("Vectorized expense differs from the Decimal loop.")
+
+    return [
+        {"name": "expenses.legacy", "size": size, "seconds": legacy["seconds"], "peak_bytes": legacy["peak_bytes"]},
+        {"name": "expenses.vectorized", "size": size, "seconds": vectorized["seconds"], "peak_bytes": vectorized["peak_bytes"]},
+    ]
@@ -0,0 +1,62 @@
+"""
+Benchmark: rows per second and memory of the CSV and write-only .xlsx report
+exports, against building the workbook in memory.
+
+Runs in a scratch database filled with synthetic projects.
+"""
+from io import BytesIO
+
+from django.test import RequestFactory
+from openpyxl import Workbook
+
+from . import measure, peak_rss_bytes, scratch_database
+from .api import synthetic_projects
+from .. import views
+from ..exports import report_rows
+from ..models import Project
+
+
+def _download(factory, fmt):
+    response = views.report_export(factory.get(f"/reports/export/projects/{fmt}/"), "projects", fmt)
+    content = response.streaming_content
+    size = sum(len(chunk) for chunk in content)
+    response.close()
+    return size
+
+
+def _in_memory_xlsx():
+    """
+    The naive approach: a regular workbook holding every cell until save.
+    """
+    headers, rows = report_rows("projects", {})
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(headers)
+    for row in rows:
+        sheet.append(row)
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return len(buffer.getvalue())
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of projects in the report.
+    """
+    factory = RequestFactory()
+    results = []
+    with scratch_database():
+        Project.objects.bulk_create(synthetic_projects(0, size), batch_size=5000)
+        # ru_maxrss only ever rises: measure the in-memory workbook last
+        for name, func, args in (
+            ("exports.csv", _download, (factory, "csv")),
+            ("exports.xlsx.write_only", _download, (factory, "xlsx")),
+            ("exports.xlsx.in_memory", _in_memory_xlsx, ()),
+        ):
+            timing = measure(func, *args, repeat=repeat)
+            results.append({
+                "name": name, "size": size, "bytes": timing["result"],
+                "seconds": timing["seconds"], "peak_bytes": timing["peak_bytes"],
+                "per_second": size / max(timing["seconds"], 1e-9), "peak_rss_bytes": peak_rss_bytes(),
+            })
+    return results
@@ -0,0 +1,81 @@
+"""
+Benchmark: the full import path, from the uploaded file to the saved
+``Project`` (parsing, expense and date handling, import cache, summary and
+snapshot upkeep), through the views users hit.
+
+``imports.single`` uploads each workbook to ``import_excel`` once (every
+project is created), ``imports.reupload`` sends the same files again (import
+cache hits, nothing written) and ``imports.bulk`` sends them all to
+``import_excel_bulk`` as one zip archive.  Runs in a scratch database.
+"""
+import zipfile
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, override_settings
+
+from . import measure, scratch_database
+from ..models import ImportCacheEntry, PortfolioSummary, ProgressSnapshot, Project
+from .workbooks import build_progress_reports
+
+
+def _clear():
+    for model in (ProgressSnapshot, PortfolioSummary, ImportCacheEntry, Project):
+        model.objects.all().delete()
+
+
+def _upload_each(client, workbooks):
+    for name, data, _ in workbooks:
+        response = client.post("/import_excel/", {"excel_file": SimpleUploadedFile(name, data)})
+        if response.status_code != 302:
+            raise AssertionError(f"{name}: import_excel answered {response.status_code}.")
+    return Project.objects.count()
+
+
+def _upload_zip(client, archive):
+    response = client.post("/import_excel/bulk/", {"excel_files": SimpleUploadedFile("reports.zip", archive)})
+    summary = response.json()
+    if summary["failed"]:
+        raise AssertionError(f"Bulk import failed for {summary['failed']} workbooks.")
+    return summary["created"] + summary["updated"] + summary["unchanged"]
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of workbooks imported (at most 500).
+    """
+    count = min(size, 500)
+    workbooks = list(build_progress_reports(count))
+    total_bytes = sum(len(data) for _, data, _ in workbooks)
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data, _ in workbooks:
+            archive.writestr(name, data)
+
+    results = []
+    # A single parser process keeps the numbers comparable between machines
+    with scratch_database(), override_settings(
+        ALLOWED_HOSTS=["testserver"], IMPORT_WORKERS=1, SLOW_REQUEST_MS=10**9,
+    ):
+        client = Client()
+
+        def fresh_import():
+            _clear()
+            return _upload_each(client, workbooks)
+
+        def fresh_bulk():
+            _clear()
+            return _upload_zip(client, buffer.getvalue())
+
+        for name, func in (
+            ("imports.single", fresh_import),
+            ("imports.reupload", lambda: _upload_each(client, workbooks)),
+            ("imports.bulk", fresh_bulk),
+        ):
+            timing = measure(func, repeat=repeat)
+            if timing["result"] != count:
+                raise AssertionError(f"{name}: {timing['result']} projects stored, expected {count}.")
+            results.append({"name": name, "size": count, "bytes": total_bytes,
+                            "seconds": timing["seconds"], "peak_bytes": timing["peak_bytes"],
+                            "per_second": count / timing["seconds"]})
+    return results
@@ -0,0 +1,51 @@
+"""
+Regression benchmark: streamed read-only ingestion versus the original
+full-mode ``load_workbook`` plus per-cell lookups.
+"""
+from io import BytesIO
+
+from openpyxl import load_workbook
+
+from . import measure
+from .workbooks import build_progress_report
+from ..ingest import (
+    EXPENSE_FIRST_ROW, EXPENSE_LAST_ROW, HEADER_CELLS,
+    build_project_fields, compute_total_expense, read_project_workbook,
+)
+
+
+def legacy_read_project_workbook(source):
+    """
+    The pre-streaming import path: full object model and ~320 cell lookups.
+    """
+    workbook = load_workbook(source)
+    sheet = workbook.active
+    header = {field: sheet[address].value for field, address in HEADER_CELLS.items()}
+    expense_rows = [
+        (row, sheet[f"C{row}"].value, sheet[f"E{row}"].value, sheet[f"F{row}"].value)
+        for row in range(EXPENSE_FIRST_ROW, EXPENSE_LAST_ROW + 1)
+    ]
+    total_expense, warnings = compute_total_expense(expense_rows)
+    fields, field_warnings = build_project_fields(header, total_expense)
+    return fields, warnings + field_warnings
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of filler rows appended below the report.
+    """
+    buffer = BytesIO()
+    build_progress_report(buffer, extra_rows=size)
+    data = buffer.getvalue()
+
+    legacy = measure(lambda: legacy_read_project_workbook(BytesIO(data)), repeat=repeat)
+    streamed = measure(lambda: read_project_workbook(BytesIO(data)), repeat=repeat)
+    if legacy["result"] != streamed["result"]:
+        raise AssertionError("Streamed ingestion produced different Project field values.")
+
+    return [
+        {"name": "ingest.legacy", "size": size, "bytes": len(data),
+         "seconds": legacy["seconds"], "peak_bytes": legacy["peak_bytes"]},
+        {"name": "ingest.streamed", "size": size, "bytes": len(data),
+         "seconds": streamed["seconds"], "peak_bytes": streamed["peak_bytes"]},
+    ]
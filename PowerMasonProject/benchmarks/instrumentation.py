@@ -0,0 +1,48 @@
+"""
+Benchmark: overhead of the instrumentation middleware and spans, the same
+requests served with and without it.
+
+Runs in a scratch database filled with synthetic projects.
+"""
+from django.conf import settings
+from django.test import Client, override_settings
+
+from . import measure, scratch_database
+from .. import timing
+from ..models import Project
+from ..portfolio import rebuild_portfolio_summary
+from .api import synthetic_projects
+
+MIDDLEWARE = "PowerMasonProject.instrumentation.InstrumentationMiddleware"
+PATHS = ("/", "/projects/", "/api/projects/?per_page=200")
+
+
+def _requests(client, count):
+    for _ in range(count):
+        for path in PATHS:
+            response = client.get(path)
+            if response.status_code != 200:
+                raise AssertionError(f"{path} answered {response.status_code}.")
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of rounds over the pages per measurement (at
+    most 200).
+    """
+    size = min(size, 200)
+    results = []
+    with scratch_database():
+        Project.objects.bulk_create(synthetic_projects(0, 2000), batch_size=5000)
+        rebuild_portfolio_summary()
+        without = [name for name in settings.MIDDLEWARE if name != MIDDLEWARE]
+        for kind, middleware in (("off", without), ("on", settings.MIDDLEWARE)):
+            with override_settings(MIDDLEWARE=middleware, ALLOWED_HOSTS=["testserver"], SLOW_REQUEST_MS=10**9):
+                client = Client()
+                _requests(client, 1)
+                timing.reset()
+                timing_result = measure(_requests, client, size, repeat=repeat)
+            results.append({"name": f"instrumentation.{kind}", "size": size * len(PATHS),
+                            "seconds": timing_result["seconds"], "peak_bytes": timing_result["peak_bytes"],
+                            "per_second": size * len(PATHS) / timing_result["seconds"]})
+    return results
@@ -0,0 +1,49 @@
+"""
+Benchmark: workbook ingestion with only the standard layout registered
+against dozens of extra, label-detected layouts that never match.  Detection
+reads a few buffered rows, so the time per workbook should stay flat.
+"""
+from io import BytesIO
+
+from . import measure
+from .. import layouts
+from ..ingest import read_project_workbook
+from .workbooks import build_progress_reports
+
+EXTRA_LAYOUTS = (0, 10, 100)
+
+
+def _extra_layout(index):
+    return dict(
+        layouts.PROGRESS_REPORT_V1,
+        name=f"benchmark-{index}",
+        labels={"A1": f"Template {index}", f"A{index % 8 + 1}": "Project"},
+    )
+
+
+def _ingest_all(workbooks):
+    return [read_project_workbook(BytesIO(data)) for data in workbooks]
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of workbooks ingested (at most 200).
+    """
+    workbooks = [data for _, data, _ in build_progress_reports(min(size, 200))]
+    results = []
+    expected = None
+    for extra in EXTRA_LAYOUTS:
+        names = [layouts.register_layout(_extra_layout(index)).name for index in range(extra)]
+        try:
+            timing = measure(_ingest_all, workbooks, repeat=repeat)
+        finally:
+            for name in names:
+                layouts.unregister_layout(name)
+        if expected is None:
+            expected = timing["result"]
+        elif timing["result"] != expected:
+            raise AssertionError(f"Ingestion with {extra} extra layouts read different values.")
+        results.append({"name": f"layouts.{extra + 1}", "size": len(workbooks),
+                        "seconds": timing["seconds"], "peak_bytes": timing["peak_bytes"],
+                        "per_second": len(workbooks) / timing["seconds"]})
+    return results
@@ -0,0 +1,88 @@
+"""
+Benchmark: bytes transferred per tab page, with the assets served the way
+production serves them.
+
+``collectstatic`` runs into a temporary ``STATIC_ROOT`` with DEBUG off, so
+the pages link the content-hashed names and WhiteNoise (the project's
+middleware, ahead of the rest of the chain) serves the precompressed copies.
+For every tab the full page is rendered and each asset it links is fetched:
+
+* ``identity``: a first visit by a client that accepts no compression;
+* ``compressed``: a first visit accepting Brotli and gzip;
+* ``cached``: a repeat visit, which only fetches the page, every asset
+  being cached as immutable.
+
+Fails when a linked asset is not fingerprinted or not marked immutable.
+Runs the views in-process, in a scratch database filled with synthetic
+projects.
+"""
+import re
+import tempfile
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.test import RequestFactory, override_settings
+
+from powermason_django.middleware import AsyncWhiteNoiseMiddleware
+
+from .. import views
+from .tabs import TABS, project_database
+
+ASSET_URL = re.compile(r'(?:src|href)="(/static/[^"]+)"')
+# Manifest storage inserts a 12 hex digit content hash before the extension
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.\w+$")
+ENCODINGS = {"identity": "", "compressed": "br, gzip"}
+
+
+def _page(factory, tab):
+    request = factory.get(f"/{tab}/" if tab != "dashboard" else "/")
+    request.user = AnonymousUser()
+    request.COOKIES = {}
+    return getattr(views, tab)(request).content
+
+
+def _asset(whitenoise, factory, url, encoding):
+    response = whitenoise(factory.get(url, headers={"Accept-Encoding": encoding}))
+    if response is None:
+        raise AssertionError(f"{url} is not served by WhiteNoise.")
+    if "immutable" not in response.get("Cache-Control", ""):
+        raise AssertionError(f"{url} is served without an immutable Cache-Control.")
+    return int(response["Content-Length"])
+
+
+def _visit(whitenoise, factory, tab, encoding):
+    """
+    Bytes of the page and of the assets it links.
+    """
+    html = _page(factory, tab)
+    urls = ASSET_URL.findall(html.decode())
+    for url in urls:
+        if not HASHED_NAME.search(url):
+            raise AssertionError(f"{tab}: {url} is not fingerprinted.")
+    assets = 0 if encoding is None else sum(_asset(whitenoise, factory, url, encoding) for url in urls)
+    return len(html) + assets, len(urls)
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of visits per measurement.
+    """
+    factory = RequestFactory()
+    results = []
+    with project_database(), tempfile.TemporaryDirectory() as static_root, \
+            override_settings(DEBUG=False, STATIC_ROOT=static_root):
+        call_command("collectstatic", interactive=False, verbosity=0)
+        whitenoise = AsyncWhiteNoiseMiddleware(lambda request: None)
+        for tab in TABS:
+            for kind, encoding in (*ENCODINGS.items(), ("cached", None)):
+                best = None
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    for _ in range(size):
+                        transferred, assets = _visit(whitenoise, factory, tab, encoding)
+                    seconds = (time.perf_counter() - started) / size
+                    best = seconds if best is None else min(best, seconds)
+                results.append({"name": f"static.{tab}.{kind}", "size": assets, "seconds": best,
+                                "bytes": transferred})
+    return results
@@ -0,0 +1,83 @@
+"""
+Benchmark: the set-based status engine versus classifying and saving
+projects one at a time, as porting the browser's calculateStatus row by row
+would.
+
+Every measurement starts with all projects stored as "onTrack", so both
+approaches write the same rows.  Runs in a scratch database.
+"""
+import random
+import time
+from datetime import date, timedelta
+
+from . import scratch_database
+from ..models import Project
+from ..status import (
+    BUDGET_OVERRUN, COMPLETED, COMPLETED_PROGRESS, DELAYED, DELAYED_DAYS_LEFT, DELAYED_PROGRESS, ON_TRACK,
+    refresh_statuses,
+)
+from .api import synthetic_projects
+
+TODAY = date(2024, 6, 1)
+
+
+def legacy_classify(project, today):
+    """
+    calculateStatus from static/js/script.js, in Python.
+    """
+    if project.accomplished_to_date >= COMPLETED_PROGRESS:
+        return COMPLETED
+    if project.total_expense > project.approved_contract:
+        return BUDGET_OVERRUN
+    if (project.accomplished_to_date < DELAYED_PROGRESS and project.end_date is not None
+            and (project.end_date - today).days < DELAYED_DAYS_LEFT):
+        return DELAYED
+    return ON_TRACK
+
+
+def legacy_refresh(today):
+    changed = 0
+    for project in Project.objects.all():
+        status = legacy_classify(project, today)
+        if status != project.status:
+            project.status = status
+            project.save(update_fields=["status", "updated_at"])
+            changed += 1
+    return changed
+
+
+def _projects(count):
+    rng = random.Random(1)
+    for project in synthetic_projects(0, count):
+        project.end_date = TODAY + timedelta(days=rng.randint(-60, 400))
+        project.status = ON_TRACK
+        yield project
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of projects (at most 50000).
+    """
+    size = min(size, 50_000)
+    results = []
+    with scratch_database():
+        Project.objects.bulk_create(_projects(size), batch_size=5000)
+        expected = {pk: legacy_classify(project, TODAY) for pk, project in Project.objects.in_bulk().items()}
+
+        for name, refresh in (
+            ("status.per_row", lambda: legacy_refresh(TODAY)),
+            ("status.set_based", lambda: len(refresh_statuses(today=TODAY))),
+        ):
+            best = None
+            for _ in range(repeat):
+                Project.objects.update(status=ON_TRACK)
+                started = time.perf_counter()
+                changed = refresh()
+                seconds = time.perf_counter() - started
+                best = seconds if best is None else min(best, seconds)
+            stored = dict(Project.objects.values_list("pk", "status"))
+            if stored != expected:
+                raise AssertionError(f"{name}: statuses differ from calculateStatus.")
+            results.append({"name": name, "size": size, "seconds": best, "per_second": size / best,
+                            "changed": changed})
+    return results
@@ -0,0 +1,27 @@
+"""
+The import-path suite: full imports through the views, workbook ingestion,
+the expense calculation and date parsing, in one run.
+
+    python manage.py benchmark suite --json benchmarks.jsonl
+
+``size`` scales every member: it is the number of date strings and expense
+rows, the number of filler rows in the ingested workbook, and a thousandth of
+it (at least 10) is the number of workbooks imported.
+"""
+from importlib import import_module
+
+# Member benchmark -> its size for a given suite size
+SUITE = (
+    ("imports", lambda size: max(size // 1000, 10)),
+    ("ingest", lambda size: size),
+    ("expenses", lambda size: size),
+    ("dates", lambda size: size),
+)
+
+
+def run(size, repeat):
+    results = []
+    for name, member_size in SUITE:
+        module = import_module(f"{__package__}.{name}")
+        results += module.run(member_size(size), repeat)
+    return results
@@ -0,0 +1,74 @@
+"""
+Benchmark: response bytes and render time of the tab pages, full page versus
+the partial the AJAX tab loader asks for, plus the 304 revalidation path.
+
+Runs the views in-process, in a scratch database filled with synthetic
+projects.
+"""
+from contextlib import contextmanager
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+
+from . import measure, scratch_database
+from .. import views
+from ..models import Project
+from ..portfolio import rebuild_portfolio_summary
+from .api import synthetic_projects
+
+TABS = ("dashboard", "projects", "costs", "estimation", "reports")
+# Projects in the scratch database the pages are rendered from
+PROJECT_COUNT = 500
+
+
+@contextmanager
+def project_database():
+    """
+    A scratch database holding ``PROJECT_COUNT`` synthetic projects and
+    their portfolio summary.
+    """
+    with scratch_database():
+        Project.objects.bulk_create(synthetic_projects(0, PROJECT_COUNT))
+        rebuild_portfolio_summary()
+        yield
+
+
+def _request(factory, path, ajax, etag=None):
+    headers = {}
+    if ajax:
+        headers["X-Requested-With"] = "XMLHttpRequest"
+    if etag:
+        headers["If-None-Match"] = etag
+    request = factory.get(path, headers=headers)
+    request.user = AnonymousUser()
+    request.COOKIES = {}
+    return request
+
+
+def _get(view, factory, path, ajax, etag=None):
+    response = view(_request(factory, path, ajax, etag))
+    return response.status_code, len(response.content), response.get("ETag")
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of requests per measurement.
+    """
+    factory = RequestFactory()
+    results = []
+    with project_database():
+        for tab in TABS:
+            view = getattr(views, tab)
+            path = f"/{tab}/" if tab != "dashboard" else "/"
+            for kind, ajax in (("full", False), ("partial", True)):
+                status, length, etag = _get(view, factory, path, ajax)
+                timing = measure(lambda: [_get(view, factory, path, ajax) for _ in range(size)], repeat=repeat)
+                results.append({"name": f"tabs.{tab}.{kind}", "size": size, "bytes": length,
+                                "seconds": timing["seconds"], "peak_bytes": timing["peak_bytes"]})
+                if kind == "partial":
+                    cached = measure(lambda: [_get(view, factory, path, ajax, etag) for _ in range(size)], repeat=repeat)
+                    if cached["result"][0][0] != 304:
+                        raise AssertionError(f"{tab}: matching ETag was not answered with 304.")
+                    results.append({"name": f"tabs.{tab}.304", "size": size, "bytes": 0,
+                                    "seconds": cached["seconds"], "peak_bytes": cached["peak_bytes"]})
+    return results
@@ -0,0 +1,116 @@
+"""
+Load test: concurrent uploads of large workbooks while other users load the
+dashboard, through the synchronous ``import_excel`` view (WSGI, one thread
+per request as under ``gunicorn --threads``) and through the async
+``import_excel_async`` view (ASGI, one event loop).
+
+Every run starts ``UPLOADERS`` uploads at once plus one reader fetching ``/``
+back to back until the last upload finishes.  Reported per path: the wall
+time of the batch, uploads per second and the p95 latency of the page loads
+made meanwhile.  Runs in a scratch database on disk.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import AsyncClient, Client, override_settings
+
+from . import scratch_database
+from ..models import ImportCacheEntry, PortfolioSummary, ProgressSnapshot, Project
+from ..timing import percentile
+from .workbooks import build_progress_reports
+
+UPLOADERS = 4
+
+
+def _clear():
+    for model in (ProgressSnapshot, PortfolioSummary, ImportCacheEntry, Project):
+        model.objects.all().delete()
+
+
+def _check(name, response, expected):
+    if response.status_code != expected:
+        raise AssertionError(f"{name}: answered {response.status_code}, expected {expected}.")
+
+
+def _wsgi_batch(workbooks):
+    done = threading.Event()
+    latencies = []
+
+    def upload(workbook):
+        name, data, _ = workbook
+        _check(name, Client().post("/import_excel/", {"excel_file": SimpleUploadedFile(name, data)}), 302)
+
+    def read():
+        client = Client()
+        while not done.is_set():
+            started = time.perf_counter()
+            _check("/", client.get("/"), 200)
+            latencies.append(time.perf_counter() - started)
+
+    with ThreadPoolExecutor(max_workers=len(workbooks) + 1) as pool:
+        reader = pool.submit(read)
+        for future in [pool.submit(upload, workbook) for workbook in workbooks]:
+            future.result()
+        done.set()
+        reader.result()
+    return latencies
+
+
+async def _asgi_batch(workbooks):
+    done = asyncio.Event()
+    latencies = []
+
+    async def upload(workbook):
+        name, data, _ = workbook
+        response = await AsyncClient().post("/import_excel/async/", {"excel_file": SimpleUploadedFile(name, data)})
+        _check(name, response, 200)
+
+    async def read():
+        client = AsyncClient()
+        while not done.is_set():
+            started = time.perf_counter()
+            _check("/", await client.get("/"), 200)
+            latencies.append(time.perf_counter() - started)
+
+    reader = asyncio.create_task(read())
+    await asyncio.gather(*(upload(workbook) for workbook in workbooks))
+    done.set()
+    await reader
+    return latencies
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of filler rows in each uploaded workbook (at most
+    200000).
+    """
+    extra_rows = min(size, 200_000)
+    workbooks = list(build_progress_reports(UPLOADERS, extra_rows=extra_rows))
+    total_bytes = sum(len(data) for _, data, _ in workbooks)
+    paths = (
+        ("uploads.wsgi", lambda: _wsgi_batch(workbooks)),
+        ("uploads.asgi", lambda: asyncio.run(_asgi_batch(workbooks))),
+    )
+
+    results = []
+    with scratch_database(on_disk=True), override_settings(ALLOWED_HOSTS=["testserver"], SLOW_REQUEST_MS=10**9):
+        # Warm up the page and the async path's parser pool
+        asyncio.run(_asgi_batch(workbooks[:1]))
+        for name, batch in paths:
+            best, latencies = None, []
+            for _ in range(repeat):
+                _clear()
+                started = time.perf_counter()
+                batch_latencies = batch()
+                seconds = time.perf_counter() - started
+                if best is None or seconds < best:
+                    best, latencies = seconds, batch_latencies
+            if Project.objects.count() != UPLOADERS:
+                raise AssertionError(f"{name}: {Project.objects.count()} projects stored, expected {UPLOADERS}.")
+            results.append({"name": name, "size": UPLOADERS, "bytes": total_bytes, "seconds": best,
+                            "per_second": UPLOADERS / best,
+                            "p95_ms": percentile(sorted(latencies), 95) * 1000 if latencies else None})
+    return results
@@ -0,0 +1,69 @@
+"""
+Benchmark: how long the validation pre-pass takes to accept a large workbook
+and to reject a zip bomb, a non-workbook and a workbook with a missing
+header cell, compared with opening the large workbook in openpyxl.
+"""
+import zipfile
+from io import BytesIO
+
+from openpyxl import load_workbook
+
+from . import measure
+from ..ingest import validate_workbook
+from .workbooks import build_progress_report
+
+
+def _zip_bomb(expanded_bytes):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("xl/workbook.xml", "<workbook/>")
+        archive.writestr("xl/worksheets/sheet1.xml", b"\0" * expanded_bytes)
+    return buffer.getvalue()
+
+
+def _missing_name(extra_rows):
+    buffer = BytesIO()
+    build_progress_report(buffer, extra_rows=extra_rows)
+    workbook = load_workbook(BytesIO(buffer.getvalue()))
+    workbook.active["B2"] = None
+    broken = BytesIO()
+    workbook.save(broken)
+    return broken.getvalue()
+
+
+def _validate(data, expect_valid):
+    report = validate_workbook(BytesIO(data))
+    if report["valid"] != expect_valid:
+        raise AssertionError(f"Expected valid={expect_valid}, got {report}.")
+    return report
+
+
+def _load_full(data):
+    load_workbook(BytesIO(data)).close()
+
+
+def run(size, repeat):
+    """
+    ``size`` is the number of filler rows in the workbooks (at most 200000).
+    """
+    size = min(size, 200_000)
+    buffer = BytesIO()
+    build_progress_report(buffer, extra_rows=size)
+    large = buffer.getvalue()
+    cases = (
+        ("validation.accept", large, True),
+        ("validation.missing_cell", _missing_name(min(size, 5000)), False),
+        ("validation.zip_bomb", _zip_bomb(256 * 1024 * 1024), False),
+        ("validation.not_xlsx", b"PK\x03\x04" + large[4:4096], False),
+    )
+
+    results = []
+    for name, data, expect_valid in cases:
+        timing = measure(_validate, data, expect_valid, repeat=repeat)
+        results.append({"name": name, "size": size, "bytes": len(data),
+                        "seconds": timing["seconds"], "peak_bytes": timing["peak_bytes"]})
+    timing = measure(_load_full, large, repeat=repeat)
+    results.append({"name": "validation.openpyxl_full_load", "size": size, "bytes": len(large),
+                    "seconds": timing["seconds"], "peak_bytes": timing["peak_bytes"]})
+    return results
@@ -0,0 +1,135 @@
+"""
+Synthetic progress-report workbooks in the layout ``import_excel`` expects:
+header cells B1-B4, H1-H3 and A6, the bill of quantities in rows 10-113
+(line items under a heading row per work division) and the approved
+contract in E117.
+
+Rows are streamed through a write-only workbook, so generating a report with
+a million filler rows takes no more memory than a small one.
+"""
+import random
+import shutil
+import tempfile
+import zipfile
+from datetime import date, timedelta
+from io import BytesIO
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.cell import coordinate_from_string, column_index_from_string
+
+from ..ingest import EXPENSE_FIRST_ROW, EXPENSE_LAST_ROW, HEADER_CELLS
+
+SHEET_PATH = "xl/worksheets/sheet1.xml"
+WIDTH = 8
+
+DIVISIONS = (
+    "GENERAL REQUIREMENTS", "SITE WORKS", "CONCRETE WORKS", "MASONRY WORKS",
+    "METAL WORKS", "CARPENTRY WORKS", "ROOFING WORKS", "FINISHING WORKS",
+)
+# Bill of quantities rows per division, heading included
+DIVISION_ROWS = 13
+
+
+def _header_values(rng, seed, proj_id):
+    start = date(2020, 1, 1) + timedelta(days=rng.randrange(1500))
+    return {
+        "proj_id": proj_id or f"PM-{seed:06d}",
+        "name": f"Synthetic Project {seed}",
+        "location": rng.choice(["Manila", "Cebu", "Davao", "Iloilo", "Baguio"]),
+        "start_date": start,
+        "report_date": start + timedelta(days=rng.randrange(30, 400)),
+        "accomplished_to_date": round(rng.uniform(0, 60), 2),
+        "accomplished_before_period": round(rng.uniform(0, 40), 2),
+        "progress_report_month_year": (start + timedelta(days=90)).strftime("%B %Y").upper(),
+    }
+
+
+def _report_rows(rng, header, extra_rows):
+    """
+    Yield the sheet rows top to bottom; fills in ``header["approved_contract"]``
+    on the way.
+    """
+    # Place every header value at its (row, column) in a sparse grid
+    cells = {}
+    for field, address in HEADER_CELLS.items():
+        column, row = coordinate_from_string(address)
+        cells.setdefault(row, {})[column_index_from_string(column) - 1] = field
+    contract_row = coordinate_from_string(HEADER_CELLS["approved_contract"])[1]
+
+    contract = 0.0
+    for row in range(1, contract_row + 1 + extra_rows):
+        values = [None] * WIDTH
+        for column, field in cells.get(row, {}).items():
+            values[column] = header.get(field)
+        if EXPENSE_FIRST_ROW <= row <= EXPENSE_LAST_ROW and (row - EXPENSE_FIRST_ROW) % DIVISION_ROWS == 0:
+            division = (row - EXPENSE_FIRST_ROW) // DIVISION_ROWS
+            values[0] = str(division + 1)
+            values[1] = DIVISIONS[division % len(DIVISIONS)]
+        elif EXPENSE_FIRST_ROW <= row <= EXPENSE_LAST_ROW:
+            quantity = rng.randint(1, 500)
+            amount = round(quantity * rng.uniform(50, 5000), 2)
+            values[0] = f"{row - EXPENSE_FIRST_ROW + 1}"
+            values[1] = f"Line item {row}"
+            values[2] = quantity  # C: contract quantity
+            values[3] = "lot"
+            values[4] = amount  # E: contract amount
+            values[5] = rng.randint(0, quantity)  # F: quantity accomplished
+            contract += amount
+        elif row == contract_row:
+            header["approved_contract"] = round(contract, 2)
+            values[4] = header["approved_contract"]  # E117: approved contract
+        elif row > contract_row:
+            values = [f"Detail {row}", rng.random(), rng.random(), rng.random(), rng.random(), rng.random()]
+        yield values
+
+
+def _copy_with_dimension(source, target, ref):
+    """
+    Copy the workbook zip ``source`` to ``target``, adding the sheet's
+    ``<dimension>`` element (which Excel writes and write-only mode does not).
+    """
+    with zipfile.ZipFile(source) as archive, zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as output:
+        for item in archive.infolist():
+            with archive.open(item) as reader, output.open(item.filename, "w") as writer:
+                if item.filename == SHEET_PATH:
+                    # <dimension> must precede <sheetViews>, which sits near the top
+                    head = reader.read(4096)
+                    writer.write(head.replace(b"<sheetViews>", f'<dimension ref="{ref}" /><sheetViews>'.encode(), 1))
+                shutil.copyfileobj(reader, writer)
+
+
+def build_progress_report(target, seed=0, proj_id=None, extra_rows=0):
+    """
+    Write a synthetic progress report to ``target`` (a path or binary buffer)
+    and return its header values.
+
+    ``extra_rows`` appends filler rows below the contract total, standing in
+    for the detail sheets real reports carry, to make large workbooks.
+    """
+    rng = random.Random(seed)
+    header = _header_values(rng, seed, proj_id)
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Progress Report")
+    rows = 0
+    for values in _report_rows(rng, header, extra_rows):
+        sheet.append(values)
+        rows += 1
+
+    with tempfile.TemporaryFile() as spool:
+        workbook.save(spool)
+        spool.seek(0)
+        _copy_with_dimension(spool, target, f"A1:{get_column_letter(WIDTH)}{rows}")
+    return header
+
+
+def build_progress_reports(count, start=0, extra_rows=0):
+    """
+    Yield ``(file name, workbook bytes, header)`` for ``count`` reports with
+    distinct project ids, for bulk-import benchmarks.
+    """
+    for seed in range(start, start + count):
+        buffer = BytesIO()
+        header = build_progress_report(buffer, seed=seed, extra_rows=extra_rows)
+        yield f"report-{seed:06d}.xlsx", buffer.getvalue(), header
@@ -0,0 +1,199 @@
+"""
+Versioned cache of query results and rendered page fragments.
+
+Every key embeds the current version of its namespace.  Writing a project
+bumps the ``projects`` version: ``post_save`` / ``post_delete`` do it for
+single saves and deletes, and the bulk write paths (``update()``,
+``bulk_create``), which send no signals, call ``bump`` themselves.  Old
+entries are never looked up again and age out of the backend, so nothing is
+served stale and nothing depends on a guessed TTL.
+
+The bump runs when the surrounding transaction commits.  Bumping earlier
+would let a concurrent request cache the pre-commit rows under the new version.
+
+The backend is ``settings.VIEW_CACHE_ALIAS``.  Local memory is per process,
+so a bump in one server worker or ``manage.py`` command never reaches the
+others.  Keys therefore also embed a fingerprint of the tables behind the
+namespace (see ``namespace_state``), read from the database: a write from
+any process changes it.  It is read once per request.  A shared backend
+(``CACHE_DIR``) only lets the processes share their entries.  Hit and miss
+counters are kept per process; ``api/cache/`` reports them.
+"""
+import hashlib
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import request_finished, request_started
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .models import EstimatorStatistics, PortfolioSummary, Project
+
+PROJECTS = "projects"
+
+_MISSING = object()
+_stats = Counter()
+_stats_lock = threading.Lock()
+# Namespace states read during the current request, per thread
+_request_states = threading.local()
+
+
+def _cache():
+    return caches[settings.VIEW_CACHE_ALIAS]
+
+
+def _version_key(namespace):
+    return f"powermason:version:{namespace}"
+
+
+def namespace_version(namespace):
+    """
+    Current version of ``namespace``.  A missing (or evicted) version starts
+    from the clock, so it never repeats a number used before.
+    """
+    cache = _cache()
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        cache.add(_version_key(namespace), time.time_ns(), timeout=None)
+        version = cache.get(_version_key(namespace))
+    return version
+
+
+def _projects_state():
+    # Every project write moves the newest updated_at or the highest id;
+    # deletions and other aggregated changes move the summary rows
+    return (
+        Project.objects.aggregate(updated_at=Max("updated_at"), max_id=Max("id")),
+        PortfolioSummary.objects.aggregate(updated_at=Max("updated_at"), count=Count("id")),
+        EstimatorStatistics.objects.aggregate(updated_at=Max("updated_at"), count=Count("id")),
+    )
+
+
+NAMESPACE_STATES = {
+    PROJECTS: _projects_state,
+}
+
+
+@receiver(request_started, dispatch_uid="powermason_cache_request_started")
+def _request_started(sender, **kwargs):
+    _request_states.states = {}
+
+
+@receiver(request_finished, dispatch_uid="powermason_cache_request_finished")
+def _request_finished(sender, **kwargs):
+    _request_states.states = None
+
+
+def namespace_state(namespace):
+    """
+    Short digest of the database rows behind ``namespace``.
+
+    Unlike the version, it changes whichever process wrote the rows.  It is
+    read once per request (the version covers the request's own writes) and
+    on every call outside one.
+    """
+    states = getattr(_request_states, "states", None)
+    if states is not None and namespace in states:
+        return states[namespace]
+    state = NAMESPACE_STATES[namespace]() if namespace in NAMESPACE_STATES else ()
+    digest = hashlib.sha1(repr(state).encode()).hexdigest()[:12]
+    if states is not None:
+        states[namespace] = digest
+    return digest
+
+
+def _bump_now(namespace):
+    try:
+        _cache().incr(_version_key(namespace))
+    except ValueError:
+        # Not stored yet; the next read starts a fresh version
+        pass
+
+
+def bump(namespace):
+    """
+    Invalidate everything cached under ``namespace`` once the current
+    transaction (if any) commits.
+    """
+    transaction.on_commit(lambda: _bump_now(namespace))
+
+
+@receiver([post_save, post_delete], sender=Project, dispatch_uid="powermason_cache_projects")
+def _project_written(sender, **kwargs):
+    bump(PROJECTS)
+
+
+def cache_key(namespace, name, params=()):
+    """
+    Key of ``name`` in the current version and state of ``namespace``;
+    ``params`` (a dict or pairs) are the filters, sort and page it was
+    computed for.
+    """
+    items = sorted((params.items() if isinstance(params, dict) else params), key=lambda item: item[0])
+    digest = hashlib.sha1(urlencode([(key, "" if value is None else value) for key, value in items]).encode())
+    version = f"{namespace_version(namespace)}.{namespace_state(namespace)}"
+    return f"powermason:{namespace}:{version}:{name}:{digest.hexdigest()}"
+
+
+def _count(namespace, outcome):
+    with _stats_lock:
+        _stats[namespace, outcome] += 1
+
+
+def cached(namespace, name, compute, params=()):
+    """
+    The cached value of ``name`` for ``params``, calling ``compute()`` (and
+    storing its result) on a miss.
+    """
+    cache = _cache()
+    key = cache_key(namespace, name, params)
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        _count(namespace, "hits")
+        return value
+    _count(namespace, "misses")
+    value = compute()
+    cache.set(key, value, timeout=settings.VIEW_CACHE_TIMEOUT)
+    return value
+
+
+def cached_fragment(namespace, template_name, get_context, params=()):
+    """
+    ``template_name`` rendered with ``get_context()``, from the cache when
+    possible.  The fragment must not depend on the request (no CSRF token,
+    user or messages).
+    """
+    html = cached(namespace, template_name, lambda: render_to_string(template_name, get_context()), params)
+    return mark_safe(html)
+
+
+def cache_stats():
+    """
+    Hits, misses and hit rate per namespace since this process started.
+    """
+    with _stats_lock:
+        counts = dict(_stats)
+    stats = {}
+    for namespace in sorted({namespace for namespace, _ in counts}):
+        hits = counts.get((namespace, "hits"), 0)
+        misses = counts.get((namespace, "misses"), 0)
+        stats[namespace] = {
+            "version": namespace_version(namespace),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else None,
+        }
+    return stats
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,244 @@
+"""
+Cost line items: the rows of each progress report's bill of quantities.
+
+Imports store the items of a report with ``record_cost_items``, keyed like
+``ProgressSnapshot`` by project and report date: a new period adds its
+items, re-importing a period replaces that period's items.  The rows are
+written with ``bulk_create`` in batches, so a bulk import of thousands of
+reports costs a few statements per batch rather than one per line.
+
+The aggregations answer from the ``(project, report_date, row)`` unique
+index, the ``report_date`` index and the ``(category, report_date)`` index:
+
+* ``cost_by_project`` and ``cost_by_category`` total the items of each
+  project's current report (the one its ``Project`` row was imported from);
+* ``cost_by_period`` totals every report per calendar month.  It groups by
+  report date and project in SQL and folds the groups into months in
+  Python: SQLite's ``TruncMonth`` calls back into Python for every row.
+
+Writers bump the ``PROJECTS`` cache namespace, which the API and the costs
+page cache these under.
+"""
+from collections import defaultdict
+from decimal import Decimal
+from itertools import islice
+
+from django.db import transaction
+from django.db.backends.utils import format_number
+from django.db.models import Count, F, Max, Sum
+
+from .models import CostItem
+from .portfolio import dashboard_summary, portfolio_state
+
+COST_GROUPS = ("project", "category", "period")
+
+# Item dict key -> CostItem field
+ITEM_FIELDS = {
+    "row": "row",
+    "item": "item_no",
+    "description": "description",
+    "category": "category",
+    "quantity": "quantity",
+    "amount": "amount",
+    "accomplished": "accomplished",
+    "expense": "expense",
+}
+_TOTALS = {"item_count": Count("id"), "contract": Sum("amount"), "expense": Sum("expense")}
+_CENTS = Decimal("0.01")
+# Rows per table on the costs page
+COST_PAGE_ROWS = 10
+
+
+def _field_value(field, value):
+    """
+    ``value`` (possibly in its JSON form, from the import cache) as the
+    column ``field`` stores it: decimals quantized, text cut to the column's
+    length.
+    """
+    value = field.to_python(value)
+    if value is None:
+        return None
+    if field.get_internal_type() == "DecimalField":
+        return Decimal(format_number(value, field.max_digits, field.decimal_places))
+    if field.max_length:
+        return value[:field.max_length]
+    return value
+
+
+def _cost_items(reports):
+    fields = [(key, CostItem._meta.get_field(name)) for key, name in ITEM_FIELDS.items()]
+    for project, items in reports:
+        for item in items:
+            yield CostItem(
+                project_id=project.pk,
+                report_date=project.report_date,
+                **{field.name: _field_value(field, item[key]) for key, field in fields},
+            )
+
+
+def record_cost_items(reports, batch_size=1000):
+    """
+    Store the line items of saved projects; ``reports`` holds ``(project,
+    items)`` pairs with the item dicts of ``ingest.build_cost_items``.  The
+    items already stored for each project's report date are replaced;
+    projects without a report date are skipped.  Returns the number of rows
+    written.
+    """
+    reports = [(project, items) for project, items in reports if project.report_date is not None]
+    if not reports:
+        return 0
+    by_date = defaultdict(list)
+    for project, _ in reports:
+        by_date[project.report_date].append(project.pk)
+
+    written = 0
+    with transaction.atomic():
+        for report_date, pks in by_date.items():
+            for start in range(0, len(pks), batch_size):
+                CostItem.objects.filter(report_date=report_date, project_id__in=pks[start:start + batch_size]).delete()
+        rows = _cost_items(reports)
+        while batch := list(islice(rows, batch_size)):
+            CostItem.objects.bulk_create(batch)
+            written += len(batch)
+    return written
+
+
+def projects_missing_cost_items(projects, batch_size=1000):
+    """
+    The projects (with a report date) that have no line items stored for
+    their report date, e.g. imported before items were kept.
+    """
+    projects = [project for project in projects if project.report_date is not None]
+    present = set()
+    for start in range(0, len(projects), batch_size):
+        pks = [project.pk for project in projects[start:start + batch_size]]
+        present.update(
+            CostItem.objects.filter(project_id__in=pks).order_by().values_list("project_id", "report_date").distinct()
+        )
+    return [project for project in projects if (project.pk, project.report_date) not in present]
+
+
+def _filtered(queryset, start=None, end=None, category=None, proj_id=None):
+    if start is not None:
+        queryset = queryset.filter(report_date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(report_date__lte=end)
+    if category is not None:
+        queryset = queryset.filter(category=category)
+    if proj_id is not None:
+        queryset = queryset.filter(project__proj_id=proj_id)
+    return queryset
+
+
+def current_cost_items():
+    """
+    The items of each project's current report.
+    """
+    return CostItem.objects.filter(report_date=F("project__report_date"))
+
+
+def _rows(rows):
+    """
+    Aggregate rows with the money totals in cents (SQLite sums decimals with
+    varying precision).
+    """
+    rows = list(rows)
+    for row in rows:
+        for key in ("contract", "expense"):
+            if row[key] is not None:
+                row[key] = row[key].quantize(_CENTS)
+    return rows
+
+
+def cost_by_project(limit=None, **filters):
+    """
+    Per project: item count, contract amount and expense of its current
+    report, highest expense first.  ``filters`` are ``start``, ``end``,
+    ``category`` and ``proj_id``.
+    """
+    rows = (
+        _filtered(current_cost_items(), **filters)
+        .values(proj_id=F("project__proj_id"), name=F("project__name"))
+        .annotate(**_TOTALS)
+        .order_by("-expense", "proj_id")
+    )
+    return _rows(rows[:limit] if limit else rows)
+
+
+def cost_by_category(limit=None, **filters):
+    """
+    Per category, over the projects' current reports: item and project
+    counts, contract amount and expense, highest expense first.
+    """
+    rows = (
+        _filtered(current_cost_items(), **filters)
+        .values("category")
+        .annotate(project_count=Count("project", distinct=True), **_TOTALS)
+        .order_by("-expense", "category")
+    )
+    return _rows(rows[:limit] if limit else rows)
+
+
+def cost_by_period(limit=None, **filters):
+    """
+    Per calendar month of the report date, oldest first: the number of
+    projects that reported, their items, contract amount and expense to date.
+    """
+    reports = (
+        _filtered(CostItem.objects.all(), **filters)
+        .values("report_date", "project_id")
+        .annotate(**_TOTALS)
+        .order_by()
+    )
+    months = {}
+    for report in reports:
+        month = report["report_date"].replace(day=1)
+        row = months.setdefault(month, {"month": month, "projects": set(), "item_count": 0,
+                                        "contract": Decimal("0"), "expense": Decimal("0")})
+        row["projects"].add(report["project_id"])
+        row["item_count"] += report["item_count"]
+        row["contract"] += report["contract"] or 0
+        row["expense"] += report["expense"] or 0
+    rows = [
+        {"month": row["month"], "project_count": len(row.pop("projects")), **row}
+        for row in (months[month] for month in sorted(months))
+    ]
+    rows = _rows(rows)
+    return rows[-limit:] if limit else rows
+
+
+COST_AGGREGATIONS = {
+    "project": cost_by_project,
+    "category": cost_by_category,
+    "period": cost_by_period,
+}
+
+
+def cost_state():
+    """
+    Fingerprint of the costs page's data for its ETag: the portfolio
+    summary plus the item table's row count and highest id (items are
+    replaced, never updated in place).
+    """
+    state = portfolio_state()
+    state.update(
+        {f"items_{key}": value for key, value in CostItem.objects.aggregate(count=Count("id"), max_id=Max("id")).items()}
+    )
+    return state
+
+
+def cost_overview(limit=COST_PAGE_ROWS):
+    """
+    Context of the costs page: portfolio budget, expense and remaining
+    amount, and the top ``limit`` categories and projects by expense with
+    the last ``limit`` months.
+    """
+    portfolio = dashboard_summary()
+    return {
+        "budget": portfolio["approved_contract"],
+        "expense": portfolio["total_expense"],
+        "remaining": portfolio["approved_contract"] - portfolio["total_expense"],
+        "by_category": cost_by_category(limit),
+        "by_project": cost_by_project(limit),
+        "by_period": cost_by_period(limit),
+    }
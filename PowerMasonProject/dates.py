@@ -0,0 +1,221 @@
+"""
+Date parsing for progress-report cells.
+
+Instead of trying every ``strptime`` format in turn, a date string is split
+into tokens and classified by its shape: digit runs by length, alphabetic
+month names and the separators between them ("n/n/Y", "A n, Y", ...).  Only
+the formats with that shape are considered, in the original priority order,
+and their fields are validated directly with the same ranges ``strptime``
+accepts, so a miss costs a comparison rather than a raised ``ValueError``.
+
+Parsed strings are kept in an LRU cache, and a :class:`DateParser` remembers
+per source which day/month order its unambiguous dates used, so "05/06/2023"
+from a source that also wrote "25/06/2023" is read the same way.  The
+ingestion engine uses one parser per workbook, the workbook being the source.
+
+No Django imports: this runs inside the ingestion worker processes.
+"""
+import calendar
+import re
+from datetime import date
+from functools import lru_cache
+
+
+# Formats in priority order; the first one that yields a valid date wins
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%d-%m-%Y",
+    "%d/%m/%Y",
+    "%Y/%m/%d",
+    "%m-%d-%Y",
+    "%B %d, %Y",  # e.g., "July 24, 2023"
+    "%b %d, %Y",  # e.g., "Jul 24, 2023"
+    "%d %B %Y",  # e.g., 24 July 2023
+    "%d %b %Y",  # e.g., 24 Jul 2023
+    "%Y-%m-%d %H:%M:%S",  # Include time
+    "%m/%d/%Y %H:%M:%S",
+    "%d-%m-%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M:%S",
+    "%Y/%m/%d %H:%M:%S",
+    "%m-%d-%Y %H:%M:%S",
+)
+
+PARSE_CACHE_SIZE = 4096
+
+_TOKEN_RE = re.compile(r"\d+|[A-Za-z]+|\s+|[^\dA-Za-z\s]+")
+_DIRECTIVE_RE = re.compile(r"%([A-Za-z])|(\s+)|([^%\s]+)")
+_SEPT_RE = re.compile(r"\bsept\b", re.IGNORECASE)
+
+# Shape symbol of each directive: "n" is one or two digits, "Y" four digits, "A" a word
+_DIRECTIVE_SHAPES = {"Y": "Y", "m": "n", "d": "n", "H": "n", "M": "n", "S": "n", "B": "A", "b": "A"}
+
+_MONTH_NAMES = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+_MONTH_ABBREVIATIONS = {name.lower(): number for number, name in enumerate(calendar.month_abbr) if name}
+
+# Largest value per numeric directive, as accepted by strptime and datetime
+_FIELD_LIMITS = {"m": 12, "d": 31, "H": 23, "M": 59, "S": 59}
+
+
+def _compile_format(fmt):
+    """
+    Split a format into its shape string and the directive of each token.
+    """
+    shape, directives = [], []
+    for directive, space, literal in _DIRECTIVE_RE.findall(fmt):
+        if directive:
+            shape.append(_DIRECTIVE_SHAPES[directive])
+            directives.append(directive)
+        elif space:
+            shape.append(" ")
+            directives.append(None)
+        else:
+            shape.append(literal)
+            directives.append(None)
+    return "".join(shape), tuple(directives)
+
+
+def _build_dispatch_table(formats):
+    """
+    Map each shape to its ``(format, directives)`` candidates in priority order.
+    """
+    table = {}
+    for fmt in dict.fromkeys(formats):  # drop duplicate formats, keep the first
+        shape, directives = _compile_format(fmt)
+        table.setdefault(shape, []).append((fmt, directives))
+    return {shape: tuple(candidates) for shape, candidates in table.items()}
+
+
+_DISPATCH = _build_dispatch_table(DATE_FORMATS)
+_FORMAT_SHAPES = {fmt: shape for shape, candidates in _DISPATCH.items() for fmt, _ in candidates}
+
+
+def normalize_date_string(date_string):
+    """
+    Replace uncommon month abbreviations with standard ones.
+    """
+    # Only the standalone word: "September" must stay intact
+    return _SEPT_RE.sub("Sep", date_string)
+
+
+def classify_date_string(date_string):
+    """
+    Return ``(shape, tokens)`` for a date string, e.g. "7/24/2023" -> "n/n/Y".
+    """
+    tokens = _TOKEN_RE.findall(date_string)
+    shape = []
+    for token in tokens:
+        first = token[0]
+        if first.isdigit():
+            shape.append("n" if len(token) <= 2 else "Y" if len(token) == 4 else "#")
+        elif first.isalpha():
+            shape.append("A")
+        elif first.isspace():
+            shape.append(" ")
+        else:
+            shape.append(token)
+    return "".join(shape), tokens
+
+
+def _read_fields(tokens, directives):
+    """
+    Build a date from the tokens of one candidate format, or None if a field
+    is out of range.
+    """
+    year = month = day = None
+    for token, directive in zip(tokens, directives):
+        if directive is None:
+            continue
+        if directive == "Y":
+            year = int(token)
+        elif directive == "B" or directive == "b":
+            month = (_MONTH_NAMES if directive == "B" else _MONTH_ABBREVIATIONS).get(token.lower())
+            if month is None:
+                return None
+        else:
+            value = int(token)
+            if value > _FIELD_LIMITS[directive] or (value == 0 and directive in "md"):
+                return None
+            if directive == "m":
+                month = value
+            elif directive == "d":
+                day = value
+    try:
+        return date(year, month, day)
+    except ValueError:  # year 0000, February 30th, ...
+        return None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _readings(date_string):
+    """
+    Every valid ``(format, date)`` reading of a raw string, in priority order.
+    Cached because batch imports see the same few dates over and over.
+    """
+    shape, tokens = classify_date_string(normalize_date_string(date_string))
+    readings = []
+    for fmt, directives in _DISPATCH.get(shape, ()):
+        value = _read_fields(tokens, directives)
+        if value is not None:
+            readings.append((fmt, value))
+    return tuple(readings)
+
+
+class DateParser:
+    """
+    Parses date strings and remembers, per source, the format of the last date
+    only one format could read.  When a later string from the same source is
+    ambiguous ("05/06/2023" is valid as both %m/%d/%Y and %d/%m/%Y) the
+    remembered format decides; without a source the priority order does.
+    """
+
+    def __init__(self):
+        self._last_format = {}  # (source, shape) -> format
+
+    def parse(self, date_str, source=None):
+        readings = _readings(date_str)
+        if not readings:
+            normalized = normalize_date_string(date_str)
+            raise ValueError(
+                f"Date string '{normalized}' does not match any expected format.  Input was: '{date_str}'"
+            )
+        if source is None:
+            return readings[0][1]
+
+        shape = _FORMAT_SHAPES[readings[0][0]]
+        if len(readings) == 1:
+            self._last_format[source, shape] = readings[0][0]
+            return readings[0][1]
+        remembered = self._last_format.get((source, shape))
+        for fmt, value in readings:
+            if fmt == remembered:
+                return value
+        return readings[0][1]
+
+    def forget(self, source=None):
+        """
+        Drop the remembered formats of one source, or of every source.
+        """
+        if source is None:
+            self._last_format.clear()
+        else:
+            for key in [key for key in self._last_format if key[0] == source]:
+                del self._last_format[key]
+
+
+_default_parser = DateParser()
+
+
+def parse_date_string(date_str, source=None):
+    """
+    Helper function to parse date strings with flexible formats.
+    """
+    return _default_parser.parse(date_str, source)
+
+
+def clear_cache():
+    """
+    Empty the parsed-string cache and every remembered source format.
+    """
+    _readings.cache_clear()
+    _default_parser.forget()
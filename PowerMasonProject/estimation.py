@@ -0,0 +1,246 @@
+"""
+Cost estimates fitted on the project history.
+
+A least-squares line is fitted against the approved contract (the budget,
+in millions) for the ``cost`` target: the cost at completion, projected for
+projects at least ``MIN_PROGRESS`` % accomplished as total_expense /
+accomplished_to_date.
+
+There is no duration estimate and the dates are not regressors.  The
+progress-report template carries no end or target date, so an imported
+project never has an end date and a duration line would have no samples.
+The start date alone does not tell a project's duration, and the report
+date is when the project was observed, not a property of it.
+
+The line is fitted over the whole portfolio and per location; a location
+with fewer than ``MIN_SAMPLES`` projects falls back to the portfolio line.
+
+A simple regression is determined by n, Σx, Σy, Σx², Σxy (Σy² gives the
+residual spread), so ``EstimatorStatistics`` stores only those sums per
+(target, location).  ``apply_estimate_changes`` folds project writes into
+them as ``portfolio.apply_project_changes``, its caller, does for the
+dashboard summary: an import refits the model with a few UPDATEs instead of
+a table scan.  The lines are solved from the sums once per version of the
+``PROJECTS`` cache namespace, so an estimate is arithmetic on a cached dict.
+
+``rebuild_estimator`` (``manage.py rebuild_estimator``) recomputes the sums
+from the project table with NumPy, which also clears accumulated float
+rounding.
+"""
+import math
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.utils import timezone
+
+from .caching import PROJECTS, bump, cached
+from .models import EstimatorStatistics, Project
+
+COST = EstimatorStatistics.COST
+TARGETS = (COST,)
+
+BUDGET_UNIT = 1_000_000  # x is the approved contract in millions
+MIN_PROGRESS = Decimal("10")  # Below this, projecting the cost at completion is mostly noise
+MIN_SAMPLES = 5  # Fewest projects a line is fitted from
+RANGE_Z = 1.645  # Estimate +/- this many residual spreads: roughly a 90 % range
+
+# Statistics row columns, in the order of the delta lists
+SUM_COLUMNS = ("sample_count", "sum_x", "sum_y", "sum_xx", "sum_xy", "sum_yy")
+_CENTS = Decimal("0.01")
+
+
+def _samples(values):
+    """
+    ``(target, x, y)`` for each line a project (``portfolio.summary_values``)
+    contributes to.
+    """
+    if values["approved_contract"] is None:
+        return
+    x = float(values["approved_contract"]) / BUDGET_UNIT
+    progress, expense = values["accomplished_to_date"], values["total_expense"]
+    if progress is not None and expense is not None and progress >= MIN_PROGRESS:
+        yield COST, x, float(expense) * 100 / float(progress)
+
+
+def apply_estimate_changes(changes):
+    """
+    Fold project changes (``(old, new)`` pairs of ``summary_values`` dicts, as
+    for ``apply_project_changes``) into the statistics rows: the old values'
+    samples are subtracted and the new ones added, netted per row.
+    """
+    deltas = defaultdict(lambda: [0, 0.0, 0.0, 0.0, 0.0, 0.0])
+    for old, new in changes:
+        for values, sign in ((old, -1), (new, 1)):
+            if values is None:
+                continue
+            # Projects without a location only count toward the portfolio line
+            locations = ("", values["location"]) if values["location"] else ("",)
+            for target, x, y in _samples(values):
+                for location in locations:
+                    delta = deltas[target, location]
+                    delta[0] += sign
+                    delta[1] += sign * x
+                    delta[2] += sign * y
+                    delta[3] += sign * x * x
+                    delta[4] += sign * x * y
+                    delta[5] += sign * y * y
+    deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return
+
+    now = timezone.now()
+    with transaction.atomic():
+        EstimatorStatistics.objects.bulk_create(
+            [EstimatorStatistics(target=target, location=location) for target, location in deltas],
+            ignore_conflicts=True,
+        )
+        for (target, location), delta in deltas.items():
+            EstimatorStatistics.objects.filter(target=target, location=location).update(
+                updated_at=now,  # update() bypasses auto_now
+                **{name: F(name) + value for name, value in zip(SUM_COLUMNS, delta)},
+            )
+
+
+def _column(values, dtype=float):
+    return np.array([np.nan if value is None else value for value in values], dtype=dtype)
+
+
+def rebuild_estimator(chunk_size=10_000):
+    """
+    Recompute every statistics row from the project table.  Returns the
+    number of rows written.
+    """
+    fields = ("location", "approved_contract", "total_expense", "accomplished_to_date")
+    rows = list(Project.objects.order_by().values_list(*fields).iterator(chunk_size=chunk_size))
+    location, contract, expense, progress = zip(*rows) if rows else ((),) * len(fields)
+
+    names, codes = np.unique(np.array([value or "" for value in location], dtype=object), return_inverse=True)
+    x = _column(contract) / BUDGET_UNIT
+    expense, progress = _column(expense), _column(progress)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        samples = {
+            COST: (~np.isnan(x) & ~np.isnan(expense) & (progress >= float(MIN_PROGRESS)), expense * 100 / progress),
+        }
+
+    statistics = []
+    for target, (mask, y) in samples.items():
+        xs, ys, group = x[mask], y[mask], codes[mask]
+        columns = (np.ones_like(xs), xs, ys, xs * xs, xs * ys, ys * ys)
+        per_location = [np.bincount(group, weights=column, minlength=len(names)) for column in columns]
+        totals = {"": [column.sum() for column in columns]}
+        for index, name in enumerate(names):
+            if name:
+                totals[name] = [column[index] for column in per_location]
+        for key, (count, *values) in totals.items():
+            if count:
+                statistics.append(EstimatorStatistics(
+                    target=target, location=key, sample_count=int(count),
+                    **{name: float(value) for name, value in zip(SUM_COLUMNS[1:], values)},
+                ))
+
+    with transaction.atomic():
+        EstimatorStatistics.objects.all().delete()
+        EstimatorStatistics.objects.bulk_create(statistics)
+        bump(PROJECTS)
+    return len(statistics)
+
+
+def _line(row):
+    """
+    Intercept, slope and residual standard deviation of the least-squares
+    line through the samples summed in ``row``.
+    """
+    n = row["sample_count"]
+    sxx = row["sum_xx"] - row["sum_x"] ** 2 / n
+    sxy = row["sum_xy"] - row["sum_x"] * row["sum_y"] / n
+    syy = row["sum_yy"] - row["sum_y"] ** 2 / n
+    # Every budget (nearly) the same: the best line is the mean
+    slope = sxy / sxx if sxx > 1e-9 * max(row["sum_xx"], 1) else 0.0
+    intercept = (row["sum_y"] - slope * row["sum_x"]) / n
+    residual = max(syy - slope * sxy, 0.0)
+    spread = math.sqrt(residual / (n - 2)) if n > 2 else 0.0
+    return {"intercept": intercept, "slope": slope, "spread": spread, "samples": n}
+
+
+def _fit_lines():
+    rows = EstimatorStatistics.objects.filter(sample_count__gte=MIN_SAMPLES).values("target", "location", *SUM_COLUMNS)
+    lines = {target: {} for target in TARGETS}
+    for row in rows:
+        lines[row["target"]][row["location"]] = _line(row)
+    return lines
+
+
+def fitted_lines():
+    """
+    ``{target: {location: line}}`` for every line with enough samples, the
+    portfolio line under ``""``; solved once per cache version.
+    """
+    return cached(PROJECTS, "estimator_lines", _fit_lines)
+
+
+def estimate_locations():
+    """
+    The locations with a line of their own, for the estimation form.
+    """
+    lines = fitted_lines()
+    return sorted({location for target in TARGETS for location in lines[target] if location})
+
+
+def estimator_state():
+    """
+    Fingerprint of the statistics rows for the estimation page's ETag.
+    """
+    return EstimatorStatistics.objects.aggregate(updated_at=Max("updated_at"), count=Count("id"))
+
+
+def budget_param(params, name="budget"):
+    """
+    The positive amount in query parameter ``name``, or None when it is
+    missing, not a positive number or too large for an approved contract.
+    """
+    try:
+        value = Decimal(params.get(name, "").replace(",", "").strip())
+    except ArithmeticError:
+        return None
+    field = Project._meta.get_field("approved_contract")
+    if not value.is_finite() or not 0 < value < 10 ** (field.max_digits - field.decimal_places):
+        return None
+    return value
+
+
+def _rounded(value):
+    return Decimal(max(value, 0.0)).quantize(_CENTS, rounding=ROUND_HALF_UP)
+
+
+def estimate(budget, location=None):
+    """
+    Estimated cost at completion of a project with an approved contract of
+    ``budget`` at ``location``.
+
+    Returns ``{target: {"estimate", "low", "high", "samples", "scope"}}``
+    where ``scope`` says whether the location's line or the portfolio's was
+    used; a target is None while too few projects are known.
+    """
+    lines = fitted_lines()
+    x = float(budget) / BUDGET_UNIT
+    result = {}
+    for target in TARGETS:
+        line, scope = lines[target].get(location) if location else None, "location"
+        if line is None:
+            line, scope = lines[target].get(""), "portfolio"
+        if line is None:
+            result[target] = None
+            continue
+        value = line["intercept"] + line["slope"] * x
+        margin = RANGE_Z * line["spread"]
+        result[target] = {
+            "estimate": _rounded(value),
+            "low": _rounded(value - margin),
+            "high": _rounded(value + margin),
+            "samples": line["samples"],
+            "scope": scope,
+        }
+    return result
@@ -0,0 +1,171 @@
+"""
+Vectorized expense calculator for the bill-of-quantities block.
+
+The expense of a progress report is the sum of F(row) / C(row) * E(row) over
+the block.  Instead of converting and dividing one Decimal per row, the C, E
+and F columns are loaded into NumPy arrays, unusable cells are masked out and
+the sum is taken in one step.  The float total is then reconciled against the
+exact Decimal computation so the stored, ROUND_HALF_UP-rounded value is
+identical to the row-by-row result.
+"""
+import math
+from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+
+import numpy as np
+
+# Per-row diagnostics codes returned alongside the total
+ROW_OK = 0
+ROW_BLANK = 1  # C, E or F is empty; the row is skipped
+ROW_ZERO_QUANTITY = 2  # C is zero; skipped to avoid division by zero
+ROW_FORMULA = 3  # a cell holds a formula string; it counts as zero
+ROW_INVALID = 4  # a cell is not a number; it counts as zero
+
+ROW_STATUS_LABELS = {
+    ROW_OK: "ok",
+    ROW_BLANK: "blank",
+    ROW_ZERO_QUANTITY: "zero quantity",
+    ROW_FORMULA: "formula",
+    ROW_INVALID: "invalid value",
+}
+
+_NUMERIC_TYPES = (int, float, Decimal)
+_FORMULA_CHARACTERS = ("+", "-", "*", "/")
+_CENTS = Decimal('0.00')
+
+
+def safe_decimal(value):
+    """
+    Helper function to safely convert values to Decimal.
+    Handles None, int, float, and existing Decimal values.
+    """
+    if value is None:
+        return Decimal('0.00')
+    if isinstance(value, (int, float)):
+        return Decimal(str(value))  # Convert through string for precision
+    if isinstance(value, Decimal):
+        return value
+    try:
+        # Check if the value is a string and looks like a formula
+        if isinstance(value, str) and ('+' in value or '-' in value or '*' in value or '/' in value):
+            raise ValueError("Invalid value: Excel formula detected")
+        return Decimal(str(value))
+    except (TypeError, ValueError, InvalidOperation):
+        # Text such as "lot" or "N/A" is common in the block; it counts as zero
+        return Decimal('0.00')
+
+
+def _parse_text(value):
+    """
+    Classify a text cell the same way ``safe_decimal`` treats it.
+    """
+    if not value.strip():
+        return ROW_BLANK, math.nan
+    if any(character in value for character in _FORMULA_CHARACTERS):
+        return ROW_FORMULA, math.nan
+    try:
+        return ROW_OK, float(Decimal(value))
+    except (InvalidOperation, ValueError):
+        return ROW_INVALID, math.nan
+
+
+def _load_column(values):
+    """
+    Convert one column of raw cell values into ``(floats, statuses)`` arrays.
+    """
+    cells = np.empty(len(values), dtype=object)
+    cells[:] = values
+    kinds = np.fromiter(map(type, values), dtype=object, count=len(values))
+
+    numbers = np.full(len(values), math.nan)
+    statuses = np.full(len(values), ROW_INVALID, dtype=np.int8)
+
+    numeric = np.isin(kinds, _NUMERIC_TYPES)
+    numbers[numeric] = cells[numeric].astype(float)
+    statuses[numeric] = ROW_OK
+    statuses[cells == None] = ROW_BLANK  # noqa: E711 - elementwise comparison
+
+    # Text cells are rare in these columns, parse them one by one
+    for index in np.flatnonzero(kinds == str):
+        statuses[index], numbers[index] = _parse_text(cells[index])
+
+    statuses[(statuses == ROW_OK) & ~np.isfinite(numbers)] = ROW_INVALID
+    return numbers, statuses
+
+
+def _combine_statuses(c_status, e_status, f_status, c_numbers):
+    """
+    Reduce the per-column statuses to one status per row.
+    """
+    statuses = np.full(len(c_status), ROW_OK, dtype=np.int8)
+    # Lowest priority first so later assignments win
+    statuses[(c_status == ROW_OK) & (c_numbers == 0)] = ROW_ZERO_QUANTITY
+    for code in (ROW_INVALID, ROW_FORMULA, ROW_BLANK):
+        statuses[(c_status == code) | (e_status == code) | (f_status == code)] = code
+    return statuses
+
+
+def _exact_total(c_values, e_values, f_values, valid):
+    """
+    Row-by-row Decimal sum over the valid rows, the reference computation.
+    """
+    total = Decimal('0.00')
+    for index in np.flatnonzero(valid):
+        total += (safe_decimal(f_values[index]) / safe_decimal(c_values[index])) * safe_decimal(e_values[index])
+    return total.quantize(_CENTS, rounding=ROUND_HALF_UP)
+
+
+def _reconcile(terms):
+    """
+    Sum the float terms and round to cents if that is provably the same as
+    rounding the exact Decimal sum; returns None when it is too close to call.
+    """
+    total = math.fsum(terms)  # correctly rounded, so only per-term error remains
+    if not math.isfinite(total):
+        return None
+    cents = total * 100
+    if abs(cents) >= 2 ** 52:
+        return None
+    # Each term carries a few ulps of error from conversion, division and
+    # multiplication; bound the total error generously, in cents
+    error = 4 * np.finfo(float).eps * (float(np.abs(terms).sum()) + abs(total)) * 100
+    distance_to_half = abs(abs(cents) - math.floor(abs(cents)) - 0.5)
+    if distance_to_half <= error:
+        return None
+    return Decimal(round(cents)).scaleb(-2).quantize(_CENTS)
+
+
+def calculate_expense(c_values, e_values, f_values):
+    """
+    Compute the expense of the bill-of-quantities block.
+
+    Takes the raw C, E and F cell values of each row and returns
+    ``(total_expense, statuses)``.  ``total_expense`` is rounded to two decimal
+    places with ROUND_HALF_UP; ``statuses`` is an int8 array holding one of the
+    ``ROW_*`` codes per row.  Only ``ROW_OK`` rows contribute to the total.
+    """
+    c_numbers, c_status = _load_column(c_values)
+    e_numbers, e_status = _load_column(e_values)
+    f_numbers, f_status = _load_column(f_values)
+
+    statuses = _combine_statuses(c_status, e_status, f_status, c_numbers)
+    valid = statuses == ROW_OK
+
+    terms = f_numbers[valid] / c_numbers[valid] * e_numbers[valid]
+    total = _reconcile(terms)
+    if total is None:
+        total = _exact_total(c_values, e_values, f_values, valid)
+    return total, statuses
+
+
+def describe_row_statuses(rows, statuses, codes=(ROW_FORMULA, ROW_INVALID)):
+    """
+    Summarize the rows with the given status codes, one message per code.
+    """
+    messages = []
+    rows = np.asarray(rows)
+    for code in codes:
+        flagged = rows[statuses == code]
+        if len(flagged):
+            numbers = ", ".join(str(row) for row in flagged)
+            messages.append(f"Skipped {len(flagged)} expense row(s) with {ROW_STATUS_LABELS[code]} cells: rows {numbers}.")
+    return messages
@@ -0,0 +1,143 @@
+"""
+Report exports: the project portfolio and the per-period progress history
+as CSV or .xlsx.
+
+Rows are read with ``.iterator()`` so the queryset is never materialized.
+CSV is encoded and streamed to the client row by row.  An .xlsx file is a zip
+archive that can only be finished once every row is known, so it is written
+with openpyxl's write-only mode (rows go straight to a temporary file, not
+into an in-memory object model) and that file is then streamed in chunks.
+Either way memory stays bounded by a chunk, not by the report size.
+"""
+import csv
+import tempfile
+
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+from .filters import date_param, filter_projects
+from .models import ProgressSnapshot, Project
+
+ITERATOR_CHUNK_SIZE = 2000
+
+# Report name -> (sheet title, [(column header, queryset field)])
+REPORT_COLUMNS = {
+    "projects": ("Projects", [
+        ("Project ID", "proj_id"),
+        ("Name", "name"),
+        ("Location", "location"),
+        ("Status", "status"),
+        ("Start Date", "start_date"),
+        ("End Date", "end_date"),
+        ("Report Date", "report_date"),
+        ("Progress Report", "progress_report_month_year"),
+        ("Accomplished to Date (%)", "accomplished_to_date"),
+        ("Accomplished Before Period (%)", "accomplished_before_period"),
+        ("Accomplished This Period (%)", "accomplished_this_period"),
+        ("Approved Contract (PHP)", "approved_contract"),
+        ("Total Expense (PHP)", "total_expense"),
+    ]),
+    "progress": ("Progress", [
+        ("Project ID", "project__proj_id"),
+        ("Name", "project__name"),
+        ("Report Date", "report_date"),
+        ("Accomplished to Date (%)", "accomplished_to_date"),
+        ("Accomplished Before Period (%)", "accomplished_before_period"),
+        ("Accomplished This Period (%)", "accomplished_this_period"),
+        ("Total Expense (PHP)", "total_expense"),
+    ]),
+}
+EXPORT_FORMATS = ("csv", "xlsx")
+
+
+def report_rows(report, params, projects=None):
+    """
+    ``(headers, rows)`` of a report; ``rows`` is a lazy iterator of tuples.
+
+    The projects report takes the project-list filters; the progress report
+    takes the same filters (applied to the project) plus ``start`` / ``end``
+    bounds on the report date.  ``projects`` narrows the report to a project
+    queryset, e.g. the admin's selection.
+    """
+    _, columns = REPORT_COLUMNS[report]
+    headers = [header for header, _ in columns]
+    fields = [field for _, field in columns]
+
+    narrowed = projects is not None
+    projects, applied = filter_projects(projects if narrowed else Project.objects.all(), params)
+    if report == "projects":
+        queryset = projects.order_by("proj_id")
+    else:
+        queryset = ProgressSnapshot.objects.order_by("project__proj_id", "report_date")
+        if applied or narrowed:
+            queryset = queryset.filter(project__in=projects)
+        for param, lookup in (("start", "report_date__gte"), ("end", "report_date__lte")):
+            value = date_param(params, param)
+            if value is not None:
+                queryset = queryset.filter(**{lookup: value})
+    return headers, queryset.values_list(*fields).iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+
+
+class _Echo:
+    """
+    File-like object whose ``write`` hands the text back, so ``csv.writer``
+    can produce one encoded line at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(headers, rows):
+    """
+    Yield the report as UTF-8 CSV lines (with a BOM so Excel detects UTF-8).
+    """
+    writer = csv.writer(_Echo())
+    yield ("\ufeff" + writer.writerow(headers)).encode()
+    for row in rows:
+        yield writer.writerow(row).encode()
+
+
+def write_xlsx(headers, rows, target, title="Report"):
+    """
+    Write the report to ``target`` (a path or binary file) with a write-only
+    workbook.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title)
+    for index, header in enumerate(headers, start=1):
+        sheet.column_dimensions[get_column_letter(index)].width = max(12, len(header) + 2)
+    sheet.freeze_panes = "A2"
+    sheet.append(headers)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(target)
+
+
+def _filename(report, fmt):
+    return f"{report}-{timezone.localdate().isoformat()}.{fmt}"
+
+
+def export_response(report, fmt, params, projects=None):
+    """
+    A streamed download of ``report`` in ``fmt`` ("csv" or "xlsx"), of the
+    ``projects`` queryset when given.
+    """
+    headers, rows = report_rows(report, params, projects)
+    if fmt == "csv":
+        response = StreamingHttpResponse(iter_csv(headers, rows), content_type="text/csv; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="{_filename(report, fmt)}"'
+        return response
+
+    # Deleted when FileResponse closes it at the end of the response
+    spool = tempfile.TemporaryFile()
+    write_xlsx(headers, rows, spool, title=REPORT_COLUMNS[report][0])
+    spool.seek(0)
+    return FileResponse(
+        spool,
+        as_attachment=True,
+        filename=_filename(report, fmt),
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
@@ -0,0 +1,46 @@
+"""
+Query-string filters shared by the project list page and the JSON API.
+"""
+from django.utils.dateparse import parse_date
+
+# Equality filters: query parameter == Project field
+PROJECT_EXACT_FILTERS = ("status", "location")
+
+# Date range filters: query parameter -> lookup
+PROJECT_DATE_FILTERS = {
+    "start_from": "start_date__gte",
+    "start_to": "start_date__lte",
+    "report_from": "report_date__gte",
+    "report_to": "report_date__lte",
+}
+
+
+def date_param(params, name):
+    """
+    The ``YYYY-MM-DD`` query parameter ``name`` as a date, or None when it is
+    missing or invalid.
+    """
+    try:
+        return parse_date(params.get(name, ""))
+    except ValueError:  # well formed but not a real date, e.g. 2024-02-30
+        return None
+
+
+def filter_projects(queryset, params):
+    """
+    Apply the filters present in ``params`` (a QueryDict or dict).
+
+    Returns ``(queryset, applied)`` where ``applied`` maps each filter that
+    was used to its cleaned value; empty or unparseable values are ignored.
+    """
+    applied = {}
+    for param in PROJECT_EXACT_FILTERS:
+        if params.get(param):
+            applied[param] = params[param]
+            queryset = queryset.filter(**{param: params[param]})
+    for param, lookup in PROJECT_DATE_FILTERS.items():
+        value = date_param(params, param)
+        if value is not None:
+            applied[param] = value.isoformat()
+            queryset = queryset.filter(**{lookup: value})
+    return queryset, applied
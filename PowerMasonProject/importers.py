@@ -0,0 +1,575 @@
+"""
+Import pipeline that turns parsed progress reports into ``Project`` rows.
+
+Single uploads go through ``import_workbook``, either inline or as a
+background ``ImportJob``.  Bulk imports parse workbooks in parallel on a
+process pool (see ``ingest``) and upsert all resulting projects with a single
+``bulk_create`` per batch.
+
+Every workbook is first looked up by the SHA-256 of its bytes (and of the
+workbook layouts in use) in the ``ImportCacheEntry`` table: an identical
+re-upload skips parsing entirely, and only fields that differ from the stored
+``Project`` are ever written.  Written projects get their status recomputed
+(see ``status``) and the report's cost line items stored (see ``costs``).
+
+Uploads are checked against ``settings.IMPORT_LIMITS`` (size, zip structure,
+zip bombs; see ``validation``) before any workbook is opened.
+"""
+import hashlib
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from decimal import Decimal
+from functools import partial
+from io import BytesIO
+
+from django.conf import settings
+from django.db import IntegrityError, connection, models, transaction
+from django.db.backends.utils import format_number
+from django.utils import timezone
+
+from .caching import PROJECTS, bump
+from .costs import projects_missing_cost_items, record_cost_items
+from .ingest import read_project_file, read_project_report
+from .layouts import registry_fingerprint
+from .models import ImportCacheEntry, ImportJob, Project
+from .portfolio import apply_project_changes, summary_values
+from .progress import record_snapshots
+from .status import refresh_statuses
+from .timing import profile, span
+from .validation import WorkbookRejected, check_archive, check_size, merge_limits
+
+# Fields overwritten when an imported proj_id already exists
+PROJECT_UPDATE_FIELDS = [
+    "name",
+    "location",
+    "start_date",
+    "report_date",
+    "progress_report_month_year",
+    "accomplished_to_date",
+    "accomplished_before_period",
+    "accomplished_this_period",
+    "approved_contract",
+    "total_expense",
+    "created_by",
+]
+
+WORKBOOK_EXTENSIONS = (".xlsx", ".xlsm")
+
+# Outcomes of saving one imported project
+CREATED = "created"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+
+# Progress reported by background jobs after each stage
+JOB_PROGRESS_STARTED = 10
+JOB_PROGRESS_PARSED = 60
+JOB_PROGRESS_DONE = 100
+
+# Parser processes are spawned, never forked: a child forked from a threaded
+# server inherits the locks other threads held at that moment (timing's
+# samples lock, logging's) and deadlocks the first time it takes one
+PARSER_CONTEXT = multiprocessing.get_context("spawn")
+
+_job_executor = None
+_parser_pools = {}
+_parser_pools_lock = threading.Lock()
+
+
+def import_limits():
+    """
+    ``validation.DEFAULT_LIMITS`` overridden by ``settings.IMPORT_LIMITS``.
+    """
+    return merge_limits(getattr(settings, "IMPORT_LIMITS", None))
+
+
+def check_upload(upload):
+    """
+    Refuse an oversized upload before its bytes are read; raises
+    ``WorkbookRejected``.
+    """
+    errors = check_size(upload.size, import_limits())
+    if errors:
+        raise WorkbookRejected(errors)
+
+
+def normalize_fields(fields):
+    """
+    Coerce extracted values to what the database stores (decimals quantized
+    to the column's places, text for char columns) so they compare equal to
+    a saved ``Project``.
+    """
+    normalized = {}
+    for name, value in fields.items():
+        field = Project._meta.get_field(name)
+        if value is not None:
+            if isinstance(field, models.DecimalField):
+                value = Decimal(format_number(value, field.max_digits, field.decimal_places))
+            elif isinstance(field, models.CharField):
+                value = str(value)
+        normalized[name] = value
+    return normalized
+
+
+def _changed_fields(project, fields, user):
+    """
+    The imported values (and uploader) that differ from the stored project.
+    """
+    changes = {name: value for name, value in fields.items() if getattr(project, name) != value}
+    if project.created_by_id != (user.pk if user else None):
+        changes["created_by"] = user
+    return changes
+
+
+def _refresh_status(project):
+    project.status = refresh_statuses(Project.objects.filter(pk=project.pk)).get(project.pk, project.status)
+
+
+@span("persist")
+def save_project(fields, user=None, items=None):
+    """
+    Create the ``Project`` with the imported ``proj_id``, or write only the
+    fields that differ from the stored row.  ``items`` are the report's cost
+    line items, stored when the project is written (or has none stored for
+    its report date yet).
+
+    Returns ``(project, outcome)`` where outcome is ``CREATED``, ``UPDATED``
+    or ``UNCHANGED``.
+    """
+    fields = normalize_fields(fields)
+    project = Project.objects.filter(proj_id=fields["proj_id"]).first()
+    if project is None:
+        try:
+            with transaction.atomic():
+                project = Project.objects.create(created_by=user, **fields)
+                apply_project_changes([(None, summary_values(project))])
+                record_snapshots([project])
+                if items is not None:
+                    record_cost_items([(project, items)])
+                _refresh_status(project)
+                return project, CREATED
+        except IntegrityError:
+            # Created concurrently by another import; update it instead
+            project = Project.objects.get(proj_id=fields["proj_id"])
+
+    changes = _changed_fields(project, fields, user)
+    if not changes:
+        if items is not None and projects_missing_cost_items([project]):
+            record_cost_items([(project, items)])
+            bump(PROJECTS)
+        return project, UNCHANGED
+    # update() bypasses auto_now
+    changes["updated_at"] = timezone.now()
+    old_values = summary_values(project)
+    with transaction.atomic():
+        Project.objects.filter(pk=project.pk).update(**changes)
+        for name, value in changes.items():
+            setattr(project, name, value)
+        apply_project_changes([(old_values, summary_values(project))])
+        record_snapshots([project])
+        if items is not None:
+            record_cost_items([(project, items)])
+        _refresh_status(project)
+        # update() sends no post_save
+        bump(PROJECTS)
+    return project, UPDATED
+
+
+def _decode_cache_entry(entry):
+    """
+    Field values of a cache entry, converted back from their JSON form.
+    """
+    return {
+        name: Project._meta.get_field(name).to_python(value)
+        for name, value in entry.fields.items()
+    }
+
+
+def remember_workbooks(parsed):
+    """
+    Store ``{sha256: (fields, warnings, items)}`` in the import cache, then
+    evict.
+    """
+    ImportCacheEntry.objects.bulk_create(
+        [
+            ImportCacheEntry(sha256=digest, proj_id=fields["proj_id"], fields=fields, warnings=warnings, items=items)
+            for digest, (fields, warnings, items) in parsed.items()
+        ],
+        ignore_conflicts=True,
+    )
+    evict_import_cache()
+
+
+def evict_import_cache():
+    """
+    Keep the import cache bounded: drop entries unused for longer than
+    ``IMPORT_CACHE_MAX_AGE_DAYS`` and all but the ``IMPORT_CACHE_MAX_ENTRIES``
+    most recently used.
+    """
+    max_age = timedelta(days=getattr(settings, "IMPORT_CACHE_MAX_AGE_DAYS", 30))
+    max_entries = getattr(settings, "IMPORT_CACHE_MAX_ENTRIES", 1000)
+    ImportCacheEntry.objects.filter(last_used_at__lt=timezone.now() - max_age).delete()
+    overflow = ImportCacheEntry.objects.order_by("-last_used_at").values_list("pk", flat=True)[max_entries:]
+    ImportCacheEntry.objects.filter(pk__in=list(overflow)).delete()
+
+
+def workbook_digest(data):
+    """
+    Import cache key of a workbook: the SHA-256 of its bytes and of the
+    registered layouts, so changing a layout never serves fields read with
+    the old one.
+    """
+    return layout_digest(hashlib.sha256(data))
+
+
+def layout_digest(content_hash):
+    """
+    Import cache key from a SHA-256 of the workbook bytes, such as one
+    computed while the upload streamed in.
+    """
+    digest = content_hash.copy()
+    digest.update(registry_fingerprint().encode())
+    return digest.hexdigest()
+
+
+def lookup_import_cache(digests):
+    """
+    Cached ``{sha256: (fields, warnings, items)}`` for the digests that are
+    known; marks them as used.  The items keep their JSON form.
+    """
+    entries = list(ImportCacheEntry.objects.filter(sha256__in=set(digests)))
+    if entries:
+        ImportCacheEntry.objects.filter(pk__in=[entry.pk for entry in entries]).update(last_used_at=timezone.now())
+    return {entry.sha256: (_decode_cache_entry(entry), entry.warnings, entry.items) for entry in entries}
+
+
+def parse_workbook_bytes(data):
+    """
+    Extract the normalized ``Project`` fields of a workbook, from the import
+    cache when these exact bytes were seen before.  Returns ``(fields,
+    warnings, items)``.
+    """
+    digest = workbook_digest(data)
+    cached = lookup_import_cache([digest])
+    if digest in cached:
+        return cached[digest]
+    fields, warnings, items = read_project_report(BytesIO(data), import_limits())
+    fields = normalize_fields(fields)
+    remember_workbooks({digest: (fields, warnings, items)})
+    return fields, warnings, items
+
+
+def import_workbook(data, user=None):
+    """
+    Import one workbook from its raw bytes.
+
+    Returns ``(project, outcome, warnings)``.  Raises ValueError (or an
+    openpyxl error) when the workbook cannot be read.
+    """
+    fields, warnings, items = parse_workbook_bytes(data)
+    project, outcome = save_project(fields, user, items)
+    return project, outcome, warnings
+
+
+def enqueue_import_job(upload, user=None):
+    """
+    Store the upload as a queued ``ImportJob`` and return it at once.
+
+    When ``IMPORT_JOB_THREADS`` is set the job is handed to an in-process
+    thread pool once the transaction commits; otherwise it waits for
+    ``manage.py process_import_jobs``.
+    """
+    job = ImportJob.objects.create(file=upload, original_name=upload.name, created_by=user)
+    if getattr(settings, "IMPORT_JOB_THREADS", 0):
+        transaction.on_commit(lambda: _get_job_executor().submit(_run_job_in_thread, job.pk))
+    return job
+
+
+def _get_job_executor():
+    global _job_executor
+    if _job_executor is None:
+        _job_executor = ThreadPoolExecutor(
+            max_workers=settings.IMPORT_JOB_THREADS, thread_name_prefix="import-job"
+        )
+    return _job_executor
+
+
+def _run_job_in_thread(job_id):
+    try:
+        with profile("job import"):
+            process_import_job(job_id)
+    finally:
+        connection.close()  # Each pool thread owns its own connection
+
+
+def process_import_job(job_id):
+    """
+    Run a queued import job to completion.
+
+    The job is claimed with a conditional update so concurrent workers never
+    process it twice.  The stored upload is deleted when the job finishes,
+    done or failed.  Returns the finished job, or None if it was not queued.
+    """
+    claimed = ImportJob.objects.filter(pk=job_id, status=ImportJob.QUEUED).update(
+        status=ImportJob.RUNNING, progress=JOB_PROGRESS_STARTED, started_at=timezone.now()
+    )
+    if not claimed:
+        return None
+
+    job = ImportJob.objects.select_related("created_by").get(pk=job_id)
+    try:
+        with job.file.open("rb") as handle:
+            fields, warnings, items = parse_workbook_bytes(handle.read())
+        ImportJob.objects.filter(pk=job_id).update(progress=JOB_PROGRESS_PARSED, warnings=warnings)
+
+        project, _ = save_project(fields, job.created_by, items)
+    except Exception as e:
+        job.status = ImportJob.FAILED
+        job.error = str(e)
+        update_fields = ["status", "error"]
+    else:
+        job.status = ImportJob.DONE
+        job.progress = JOB_PROGRESS_DONE
+        job.warnings = warnings
+        job.project = project
+        update_fields = ["status", "progress", "warnings", "project"]
+    finally:
+        # Imported or not, the stored upload is not needed any more
+        job.file.delete(save=False)
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=[*update_fields, "file", "finished_at"])
+    return job
+
+
+def _is_workbook_name(name):
+    """
+    True for workbook members worth importing; skips folders, macOS resource
+    forks and Office lock files.
+    """
+    base = os.path.basename(name)
+    return (
+        name.lower().endswith(WORKBOOK_EXTENSIONS)
+        and not name.startswith("__MACOSX/")
+        and not base.startswith("~$")
+    )
+
+
+def collect_workbook_files(uploaded_files):
+    """
+    Expand uploaded files into ``(name, bytes)`` pairs.
+
+    ``.zip`` uploads are unpacked and every workbook inside is returned; other
+    uploads are taken as workbooks themselves.  Raises ``WorkbookRejected``
+    for an archive that would expand past the import limits.
+    """
+    files = []
+    for upload in uploaded_files:
+        if upload.name.lower().endswith(".zip"):
+            with zipfile.ZipFile(upload) as archive:
+                errors = check_archive(archive, import_limits())
+                if errors:
+                    raise WorkbookRejected(errors)
+                for member in archive.infolist():
+                    if not member.is_dir() and _is_workbook_name(member.filename):
+                        files.append((f"{upload.name}/{member.filename}", archive.read(member)))
+        else:
+            files.append((upload.name, upload.read()))
+    return files
+
+
+def parser_pool(workers=None):
+    """
+    The process pool parsing workbooks with ``workers`` processes (by default
+    the ``IMPORT_WORKERS`` setting, then the number of CPUs).  Created on
+    first use and kept for the life of the process, so requests do not pay
+    for starting workers.
+    """
+    workers = workers or getattr(settings, "IMPORT_WORKERS", None) or os.cpu_count() or 1
+    with _parser_pools_lock:
+        pool = _parser_pools.get(workers)
+        if pool is None:
+            pool = _parser_pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=PARSER_CONTEXT)
+    return pool
+
+
+def discard_parser_pool(pool):
+    """
+    Forget a pool whose worker died, so the next caller starts a new one.
+    """
+    with _parser_pools_lock:
+        for workers, existing in list(_parser_pools.items()):
+            if existing is pool:
+                del _parser_pools[workers]
+
+
+@span("parse")
+def parse_workbooks(files, workers=None, executor=None):
+    """
+    Parse ``(name, source)`` pairs on a process pool, keeping input order.
+
+    ``workers`` defaults to the ``IMPORT_WORKERS`` setting, then to the number
+    of CPUs.  A single file, or a single worker, is parsed in-process.  Pass an
+    ``executor`` to use another pool than ``parser_pool(workers)``.
+    """
+    if not files:
+        return []
+    names = [name for name, _ in files]
+    sources = [source for _, source in files]
+    read = partial(read_project_file, limits=import_limits())
+    if executor is not None:
+        return list(executor.map(read, names, sources))
+    workers = workers or getattr(settings, "IMPORT_WORKERS", None) or os.cpu_count() or 1
+    if min(workers, len(files)) == 1:
+        return list(map(read, names, sources))
+    pool = parser_pool(workers)
+    chunksize = max(1, len(files) // (workers * 4))
+    try:
+        return list(pool.map(read, names, sources, chunksize=chunksize))
+    except BrokenProcessPool:
+        # A worker died (killed, out of memory); the next import starts a new pool
+        discard_parser_pool(pool)
+        raise
+
+
+def parse_workbooks_cached(files, workers=None, executor=None):
+    """
+    Like ``parse_workbooks`` for ``(name, bytes)`` pairs, but only workbooks
+    missing from the import cache are parsed; the rest come from the cache.
+    Field values in the results are normalized.
+    """
+    digests = [workbook_digest(data) for _, data in files]
+    cached = lookup_import_cache(digests)
+
+    misses = {}
+    for (name, data), digest in zip(files, digests):
+        if digest not in cached and digest not in misses:
+            misses[digest] = (name, data)
+    parsed = dict(zip(misses, parse_workbooks(list(misses.values()), workers, executor)))
+
+    fresh = {}
+    for digest, result in parsed.items():
+        if result["error"] is None:
+            result["fields"] = normalize_fields(result["fields"])
+            fresh[digest] = (result["fields"], result["warnings"], result["items"])
+    if fresh:
+        remember_workbooks(fresh)
+
+    results = []
+    for (name, _), digest in zip(files, digests):
+        if digest in cached:
+            fields, warnings, items = cached[digest]
+            results.append({"file": name, "fields": fields, "warnings": warnings, "items": items,
+                            "error": None, "errors": []})
+        else:
+            results.append(dict(parsed[digest], file=name))
+    return results
+
+
+@span("persist")
+def bulk_save_projects(results, user=None, batch_size=500):
+    """
+    Upsert the projects of successfully parsed results, keyed on ``proj_id``.
+
+    Each result dict gets a ``status`` of ``created``, ``updated``,
+    ``unchanged``, ``failed`` or ``superseded`` (another file in the same
+    batch carried the same proj_id and won, as the later one).  Unchanged
+    projects are not written and only the columns that changed are updated.
+    The cost line items of results that carry ``items`` are stored for the
+    written projects and for unchanged ones that have none yet.  Returns the
+    results.
+    """
+    latest = {}
+    for result in results:
+        if result["error"] is not None:
+            result["status"] = "failed"
+            continue
+        result["fields"] = normalize_fields(result["fields"])
+        proj_id = result["fields"]["proj_id"]
+        if proj_id in latest:
+            latest[proj_id]["status"] = "superseded"
+        latest[proj_id] = result
+
+    if not latest:
+        return results
+
+    with transaction.atomic():
+        existing = Project.objects.in_bulk(list(latest), field_name="proj_id")
+        to_write = []
+        unchanged = []
+        changed_fields = set()
+        summary_changes = []
+        for proj_id, result in latest.items():
+            project = existing.get(proj_id)
+            new_project = Project(created_by=user, **result["fields"])
+            if project is None:
+                result["status"] = CREATED
+                summary_changes.append((None, summary_values(new_project)))
+            else:
+                changes = _changed_fields(project, result["fields"], user)
+                if not changes:
+                    result["status"] = UNCHANGED
+                    unchanged.append(project)
+                    continue
+                result["status"] = UPDATED
+                changed_fields.update(changes)
+                # Columns the workbook does not carry (status, ...) keep their stored value
+                summary_changes.append((summary_values(project), summary_values(dict(summary_values(project), **changes))))
+            to_write.append(new_project)
+
+        if to_write:
+            Project.objects.bulk_create(
+                to_write,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["proj_id"],
+                update_fields=sorted(set(changed_fields or PROJECT_UPDATE_FIELDS) | {"updated_at"}),
+            )
+            # Not every backend returns the ids of upserted rows; look them up
+            for start in range(0, len(to_write), batch_size):
+                batch = to_write[start:start + batch_size]
+                ids = dict(Project.objects.filter(proj_id__in=[p.proj_id for p in batch]).values_list("proj_id", "pk"))
+                for project in batch:
+                    project.pk = ids[project.proj_id]
+            record_snapshots(to_write, batch_size=batch_size)
+            for start in range(0, len(to_write), batch_size):
+                refresh_statuses(Project.objects.filter(pk__in=[p.pk for p in to_write[start:start + batch_size]]))
+        reports = [
+            (project, latest[project.proj_id]["items"])
+            for project in to_write + projects_missing_cost_items(unchanged)
+            if latest[project.proj_id].get("items") is not None
+        ]
+        if reports:
+            record_cost_items(reports)
+        if to_write or reports:
+            # bulk_create sends no post_save
+            bump(PROJECTS)
+        apply_project_changes(summary_changes)
+    return results
+
+
+def summarize_results(results):
+    """
+    Per-file summary suitable for a JSON response.
+    """
+    return {
+        "files": [
+            {
+                "file": result["file"],
+                "status": result["status"],
+                "proj_id": result["fields"]["proj_id"] if result["fields"] else None,
+                "warnings": result["warnings"],
+                "error": result["error"],
+                "errors": result["errors"],
+            }
+            for result in results
+        ],
+        "created": sum(result["status"] == CREATED for result in results),
+        "updated": sum(result["status"] == UPDATED for result in results),
+        "unchanged": sum(result["status"] == UNCHANGED for result in results),
+        "failed": sum(result["status"] == "failed" for result in results),
+    }
@@ -0,0 +1,326 @@
+"""
+Workbook ingestion engine for progress-report uploads.
+
+The workbook is opened in read-only mode and the header cells, the expense
+block (rows 10 to 113 in the standard template) and the contract total (E117)
+are collected in a single streamed pass with ``iter_rows`` instead of random
+``sheet["F10"]`` lookups on a fully loaded object model.  Where those cells
+are is up to the workbook's layout (see ``layouts``).
+
+The rows of the expense block are also kept as cost line items
+(``build_cost_items``): every priced row with its item number, description,
+quantities and expense, under the last heading row above it as category.
+
+Before that, the .xlsx container is checked (size, zip structure, zip bombs)
+and the header cells are validated before anything is computed; see
+``validation``.  Problems are raised as ``WorkbookRejected``.
+
+This module deliberately has no Django imports so it can run inside worker
+processes and management commands without a configured project.
+"""
+import os
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from datetime import datetime, date
+from io import BytesIO
+from itertools import chain, islice
+
+from openpyxl import load_workbook
+
+from .dates import DateParser
+from .expenses import ROW_OK, calculate_expense, describe_row_statuses, safe_decimal
+from .layouts import EXPENSE_COLUMN_NAMES, PROGRESS_REPORT_V1, detect_layout, get_plan, read_bounds
+from .timing import span
+from .validation import REQUIRED_FIELDS, WorkbookRejected, check_container, check_header, problem
+
+
+# Field -> cell of the standard template, kept for code that predates layouts
+HEADER_CELLS = PROGRESS_REPORT_V1["cells"]
+EXPENSE_FIRST_ROW, EXPENSE_LAST_ROW = PROGRESS_REPORT_V1["expense_rows"]
+EXPENSE_COLUMNS = tuple(PROGRESS_REPORT_V1["expense_columns"][name] for name in EXPENSE_COLUMN_NAMES)
+
+# Header fields holding dates; each workbook's are read by one DateParser
+DATE_FIELDS = ("start_date", "report_date")
+_WORKBOOK = "workbook"  # The source of those dates in their parser
+
+
+def read_sheet_values(source, layout=None):
+    """
+    Stream the active sheet once and collect the cells the import needs.
+
+    The layout is detected from the sheet's labels unless ``layout`` names
+    one.  Returns a ``(header, expense_rows)`` tuple: ``header`` maps the
+    layout's field names to raw cell values and ``expense_rows`` is a list of
+    ``(row, c, e, f)`` tuples for the expense block.
+    """
+    _, header, expense_rows = read_sheet(source, layout)
+    return header, expense_rows
+
+
+def read_sheet(source, layout=None):
+    """
+    Like ``read_sheet_values``, with the ``ExtractionPlan`` used first.
+    """
+    with span("load"):
+        workbook = load_workbook(source, read_only=True)
+    try:
+        sheet = workbook.active
+        with span("extract"):
+            max_row, max_column, label_rows = read_bounds()
+            rows = sheet.iter_rows(min_row=1, max_row=max_row, max_col=max_column, values_only=True)
+            if layout is not None:
+                plan = get_plan(layout)
+            else:
+                top_rows = list(islice(rows, label_rows))
+                plan = detect_layout(top_rows)
+                rows = chain(top_rows, rows)
+            return (plan, *plan.extract(rows))
+    finally:
+        workbook.close()
+
+
+def _expense_statuses(expense_rows):
+    rows, c_values, e_values, f_values = list(zip(*expense_rows))[:4] if expense_rows else ((), (), (), ())
+    total_expense, statuses = calculate_expense(c_values, e_values, f_values)
+    return rows, total_expense, statuses
+
+
+def compute_total_expense(expense_rows):
+    """
+    Sum F(row) / C(row) * E(row) over the expense block.
+
+    Returns ``(total_expense, warnings)`` with the total rounded to two decimal
+    places and one warning per kind of unusable row.
+    """
+    rows, total_expense, statuses = _expense_statuses(expense_rows)
+    return total_expense, describe_row_statuses(rows, statuses)
+
+
+_CENTS = Decimal("0.01")
+
+
+def _number(value):
+    """
+    A numeric cell value as Decimal; None for blanks, text and formulas.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float, Decimal)):
+        return Decimal(str(value))
+    if isinstance(value, str) and value.strip() and not any(character in value for character in "+-*/"):
+        try:
+            return Decimal(value.strip())
+        except InvalidOperation:
+            return None
+    return None
+
+
+def _text(value):
+    return "" if value is None else str(value).strip()
+
+
+def build_cost_items(expense_rows, statuses):
+    """
+    The line items of the expense block, as dicts.
+
+    A row with a quantity or an amount is an item; a row with only text is a
+    heading and names the ``category`` of the items below it.  An item's
+    ``expense`` is F / C * E rounded to cents for the rows that count toward
+    the total (``statuses`` from ``calculate_expense``), else 0.
+    """
+    items = []
+    category = ""
+    for (row, quantity, amount, accomplished, item, description), status in zip(expense_rows, statuses):
+        quantity_value, amount_value = _number(quantity), _number(amount)
+        item, description = _text(item), _text(description)
+        if quantity_value is None and amount_value is None:
+            if item or description:
+                category = " - ".join(part for part in (item, description) if part)
+            continue
+        expense = Decimal("0.00")
+        if status == ROW_OK:
+            expense = (safe_decimal(accomplished) / safe_decimal(quantity) * safe_decimal(amount)).quantize(
+                _CENTS, rounding=ROUND_HALF_UP
+            )
+        items.append({
+            "row": row,
+            "item": item,
+            "description": description,
+            "category": category,
+            "quantity": quantity_value,
+            "amount": amount_value,
+            "accomplished": _number(accomplished),
+            "expense": expense,
+        })
+    return items
+
+
+def _date_parser(header):
+    """
+    A ``DateParser`` for the workbook's date cells, with the workbook as the
+    source.  It has already seen every text date of the header, so an
+    unambiguous one ("25/06/2023") decides the day/month order of an
+    ambiguous one ("05/06/2023") whichever cell comes first.
+    """
+    parser = DateParser()
+    for field in DATE_FIELDS:
+        if isinstance(header[field], str):
+            try:
+                parser.parse(header[field].strip(), _WORKBOOK)
+            except ValueError:
+                pass
+    return parser
+
+
+def _coerce_date(raw, label, parser):
+    """
+    Turn a date cell value into a ``date``; raises ValueError when it cannot.
+    """
+    if isinstance(raw, str):
+        try:
+            return parser.parse(raw.strip(), _WORKBOOK)
+        except ValueError as e:
+            raise ValueError(f"Invalid {label} date format: {e}")
+    if isinstance(raw, datetime):
+        return raw.date()
+    if isinstance(raw, date):
+        return raw
+    raise ValueError(f"Unexpected type for {label} date.")
+
+
+def build_project_fields(header, total_expense):
+    """
+    Validate the raw header values and derive the ``Project`` field values.
+
+    Returns ``(fields, warnings)``.  Raises ValueError for problems that make the
+    workbook unusable (missing required fields, bad start date).
+    """
+    warnings = []
+
+    # Validate required fields (including raw start date)
+    if any(header[field] is None for field in REQUIRED_FIELDS):
+        raise ValueError("One or more required fields are missing.")
+
+    dates = _date_parser(header)
+    start_date = _coerce_date(header["start_date"], "start", dates)
+
+    # An unreadable report date is not fatal, the project is saved without it
+    report_date = None
+    if header["report_date"]:
+        try:
+            report_date = _coerce_date(header["report_date"], "report", dates)
+        except ValueError as e:
+            warnings.append(str(e))
+
+    approved_contract = safe_decimal(header["approved_contract"])
+    accomplished_before_period = safe_decimal(header["accomplished_before_period"])
+
+    # Calculate accomplished this period
+    accomplished_this_period = total_expense / approved_contract * 100 if approved_contract else Decimal('0.00')
+    accomplished_to_date = accomplished_this_period + accomplished_before_period
+
+    fields = {
+        "proj_id": header["proj_id"],
+        "name": header["name"],
+        "location": header["location"],
+        "start_date": start_date,
+        "report_date": report_date,
+        "progress_report_month_year": header["progress_report_month_year"],
+        "accomplished_to_date": accomplished_to_date,
+        "accomplished_before_period": accomplished_before_period,
+        "accomplished_this_period": accomplished_this_period,
+        "approved_contract": approved_contract,
+        "total_expense": total_expense,
+    }
+    return fields, warnings
+
+
+def _source_size(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    position = source.tell()
+    size = source.seek(0, os.SEEK_END)
+    source.seek(position)
+    return size
+
+
+def _read_checked(source, limits):
+    """
+    Container check, streamed read, header check and computation.  Returns
+    ``(plan, fields, warnings, items)`` with the warnings as problem dicts;
+    raises ``WorkbookRejected``.
+    """
+    errors = check_container(source, _source_size(source), limits)
+    if errors:
+        raise WorkbookRejected(errors)
+    try:
+        plan, header, expense_rows = read_sheet(source)
+    except Exception as e:  # Corrupt parts inside a valid zip
+        raise WorkbookRejected([problem("unreadable", f"The workbook cannot be read: {e}")])
+    errors, warnings = check_header(header, plan.layout["cells"])
+    if errors:
+        raise WorkbookRejected(errors)
+    with span("compute"):
+        rows, total_expense, statuses = _expense_statuses(expense_rows)
+        fields, field_warnings = build_project_fields(header, total_expense)
+        items = build_cost_items(expense_rows, statuses)
+    warnings += [problem("expense_rows", message) for message in describe_row_statuses(rows, statuses)]
+    warnings += [problem("field", message) for message in field_warnings]
+    return plan, fields, warnings, items
+
+
+def read_project_workbook(source, limits=None):
+    """
+    Extract the ``Project`` field values from a progress-report workbook.
+
+    ``source`` is a path or a binary file-like object; ``limits`` override
+    ``validation.DEFAULT_LIMITS``.  Returns ``(fields, warnings)``;
+    ``warnings`` lists non-fatal problems found while reading.  Raises
+    ``WorkbookRejected`` (a ValueError) when the workbook cannot be imported.
+    """
+    fields, warnings, _ = read_project_report(source, limits)
+    return fields, warnings
+
+
+def read_project_report(source, limits=None):
+    """
+    Like ``read_project_workbook``, returning the cost line items too:
+    ``(fields, warnings, items)``.
+    """
+    _, fields, warnings, items = _read_checked(source, limits)
+    return fields, [warning["message"] for warning in warnings], items
+
+
+def validate_workbook(source, limits=None):
+    """
+    Check a workbook without importing it and return a report: ``valid``,
+    the detected ``layout`` and ``proj_id``, and ``errors`` and ``warnings``
+    as problem dicts (``code``, ``message`` and ``cell`` when one is at
+    fault).  Oversized and malformed files are rejected from the zip
+    directory alone, before the sheet is opened.
+    """
+    try:
+        plan, fields, warnings, _ = _read_checked(source, limits)
+    except WorkbookRejected as e:
+        return {"valid": False, "layout": None, "proj_id": None, "errors": e.errors, "warnings": []}
+    return {"valid": True, "layout": plan.name, "proj_id": fields["proj_id"], "errors": [], "warnings": warnings}
+
+
+def read_project_file(name, source, limits=None):
+    """
+    Process-pool entry point: parse one workbook and never raise.
+
+    ``source`` is a path or the raw bytes of the file.  Returns a dict with the
+    ``file`` name, the extracted ``fields`` (None on failure), ``warnings``,
+    the cost line ``items``, ``error`` and ``errors`` (the problem dicts
+    behind ``error``).
+    """
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    try:
+        fields, warnings, items = read_project_report(source, limits)
+    except WorkbookRejected as e:
+        return {"file": name, "fields": None, "warnings": [], "items": [], "error": str(e), "errors": e.errors}
+    except Exception as e:
+        return {"file": name, "fields": None, "warnings": [], "items": [], "error": str(e),
+                "errors": [problem("unreadable", str(e))]}
+    return {"file": name, "fields": fields, "warnings": warnings, "items": items, "error": None, "errors": []}
@@ -0,0 +1,105 @@
+"""
+Request instrumentation: wall time, SQL query count and time, and the
+import-pipeline spans of every request (see ``timing``).
+
+``InstrumentationMiddleware`` records each request under its method and URL
+route, adds a ``Server-Timing`` header (visible in the browser's network
+panel) and logs requests slower than ``settings.SLOW_REQUEST_MS`` to the
+``powermason.performance`` logger.  It runs natively in both sync (WSGI)
+and async (ASGI) middleware chains.  Background import jobs are profiled with
+``timing.profile``.  The percentiles are shown to staff at
+``reports/performance/``.
+
+Queries are counted by an execute wrapper installed on every database
+connection as it is opened.  The wrapper charges the profile active in the
+calling context, so queries run in ``sync_to_async`` threads of an async view
+are still attributed to the request.
+"""
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .timing import current_profile, profile
+
+logger = logging.getLogger("powermason.performance")
+
+
+def _count_query(execute, sql, params, many, context):
+    active = current_profile()
+    if active is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        active.queries += 1
+        active.sql_seconds += time.perf_counter() - started
+
+
+@receiver(connection_created, dispatch_uid="powermason_count_queries")
+def _install_query_counter(sender, connection, **kwargs):
+    # The wrapper list outlives reconnects of the same connection object
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+def _route(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return f"/{match.route}" if match.route else match.view_name
+
+
+def server_timing(active):
+    """
+    ``Server-Timing`` header value of a profile; durations in milliseconds.
+    """
+    elapsed = time.perf_counter() - active.started
+    metrics = [f"app;dur={elapsed * 1000:.1f}", f'db;dur={active.sql_seconds * 1000:.1f};desc="{active.queries} queries"']
+    metrics += [f"{name};dur={seconds * 1000:.1f}" for name, seconds in active.spans.items()]
+    return ", ".join(metrics)
+
+
+class InstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with profile("request") as active:
+            response = self.get_response(request)
+            self._finish(request, response, active)
+        self._log_if_slow(request, active)
+        return response
+
+    async def __acall__(self, request):
+        with profile("request") as active:
+            response = await self.get_response(request)
+            self._finish(request, response, active)
+        self._log_if_slow(request, active)
+        return response
+
+    def _finish(self, request, response, active):
+        active.name = f"{request.method} {_route(request)}"
+        response["Server-Timing"] = server_timing(active)
+
+    def _log_if_slow(self, request, active):
+        milliseconds = active.seconds * 1000
+        if milliseconds >= settings.SLOW_REQUEST_MS:
+            logger.warning(
+                "Slow request %s %s: %.0f ms, %d queries (%.0f ms SQL)%s",
+                request.method, request.get_full_path(), milliseconds, active.queries,
+                active.sql_seconds * 1000,
+                "".join(f", {name} {seconds * 1000:.0f} ms" for name, seconds in active.spans.items()),
+            )
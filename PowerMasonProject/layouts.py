@@ -0,0 +1,243 @@
+"""
+Workbook layouts: where the fields of a progress report live.
+
+A layout is declared as a dict:
+
+    {
+        "name": "progress-report-v1",
+        "cells": {"proj_id": "B1", ...},           # one cell per header field
+        "expense_rows": (10, 113),                  # bill-of-quantities block
+        "expense_columns": {"quantity": "C", "amount": "E", "accomplished": "F"},
+        "item_columns": {"item": "A", "description": "B"},   # optional
+        "labels": {"A1": "Project ID", ...},       # text identifying the template
+    }
+
+``register_layout`` compiles it once into an ``ExtractionPlan``: header cells
+grouped by row and sorted by column, the expense block as a row range and
+column indexes (the item number and description columns too, when the layout
+names them, for the cost line items), and the bounding box of every cell
+read.  A workbook is then read in a single streamed pass whatever the number
+of layouts: the few rows holding labels are buffered, the layout is
+detected from them, and the plan extracts from the buffered and remaining
+rows.
+
+Detection tries the layouts with ``labels`` in registration order and picks
+the first whose label cells all contain the expected text (ignoring case).
+Workbooks matching none are read with ``DEFAULT_LAYOUT``.
+
+Like ``ingest``, this module has no Django imports.
+"""
+import hashlib
+import json
+
+from openpyxl.utils.cell import coordinate_from_string, column_index_from_string
+
+# Header fields every layout must place
+LAYOUT_FIELDS = (
+    "proj_id",
+    "name",
+    "location",
+    "start_date",
+    "report_date",
+    "accomplished_to_date",
+    "accomplished_before_period",
+    "progress_report_month_year",
+    "approved_contract",
+)
+EXPENSE_COLUMN_NAMES = ("quantity", "amount", "accomplished")
+ITEM_COLUMN_NAMES = ("item", "description")
+
+# The standard progress-report template
+PROGRESS_REPORT_V1 = {
+    "name": "progress-report-v1",
+    "cells": {
+        "proj_id": "B1",
+        "name": "B2",
+        "location": "B3",
+        "start_date": "B4",
+        "report_date": "H1",
+        "accomplished_to_date": "H2",
+        "accomplished_before_period": "H3",
+        "progress_report_month_year": "A6",
+        "approved_contract": "E117",
+    },
+    # Bill-of-quantities block used for the expense computation: F(row) / C(row) * E(row)
+    "expense_rows": (10, 113),
+    "expense_columns": {"quantity": "C", "amount": "E", "accomplished": "F"},
+    # Item number and description of each bill-of-quantities line
+    "item_columns": {"item": "A", "description": "B"},
+    "labels": {},
+}
+DEFAULT_LAYOUT = PROGRESS_REPORT_V1["name"]
+
+
+def cell_position(address):
+    """
+    Convert an address such as "E117" into a (row, column index) tuple.
+    """
+    column, row = coordinate_from_string(address)
+    return row, column_index_from_string(column)
+
+
+class ExtractionPlan:
+    """
+    A layout compiled for one streamed pass over the sheet.
+    """
+
+    def __init__(self, layout):
+        missing = [field for field in LAYOUT_FIELDS if field not in layout["cells"]]
+        if missing:
+            raise ValueError(f"Layout '{layout['name']}' does not place {', '.join(missing)}.")
+        self.name = layout["name"]
+        self.layout = layout
+
+        positions = {field: cell_position(address) for field, address in layout["cells"].items()}
+        header_rows = {}
+        for field, (row, column) in sorted(positions.items(), key=lambda item: item[1]):
+            header_rows.setdefault(row, []).append((column - 1, field))
+        self.header_rows = {row: tuple(cells) for row, cells in header_rows.items()}
+        self.fields = tuple(layout["cells"])
+
+        self.expense_first, self.expense_last = layout["expense_rows"]
+        columns = layout["expense_columns"]
+        self.expense_indexes = tuple(column_index_from_string(columns[name]) - 1 for name in EXPENSE_COLUMN_NAMES)
+        item_columns = layout.get("item_columns", {})
+        self.item_indexes = tuple(
+            column_index_from_string(item_columns[name]) - 1 if name in item_columns else None
+            for name in ITEM_COLUMN_NAMES
+        )
+
+        self.labels = tuple(sorted(
+            (*cell_position(address), str(text).strip().casefold())
+            for address, text in layout.get("labels", {}).items()
+        ))
+        label_cells = [(row, column) for row, column, _ in self.labels]
+        self.label_rows = max((row for row, _ in label_cells), default=0)
+        self.max_row = max([row for row, _ in positions.values()] + [self.expense_last, self.label_rows])
+        self.max_column = max(
+            [column for _, column in list(positions.values()) + label_cells]
+            + [index + 1 for index in self.expense_indexes + self.item_indexes if index is not None]
+        )
+
+    def matches(self, top_rows):
+        """
+        Whether every label cell of the layout holds its text; ``top_rows``
+        are the sheet's first rows as value tuples.
+        """
+        if not self.labels:
+            return False
+        for row, column, text in self.labels:
+            values = top_rows[row - 1] if row <= len(top_rows) else ()
+            value = values[column - 1] if column <= len(values) else None
+            if value is None or text not in str(value).casefold():
+                return False
+        return True
+
+    def extract(self, rows):
+        """
+        Collect ``(header, expense_rows)`` from value tuples starting at row 1:
+        ``header`` maps the layout's fields to raw cell values and
+        ``expense_rows`` holds ``(row, quantity, amount, accomplished, item,
+        description)``, the last two None when the layout has no such column.
+        """
+        header = dict.fromkeys(self.fields)
+        expense_rows = []
+        header_rows = self.header_rows
+        first, last = self.expense_first, self.expense_last
+        quantity, amount, accomplished = self.expense_indexes
+        item, description = self.item_indexes
+
+        for row_number, values in enumerate(rows, start=1):
+            if row_number > self.max_row:
+                break
+            for column, field in header_rows.get(row_number, ()):
+                header[field] = values[column]
+            if first <= row_number <= last:
+                expense_rows.append((
+                    row_number, values[quantity], values[amount], values[accomplished],
+                    None if item is None else values[item],
+                    None if description is None else values[description],
+                ))
+
+        # Trailing empty rows are not yielded by the read-only reader
+        for row_number in range(first + len(expense_rows), last + 1):
+            expense_rows.append((row_number, None, None, None, None, None))
+        return header, expense_rows
+
+
+_plans = {}
+_bounds = None
+_fingerprint = None
+
+
+def register_layout(layout):
+    """
+    Compile ``layout`` and add it to the registry (replacing one of the same
+    name).  Returns its plan.
+    """
+    global _bounds, _fingerprint
+    plan = ExtractionPlan(layout)
+    _plans[plan.name] = plan
+    _bounds = _fingerprint = None
+    return plan
+
+
+def unregister_layout(name):
+    global _bounds, _fingerprint
+    if name == DEFAULT_LAYOUT:
+        raise ValueError("The default layout cannot be removed.")
+    _plans.pop(name, None)
+    _bounds = _fingerprint = None
+
+
+def get_plan(name):
+    try:
+        return _plans[name]
+    except KeyError:
+        raise ValueError(f"Unknown workbook layout '{name}'.")
+
+
+def registered_layouts():
+    return list(_plans)
+
+
+def read_bounds():
+    """
+    ``(max_row, max_column, label_rows)`` covering every registered layout:
+    the sheet area a streamed pass reads and how many top rows detection needs.
+    """
+    global _bounds
+    if _bounds is None:
+        plans = _plans.values()
+        _bounds = (
+            max(plan.max_row for plan in plans),
+            max(plan.max_column for plan in plans),
+            max(plan.label_rows for plan in plans),
+        )
+    return _bounds
+
+
+def detect_layout(top_rows):
+    """
+    The plan of the first layout whose labels match ``top_rows``, else the
+    default layout's.
+    """
+    for plan in _plans.values():
+        if plan.matches(top_rows):
+            return plan
+    return _plans[DEFAULT_LAYOUT]
+
+
+def registry_fingerprint():
+    """
+    Short hash of every registered layout; changes whenever a layout does, so
+    results parsed under other layouts can be told apart.
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        data = json.dumps([plan.layout for plan in _plans.values()], sort_keys=True, default=str)
+        _fingerprint = hashlib.sha256(data.encode()).hexdigest()[:16]
+    return _fingerprint
+
+
+register_layout(PROGRESS_REPORT_V1)
@@ -0,0 +1,59 @@
+from importlib import import_module
+
+from django.core.management.base import BaseCommand, CommandError
+
+from PowerMasonProject.benchmarks import baseline_results, current_commit, load_history, record_run
+
+
+class Command(BaseCommand):
+    help = "Run a benchmark from PowerMasonProject.benchmarks and print its results."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", help="Benchmark module name, e.g. 'ingest', or 'suite' for the import-path suite.")
+        parser.add_argument("--size", type=int, default=20000, help="Problem size passed to the benchmark.")
+        parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (best time is kept).")
+        parser.add_argument(
+            "--json", metavar="PATH",
+            help="Append the run to this JSON Lines history and compare with the last run at another commit.",
+        )
+
+    def handle(self, *args, **options):
+        module_name = f"PowerMasonProject.benchmarks.{options['name']}"
+        try:
+            module = import_module(module_name)
+        except ModuleNotFoundError as e:
+            if e.name != module_name:
+                raise
+            raise CommandError(f"Unknown benchmark '{options['name']}'.")
+
+        baseline = {}
+        if options["json"]:
+            commit, _ = current_commit()
+            baseline = baseline_results(load_history(options["json"]), options["name"], options["size"], commit)
+
+        results = module.run(options["size"], options["repeat"])
+        for result in results:
+            line = f"{result['name']:<28} size={result['size']:<8} {result['seconds'] * 1000:10.1f} ms"
+            if "bytes" in result:
+                line += f" {result['bytes']:>10} bytes"
+            if "peak_bytes" in result:
+                line += f" {result['peak_bytes'] / 1024 / 1024:10.1f} MiB peak"
+            if "per_second" in result:
+                line += f" {result['per_second']:12.0f} /s"
+            if "p95_ms" in result:
+                line += f" {result['p95_ms']:8.1f} ms p95"
+            if "queries" in result:
+                line += f" {result['queries']:>4} queries {result['sql_ms']:8.1f} ms SQL"
+            if "locked" in result:
+                line += f" {result['locked']:>5} locked"
+            if result.get("peak_rss_bytes"):
+                line += f" {result['peak_rss_bytes'] / 1024 / 1024:8.1f} MiB RSS"
+            if result["name"] in baseline:
+                seconds, commit = baseline[result["name"]]
+                change = (result["seconds"] - seconds) / seconds * 100
+                line += f" {change:+7.1f}% vs {commit}"
+            self.stdout.write(line)
+
+        if options["json"]:
+            run = record_run(options["json"], options["name"], options["size"], options["repeat"], results)
+            self.stdout.write(f"Recorded in {options['json']} at commit {run['commit']}{' (dirty)' if run['dirty'] else ''}.")
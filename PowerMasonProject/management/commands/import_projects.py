@@ -1,95 +1,102 @@
-from openpyxl import load_workbook
-from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
-
-# File path to your Excel file
-excel_file = r"C:\Users\meejhay\Downloads\example_project_data.xlsx"
-
-# Load the workbook and select the active sheet
-workbook = load_workbook(excel_file)
-sheet = workbook.active 
-
-# Initialize a variable to store the sum
-total_expense = Decimal('0.00')
-
-# Define the number of decimal places to round to
-decimal_places = 2
-
-# Function to safely convert a value to Decimal
-def safe_decimal(value):
-    try:
-        return Decimal(str(value))
-    except (InvalidOperation, ValueError):
-        return Decimal('0.00')  # Default to 0.00 if conversion fails
-
-# Loop through the rows from 10 to 113 (assuming you want this for each row)
-for row in range(10, 114):  # Rows 10 to 113
-    try:
-        # Get values for the formula F(row) / C(row) * E(row)
-        f_value = sheet[f"F{row}"].value
-        c_value = sheet[f"C{row}"].value
-        e_value = sheet[f"E{row}"].value
-        
-        if f_value is not None and c_value is not None and e_value is not None:
-            # Safely convert the values to Decimal
-            f_value = safe_decimal(f_value)
-            c_value = safe_decimal(c_value)
-            e_value = safe_decimal(e_value)
-            
-            if c_value != Decimal('0.00'):  # Avoid division by zero
-                result = (f_value / c_value) * e_value
-                # Round off the result to the specified decimal places
-                total_expense += result
-            else:
-                print(f"Warning: Division by zero for row {row}, skipping this row.")
-        else:
-            print(f"Warning: Missing values in row {row}, skipping this row.")
-    except Exception as e:
-        print(f"Error in row {row}: {e}")
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
 
-# Optionally, print the total expense rounded to 2 decimal places
-total_expense = total_expense.quantize(Decimal('1.' + '0' * decimal_places), rounding=ROUND_HALF_UP)
+from PowerMasonProject.importers import (
+    PARSER_CONTEXT, WORKBOOK_EXTENSIONS, bulk_save_projects, parse_workbooks, parse_workbooks_cached,
+)
 
-# Retrieve and print values from the specified cells
 try:
-    proj_id = sheet["B1"].value  # Replace with actual cell reference for PROJ ID
-    name = sheet["B2"].value  # Project name
-    location = sheet["B3"].value  # Project location
-    start_date = sheet["B4"].value  # Start date
-    report_date = sheet["H1"].value  # Latest report date
-    accomplished_to_date = sheet["H2"].value  # Accomplished to date
-    accomplished_before_period = sheet["H3"].value  # Accomplished before period
-    approved_contract = sheet["E117"].value  # Approved contract (budget)
-    
-    # Safely convert values to Decimal
-    accomplished_before_period = safe_decimal(accomplished_before_period)
-    accomplished_to_date = safe_decimal(accomplished_to_date)
-    approved_contract = safe_decimal(approved_contract)
-
-    print("Extracted Values:")
-    print(f"PROJ ID: {proj_id}")
-    print(f"Project: {name}")
-    print(f"Location: {location}")
-    print(f"Start Date: {start_date}")
-    print(f"Report Date: {report_date}")
-    print(f"Accomplished Before Period: {accomplished_before_period}")
-    
-    # Avoid division by zero if total_expense is 0
-    if total_expense != Decimal('0.00') and approved_contract != Decimal('0.00'):
-        # Calculate the percentage of Accomplished To This Period relative to approved contract
-        accomplished_to_this_period_percentage = (total_expense / approved_contract) * Decimal('100')
-        print(f"Accomplished To This Period (as a percentage of approved contract): {accomplished_to_this_period_percentage.quantize(Decimal('1.' + '0' * decimal_places), rounding=ROUND_HALF_UP):.2f}%")
-    else:
-        print("Cannot calculate percentage for Accomplished To This Period (either total expense or approved contract is zero).")
-    
-    # Calculate the total percentage of accomplished (Before and To Date)
-    total_accomplished_percentage = (accomplished_before_period + accomplished_to_this_period_percentage) 
-
-    # Round off the total accomplished percentage to the desired decimal places
-    total_accomplished_percentage = total_accomplished_percentage.quantize(Decimal('1.' + '0' * decimal_places), rounding=ROUND_HALF_UP)
-
-    print(f"Total Accomplished (Before + To Date) as a percentage of the approved contract: {total_accomplished_percentage:.2f}%")
-    print(f"Approved Contract: {approved_contract}")
-    print(f"Total Expense: {total_expense}")
-
-except Exception as e:
-    print(f"Error retrieving data: {e}")
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def _peak_rss_bytes():
+    """
+    Peak resident set size of this process plus its largest worker process, or
+    None where the platform cannot tell.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def iter_workbook_paths(targets):
+    """
+    Yield workbook paths from directories (searched recursively) and globs.
+    """
+    for target in targets:
+        if os.path.isdir(target):
+            matches = (str(path) for path in sorted(Path(target).rglob("*")) if path.is_file())
+        else:
+            matches = sorted(glob.glob(target, recursive=True))
+        for path in matches:
+            if path.lower().endswith(WORKBOOK_EXTENSIONS) and not os.path.basename(path).startswith("~$"):
+                yield path
+
+
+class Command(BaseCommand):
+    help = (
+        "Import progress-report workbooks from directories or glob patterns, parsing them "
+        "on a process pool and upserting projects in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("targets", nargs="+", help="Directories or glob patterns, e.g. 'reports/**/*.xlsx'.")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parser processes (default: CPU count).")
+        parser.add_argument("--chunk-size", type=int, default=200, help="Workbooks parsed and upserted per batch.")
+        parser.add_argument("--dry-run", action="store_true", help="Parse and report, but write nothing to the database.")
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1 or options["chunk_size"] < 1:
+            raise CommandError("--workers and --chunk-size must be at least 1.")
+
+        paths = iter_workbook_paths(options["targets"])
+        totals = {"files": 0, "created": 0, "updated": 0, "unchanged": 0, "failed": 0, "parsed": 0}
+        started = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=options["workers"], mp_context=PARSER_CONTEXT) as pool:
+            while True:
+                chunk = list(islice(paths, options["chunk_size"]))
+                if not chunk:
+                    break
+                files = [(path, Path(path).read_bytes()) for path in chunk]
+
+                if options["dry_run"]:
+                    results = parse_workbooks(files, executor=pool)
+                    for result in results:
+                        result["status"] = "failed" if result["error"] else "parsed"
+                else:
+                    results = bulk_save_projects(
+                        parse_workbooks_cached(files, executor=pool), batch_size=options["chunk_size"]
+                    )
+
+                for result in results:
+                    totals["files"] += 1
+                    totals[result["status"]] = totals.get(result["status"], 0) + 1
+                    if result["error"]:
+                        self.stderr.write(f"{result['file']}: {result['error']}")
+                counts = ", ".join(f"{status} {count}" for status, count in totals.items() if status != "files" and count)
+                self.stdout.write(f"{totals['files']} files so far: {counts}")
+
+        self._write_stats(totals, time.perf_counter() - started, options["dry_run"])
+
+    def _write_stats(self, totals, elapsed, dry_run):
+        rows = totals["parsed"] if dry_run else totals["created"] + totals["updated"]
+        elapsed = max(elapsed, 1e-9)
+        peak = _peak_rss_bytes()
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Parsed' if dry_run else 'Imported'} {totals['files']} files in {elapsed:.2f}s: "
+            f"{totals['files'] / elapsed:.1f} files/s, {rows / elapsed:.1f} rows/s, "
+            f"peak RSS {f'{peak / 1024 / 1024:.1f} MiB' if peak is not None else 'n/a'}"
+            + (" (dry run, nothing written)" if dry_run else "")
+        ))
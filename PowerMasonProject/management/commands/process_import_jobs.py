@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from PowerMasonProject.importers import process_import_job
+from PowerMasonProject.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = "Process queued Excel import jobs (run once, or keep polling with --loop)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new jobs instead of exiting.")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds between polls with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            job_ids = list(
+                ImportJob.objects.filter(status=ImportJob.QUEUED).order_by("created_at").values_list("pk", flat=True)
+            )
+            for job_id in job_ids:
+                job = process_import_job(job_id)
+                if job is not None:
+                    self.stdout.write(f"{job.original_name}: {job.status}" + (f" ({job.error})" if job.error else ""))
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
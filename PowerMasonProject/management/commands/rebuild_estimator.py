@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from PowerMasonProject.estimation import rebuild_estimator
+
+
+class Command(BaseCommand):
+    help = "Recompute the estimator's regression sums from the project table."
+
+    def handle(self, *args, **options):
+        rows = rebuild_estimator()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} estimator statistics rows."))
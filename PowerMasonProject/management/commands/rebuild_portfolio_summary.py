@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from PowerMasonProject.portfolio import rebuild_portfolio_summary
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard's portfolio summary rows from the project table."
+
+    def handle(self, *args, **options):
+        rows = rebuild_portfolio_summary()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} portfolio summary rows."))
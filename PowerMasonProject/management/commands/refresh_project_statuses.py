@@ -0,0 +1,29 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from PowerMasonProject.status import refresh_statuses
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every project's status (Completed, Budget Overrun, Delayed, On Track) and store "
+        "the ones that changed.  Run it nightly: Delayed depends on how close the end date is."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Classify as of this date (YYYY-MM-DD) instead of today.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per UPDATE (default 1000).")
+
+    def handle(self, *args, **options):
+        today = None
+        if options["date"]:
+            try:
+                today = date.fromisoformat(options["date"])
+            except ValueError:
+                raise CommandError(f"Invalid --date: {options['date']}")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        changed = refresh_statuses(today=today, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Updated the status of {len(changed)} projects."))
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:55
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('PowerMasonProject', '0007_importjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('proj_id', models.CharField(db_index=True, max_length=50)),
+                ('fields', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('warnings', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
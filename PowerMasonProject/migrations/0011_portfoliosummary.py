@@ -0,0 +1,53 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:11
+
+from collections import defaultdict
+from decimal import Decimal
+from django.db import migrations, models
+
+
+def populate_summary(apps, schema_editor):
+    """
+    Seed the summary from the projects that already exist.
+    """
+    Project = apps.get_model('PowerMasonProject', 'Project')
+    PortfolioSummary = apps.get_model('PowerMasonProject', 'PortfolioSummary')
+    sums = ('approved_contract', 'total_expense', 'accomplished_to_date')
+    totals = defaultdict(lambda: [0, Decimal('0.00'), Decimal('0.00'), Decimal('0.00')])
+    projects = Project.objects.values_list('status', 'location', 'progress_report_month_year', *sums)
+    for status, location, month, *values in projects.iterator():
+        for key in (('total', ''), ('status', status or ''), ('location', location or ''), ('month', month or '')):
+            row = totals[key]
+            row[0] += 1
+            for index, value in enumerate(values, start=1):
+                row[index] += value or 0
+    PortfolioSummary.objects.bulk_create([
+        PortfolioSummary(dimension=dimension, key=key, project_count=count, **dict(zip(sums, values)))
+        for (dimension, key), (count, *values) in totals.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('PowerMasonProject', '0010_project_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('total', 'Total'), ('status', 'Status'), ('location', 'Location'), ('month', 'Progress report month')], max_length=20)),
+                ('key', models.CharField(blank=True, max_length=255)),
+                ('project_count', models.IntegerField(default=0)),
+                ('approved_contract', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+                ('total_expense', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+                ('accomplished_to_date', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'key'), name='portfolio_summary_dimension_key')],
+            },
+        ),
+        migrations.RunPython(populate_summary, migrations.RunPython.noop),
+    ]
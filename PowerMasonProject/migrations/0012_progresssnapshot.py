@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:12
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+def seed_snapshots(apps, schema_editor):
+    """
+    Keep the one period each existing project already knows about.
+    """
+    Project = apps.get_model('PowerMasonProject', 'Project')
+    ProgressSnapshot = apps.get_model('PowerMasonProject', 'ProgressSnapshot')
+    fields = ('accomplished_to_date', 'accomplished_before_period', 'accomplished_this_period', 'total_expense')
+    rows = Project.objects.filter(report_date__isnull=False).values_list('pk', 'report_date', *fields)
+    ProgressSnapshot.objects.bulk_create(
+        (
+            ProgressSnapshot(project_id=pk, report_date=report_date, **dict(zip(fields, values)))
+            for pk, report_date, *values in rows.iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('PowerMasonProject', '0011_portfoliosummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report_date', models.DateField()),
+                ('accomplished_to_date', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('accomplished_before_period', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('accomplished_this_period', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('total_expense', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=15)),
+                ('project', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='progress_snapshots', to='PowerMasonProject.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['report_date'], name='progress_snapshot_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('project', 'report_date'), name='progress_snapshot_project_date')],
+            },
+        ),
+        migrations.RunPython(seed_snapshots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('PowerMasonProject', '0012_progresssnapshot'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='status',
+            field=models.CharField(choices=[('onTrack', 'onTrack'), ('Delayed', 'Delayed'), ('Completed', 'Completed'), ('BudgetOverrun', 'Budget Overrun')], default='onTrack', max_length=20),
+        ),
+    ]
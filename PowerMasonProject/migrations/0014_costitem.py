@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:48
+
+import django.core.serializers.json
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('PowerMasonProject', '0013_project_budget_overrun_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importcacheentry',
+            name='items',
+            field=models.JSONField(blank=True, default=list, encoder=django.core.serializers.json.DjangoJSONEncoder),
+        ),
+        migrations.CreateModel(
+            name='CostItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report_date', models.DateField()),
+                ('row', models.PositiveSmallIntegerField()),
+                ('item_no', models.CharField(blank=True, max_length=50)),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('category', models.CharField(blank=True, max_length=255)),
+                ('quantity', models.DecimalField(blank=True, decimal_places=4, max_digits=18, null=True)),
+                ('amount', models.DecimalField(blank=True, decimal_places=2, max_digits=18, null=True)),
+                ('accomplished', models.DecimalField(blank=True, decimal_places=4, max_digits=18, null=True)),
+                ('expense', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=18)),
+                ('project', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='cost_items', to='PowerMasonProject.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['report_date'], name='cost_item_date_idx'), models.Index(fields=['category', 'report_date'], name='cost_item_category_idx')],
+                'constraints': [models.UniqueConstraint(fields=('project', 'report_date', 'row'), name='cost_item_project_date_row')],
+            },
+        ),
+    ]
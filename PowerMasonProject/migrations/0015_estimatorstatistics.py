@@ -0,0 +1,65 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:55
+
+from collections import defaultdict
+from django.db import migrations, models
+
+
+def populate_statistics(apps, schema_editor):
+    """
+    Seed the estimator's sums from the projects that already exist (the
+    rules of estimation._samples, frozen here).
+    """
+    Project = apps.get_model('PowerMasonProject', 'Project')
+    EstimatorStatistics = apps.get_model('PowerMasonProject', 'EstimatorStatistics')
+    columns = ('sample_count', 'sum_x', 'sum_y', 'sum_xx', 'sum_xy', 'sum_yy')
+    totals = defaultdict(lambda: [0, 0.0, 0.0, 0.0, 0.0, 0.0])
+    projects = Project.objects.values_list(
+        'location', 'approved_contract', 'total_expense', 'accomplished_to_date', 'start_date', 'end_date',
+    )
+    for location, contract, expense, progress, start, end in projects.iterator():
+        if contract is None:
+            continue
+        x = float(contract) / 1_000_000
+        samples = []
+        if progress is not None and expense is not None and progress >= 10:
+            samples.append(('cost', float(expense) * 100 / float(progress)))
+        if start is not None and end is not None and end >= start:
+            samples.append(('duration', float((end - start).days)))
+        for target, y in samples:
+            for key in (('', location) if location else ('',)):
+                row = totals[target, key]
+                for index, value in enumerate((1, x, y, x * x, x * y, y * y)):
+                    row[index] += value
+    EstimatorStatistics.objects.bulk_create([
+        EstimatorStatistics(target=target, location=location, **dict(zip(columns, values)))
+        for (target, location), values in totals.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('PowerMasonProject', '0014_costitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstimatorStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target', models.CharField(choices=[('cost', 'Cost at completion'), ('duration', 'Duration (days)')], max_length=20)),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('sample_count', models.IntegerField(default=0)),
+                ('sum_x', models.FloatField(default=0)),
+                ('sum_y', models.FloatField(default=0)),
+                ('sum_xx', models.FloatField(default=0)),
+                ('sum_xy', models.FloatField(default=0)),
+                ('sum_yy', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('target', 'location'), name='estimator_statistics_target_location')],
+            },
+        ),
+        migrations.RunPython(populate_statistics, migrations.RunPython.noop),
+    ]
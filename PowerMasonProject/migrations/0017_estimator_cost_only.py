@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:12
+
+from django.db import migrations, models
+
+
+def delete_duration_statistics(apps, schema_editor):
+    EstimatorStatistics = apps.get_model('PowerMasonProject', 'EstimatorStatistics')
+    EstimatorStatistics.objects.filter(target='duration').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('PowerMasonProject', '0016_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duration_statistics, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='estimatorstatistics',
+            name='target',
+            field=models.CharField(choices=[('cost', 'Cost at completion')], max_length=20),
+        ),
+    ]
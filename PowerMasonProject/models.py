@@ -1,7 +1,10 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.core.validators import MinValueValidator, MaxValueValidator
 from decimal import Decimal
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 
 # Project Model
 class Project(models.Model):
@@ -9,6 +12,7 @@ class Project(models.Model):
         ('onTrack', 'onTrack'),
         ('Delayed', 'Delayed'),
         ('Completed', 'Completed'),
+        ('BudgetOverrun', 'Budget Overrun'),
     ]
 
     # Fields
@@ -41,8 +45,189 @@ class Project(models.Model):
     )
 
     # Metadata
+    # Computed from progress, budget and end date by PowerMasonProject/status.py
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='onTrack')
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='created_projects')
-    
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # Last write; drives page ETags
+
+    class Meta:
+        # Keyset pagination of the project list: sort column + id, alone or
+        # behind an equality filter on status or location
+        indexes = [
+            models.Index(fields=['start_date', 'id'], name='project_start_idx'),
+            models.Index(fields=['report_date', 'id'], name='project_report_idx'),
+            models.Index(fields=['status', 'start_date', 'id'], name='project_status_start_idx'),
+            models.Index(fields=['status', 'report_date', 'id'], name='project_status_report_idx'),
+            models.Index(fields=['location', 'start_date', 'id'], name='project_location_start_idx'),
+            models.Index(fields=['location', 'report_date', 'id'], name='project_location_report_idx'),
+            # Admin changelist: month filter and case-insensitive prefix search
+            models.Index(fields=['progress_report_month_year', 'start_date', 'id'], name='project_month_start_idx'),
+            models.Index(Lower('proj_id'), name='project_proj_id_lower_idx'),
+            models.Index(Lower('name'), name='project_name_lower_idx'),
+            models.Index(Lower('location'), name='project_location_lower_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.proj_id} - {self.name}"
+
+# One row per project and report period, written at import time so the
+# progress history survives re-imports of later periods
+class ProgressSnapshot(models.Model):
+    # The (project, report_date) unique constraint doubles as the project index
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='progress_snapshots', db_index=False)
+    report_date = models.DateField()
+    accomplished_to_date = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    accomplished_before_period = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    accomplished_this_period = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    total_expense = models.DecimalField(max_digits=15, decimal_places=2, default=Decimal('0.00'))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'report_date'], name='progress_snapshot_project_date'),
+        ]
+        indexes = [
+            models.Index(fields=['report_date'], name='progress_snapshot_date_idx'),  # Portfolio rollups
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} @ {self.report_date}"
+
+# One line of a progress report's bill of quantities (rows 10 to 113 of the
+# standard template), per project and report period like ProgressSnapshot
+class CostItem(models.Model):
+    # The (project, report_date, row) unique constraint doubles as the project index
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='cost_items', db_index=False)
+    report_date = models.DateField()
+    row = models.PositiveSmallIntegerField()  # Sheet row the item was read from
+    item_no = models.CharField(max_length=50, blank=True)
+    description = models.CharField(max_length=255, blank=True)
+    category = models.CharField(max_length=255, blank=True)  # Last heading row above the item
+    quantity = models.DecimalField(max_digits=18, decimal_places=4, blank=True, null=True)  # C: contract quantity
+    amount = models.DecimalField(max_digits=18, decimal_places=2, blank=True, null=True)  # E: contract amount
+    accomplished = models.DecimalField(max_digits=18, decimal_places=4, blank=True, null=True)  # F: quantity to date
+    expense = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal('0.00'))  # F / C * E
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'report_date', 'row'], name='cost_item_project_date_row'),
+        ]
+        indexes = [
+            models.Index(fields=['report_date'], name='cost_item_date_idx'),  # Per-period rollups
+            models.Index(fields=['category', 'report_date'], name='cost_item_category_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} @ {self.report_date} row {self.row}"
+
+# Background Excel import job
+class ImportJob(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    # Fields
+    file = models.FileField(upload_to='imports/%Y/%m/')  # Stored upload, removed once the job finishes
+    original_name = models.CharField(max_length=255)  # File name as uploaded
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED, db_index=True)
+    progress = models.PositiveSmallIntegerField(default=0)  # Percent complete
+    warnings = models.JSONField(default=list, blank=True)  # Row-level warnings from the workbook
+    error = models.TextField(blank=True)  # Why the import failed
+    project = models.ForeignKey(Project, on_delete=models.SET_NULL, null=True, blank=True, related_name='import_jobs')
+
+    # Metadata
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='import_jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.original_name} ({self.status})"
+
+
+# Workbooks already imported, keyed by the SHA-256 of the uploaded bytes
+class ImportCacheEntry(models.Model):
+    sha256 = models.CharField(max_length=64, unique=True)  # Hex digest of the file bytes and layouts
+    proj_id = models.CharField(max_length=50, db_index=True)  # Project the workbook imports into
+    fields = models.JSONField(encoder=DjangoJSONEncoder)  # Extracted Project field values
+    warnings = models.JSONField(default=list, blank=True)  # Warnings raised while parsing
+    items = models.JSONField(encoder=DjangoJSONEncoder, default=list, blank=True)  # Cost line items
+
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)  # For age/count eviction
+
+    def __str__(self):
+        return f"{self.proj_id} ({self.sha256[:12]})"
+
+
+# Precomputed dashboard aggregates, one row per (dimension, key); kept current
+# incrementally by portfolio.apply_project_changes
+class PortfolioSummary(models.Model):
+    TOTAL = 'total'
+    STATUS = 'status'
+    LOCATION = 'location'
+    MONTH = 'month'
+    DIMENSION_CHOICES = [
+        (TOTAL, 'Total'),
+        (STATUS, 'Status'),
+        (LOCATION, 'Location'),
+        (MONTH, 'Progress report month'),
+    ]
+
+    # Fields
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    key = models.CharField(max_length=255, blank=True)  # Status, location or report month; '' for the total row
+    project_count = models.IntegerField(default=0)
+    approved_contract = models.DecimalField(max_digits=20, decimal_places=2, default=Decimal('0.00'))  # Sum
+    total_expense = models.DecimalField(max_digits=20, decimal_places=2, default=Decimal('0.00'))  # Sum
+    accomplished_to_date = models.DecimalField(max_digits=20, decimal_places=2, default=Decimal('0.00'))  # Sum; average = sum / count
+
+    # Metadata
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'key'], name='portfolio_summary_dimension_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}:{self.key} ({self.project_count})"
+
+
+# Sums the estimator's least-squares lines are solved from, one row per
+# (target, location); kept current incrementally by
+# portfolio.apply_project_changes (see estimation)
+class EstimatorStatistics(models.Model):
+    COST = 'cost'
+    TARGET_CHOICES = [
+        (COST, 'Cost at completion'),
+    ]
+
+    # Fields
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    location = models.CharField(max_length=255, blank=True)  # '' for the whole portfolio
+    sample_count = models.IntegerField(default=0)
+    # x is the approved contract in millions, y the target
+    sum_x = models.FloatField(default=0)
+    sum_y = models.FloatField(default=0)
+    sum_xx = models.FloatField(default=0)
+    sum_xy = models.FloatField(default=0)
+    sum_yy = models.FloatField(default=0)
+
+    # Metadata
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['target', 'location'], name='estimator_statistics_target_location'),
+        ]
+
     def __str__(self):
-        return f"{self.proj_id} - {self.name}"
\ No newline at end of file
+        return f"{self.target}:{self.location} ({self.sample_count})"
@@ -0,0 +1,96 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are addressed by the sort value and primary key of the row at their
+edge rather than by an OFFSET, so fetching page 500 costs the same index seek
+as page 1.  Rows are ordered by ``(field, pk)``; NULLs of a nullable field sit
+where the database sorts them natively so the ordering can use a plain
+``(field, id)`` index.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(value, pk):
+    """
+    Opaque, URL-safe cursor for the position of one row.
+    """
+    payload = json.dumps([value.isoformat() if hasattr(value, "isoformat") else value, pk])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, field):
+    """
+    ``(value, pk)`` of a cursor made by ``encode_cursor``, or None if it is
+    malformed.
+    """
+    try:
+        value, pk = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return (None if value is None else field.to_python(value)), int(pk)
+    except (ValueError, TypeError, ValidationError):
+        return None
+
+
+def _beyond(field, value, pk, op):
+    """
+    Rows strictly past ``(value, pk)`` when walking the ``(field, pk)``
+    ordering in the direction of ``op`` ("gt" or "lt").
+    """
+    name = field.name
+    # Where the database puts NULLs relative to the walk direction
+    nulls_beyond = (op == "gt") == connection.features.nulls_order_largest
+    if value is None:
+        condition = Q(**{f"{name}__isnull": True, f"pk__{op}": pk})
+        if not nulls_beyond:
+            condition |= Q(**{f"{name}__isnull": False})
+        return condition
+    condition = Q(**{f"{name}__{op}": value}) | Q(**{name: value, f"pk__{op}": pk})
+    if field.null and nulls_beyond:
+        condition |= Q(**{f"{name}__isnull": True})
+    return condition
+
+
+def keyset_page(queryset, field_name, descending=False, after=None, before=None, per_page=DEFAULT_PAGE_SIZE):
+    """
+    One page of ``queryset`` ordered by ``field_name`` then primary key.
+
+    ``after`` / ``before`` are cursors from a previous page.  Returns a dict
+    with the page ``items`` and the ``next_cursor`` / ``previous_cursor`` to
+    link to, either None at the ends of the list.
+    """
+    field = queryset.model._meta.get_field(field_name)
+    per_page = max(1, min(per_page, MAX_PAGE_SIZE))
+    position = decode_cursor(before or after, field) if (before or after) else None
+    backwards = bool(before) and position is not None
+
+    # Walking backwards reverses the ordering and the page afterwards
+    ascending = descending == backwards
+    op = "gt" if ascending else "lt"
+    prefix = "" if ascending else "-"
+    queryset = queryset.order_by(f"{prefix}{field_name}", f"{prefix}pk")
+    if position is not None:
+        queryset = queryset.filter(_beyond(field, position[0], position[1], op))
+
+    rows = list(queryset[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    def cursor_of(row):
+        return encode_cursor(getattr(row, field.attname), row.pk)
+
+    if backwards:
+        previous_cursor = cursor_of(rows[0]) if has_more and rows else None
+        next_cursor = cursor_of(rows[-1]) if rows else None
+    else:
+        previous_cursor = cursor_of(rows[0]) if position is not None and rows else None
+        next_cursor = cursor_of(rows[-1]) if has_more else None
+    return {"items": rows, "next_cursor": next_cursor, "previous_cursor": previous_cursor}
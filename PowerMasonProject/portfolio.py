@@ -0,0 +1,192 @@
+"""
+Materialized portfolio aggregates for the dashboard.
+
+``PortfolioSummary`` holds one row per (dimension, key): the whole portfolio,
+each status, each location and each progress-report month, with the project
+count and the sums of approved contract, total expense and accomplishment.
+Writers report what they changed through ``apply_project_changes`` and the
+affected rows are adjusted in place with ``F()`` expressions, so the
+dashboard reads a handful of rows no matter how many projects there are.
+The same changes keep the estimator's statistics current (see
+``estimation``).
+
+``rebuild_portfolio_summary`` (``manage.py rebuild_portfolio_summary``)
+recomputes everything from the project table.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Sum
+from django.utils import timezone
+
+from .caching import PROJECTS, bump
+from .estimation import apply_estimate_changes
+from .models import PortfolioSummary, Project
+
+# Project fields the aggregates (and the estimator) depend on
+SUMMARY_FIELDS = (
+    "status", "location", "progress_report_month_year",
+    "approved_contract", "total_expense", "accomplished_to_date",
+)
+SUM_FIELDS = ("approved_contract", "total_expense", "accomplished_to_date")
+
+# Summary dimension -> Project field grouping it (None: the single total row)
+DIMENSION_FIELDS = {
+    PortfolioSummary.TOTAL: None,
+    PortfolioSummary.STATUS: "status",
+    PortfolioSummary.LOCATION: "location",
+    PortfolioSummary.MONTH: "progress_report_month_year",
+}
+
+
+def summary_values(project):
+    """
+    The aggregated fields of a ``Project`` (or a dict of field values).
+    """
+    if isinstance(project, dict):
+        return {name: project.get(name) for name in SUMMARY_FIELDS}
+    return {name: getattr(project, name) for name in SUMMARY_FIELDS}
+
+
+def _keys(values):
+    for dimension, field in DIMENSION_FIELDS.items():
+        yield dimension, "" if field is None else (values[field] or "")
+
+
+def apply_project_changes(changes):
+    """
+    Fold project changes into the summary rows.
+
+    ``changes`` is an iterable of ``(old, new)`` pairs of ``summary_values``
+    dicts; ``old`` is None for a created project, ``new`` None for a deleted
+    one.  Deltas are netted per summary row first, so a batch import touches
+    each status, location and month row once.  The estimator's statistics
+    are updated from the same changes.
+    """
+    changes = list(changes)
+    deltas = defaultdict(lambda: [0] + [Decimal("0.00")] * len(SUM_FIELDS))
+    for old, new in changes:
+        for values, sign in ((old, -1), (new, 1)):
+            if values is None:
+                continue
+            for key in _keys(values):
+                delta = deltas[key]
+                delta[0] += sign
+                for index, name in enumerate(SUM_FIELDS, start=1):
+                    delta[index] += sign * (values[name] or 0)
+    deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+
+    now = timezone.now()
+    with transaction.atomic():
+        if deltas:
+            PortfolioSummary.objects.bulk_create(
+                [PortfolioSummary(dimension=dimension, key=key) for dimension, key in deltas],
+                ignore_conflicts=True,
+            )
+        for (dimension, key), (count, *sums) in deltas.items():
+            PortfolioSummary.objects.filter(dimension=dimension, key=key).update(
+                project_count=F("project_count") + count,
+                updated_at=now,  # update() bypasses auto_now
+                **{name: F(name) + value for name, value in zip(SUM_FIELDS, sums)},
+            )
+        apply_estimate_changes(changes)
+
+
+def rebuild_portfolio_summary():
+    """
+    Recompute every summary row from the project table.  Returns the number
+    of rows written.
+    """
+    aggregates = {"project_count": Count("id"), **{name: Sum(name) for name in SUM_FIELDS}}
+    rows = []
+    for dimension, field in DIMENSION_FIELDS.items():
+        if field is None:
+            groups = [Project.objects.aggregate(**aggregates)]
+        else:
+            groups = Project.objects.order_by().values(field).annotate(**aggregates)
+        for group in groups:
+            if not group["project_count"]:
+                continue
+            rows.append(PortfolioSummary(
+                dimension=dimension,
+                key="" if field is None else (group[field] or ""),
+                project_count=group["project_count"],
+                **{name: group[name] or Decimal("0.00") for name in SUM_FIELDS},
+            ))
+
+    # NULL and "" locations / months share a row
+    merged = {}
+    for row in rows:
+        existing = merged.setdefault((row.dimension, row.key), row)
+        if existing is not row:
+            existing.project_count += row.project_count
+            for name in SUM_FIELDS:
+                setattr(existing, name, getattr(existing, name) + getattr(row, name))
+
+    with transaction.atomic():
+        PortfolioSummary.objects.all().delete()
+        PortfolioSummary.objects.bulk_create(merged.values())
+        bump(PROJECTS)
+    return len(merged)
+
+
+def portfolio_state():
+    """
+    Fingerprint of the summary table for the dashboard's ETag.
+    """
+    return PortfolioSummary.objects.aggregate(updated_at=Max("updated_at"), count=Count("id"))
+
+
+def summary_count(dimension=PortfolioSummary.TOTAL, key=""):
+    """
+    Number of projects in one summary row: the whole portfolio by default,
+    or one status, location or month (``""`` for the unspecified ones).
+    """
+    row = PortfolioSummary.objects.filter(dimension=dimension, key=key).values_list("project_count", flat=True)
+    return max(row.first() or 0, 0)
+
+
+def summary_keys(dimension):
+    """
+    The keys of ``dimension`` that have projects, sorted.
+    """
+    return list(
+        PortfolioSummary.objects.filter(dimension=dimension, project_count__gt=0)
+        .order_by("key").values_list("key", flat=True)
+    )
+
+
+def _average(row):
+    return row.accomplished_to_date / row.project_count if row.project_count else Decimal("0.00")
+
+
+def dashboard_summary():
+    """
+    Portfolio figures for the dashboard, read from the summary rows.
+    """
+    rows = [row for row in PortfolioSummary.objects.all() if row.project_count > 0]
+    total = next((row for row in rows if row.dimension == PortfolioSummary.TOTAL), None)
+    if total is None:
+        total = PortfolioSummary(dimension=PortfolioSummary.TOTAL)
+
+    status_counts = {value: 0 for value, _ in Project.STATUS_CHOICES}
+    status_counts.update({row.key: row.project_count for row in rows if row.dimension == PortfolioSummary.STATUS})
+
+    def breakdown(dimension):
+        return [
+            {"key": row.key or "Unspecified", "project_count": row.project_count, "average_accomplished": _average(row)}
+            for row in sorted(rows, key=lambda row: row.key) if row.dimension == dimension
+        ]
+
+    return {
+        "project_count": total.project_count,
+        "approved_contract": total.approved_contract,
+        "total_expense": total.total_expense,
+        # Share of the approved contract already spent, in percent
+        "burn_rate": total.total_expense / total.approved_contract * 100 if total.approved_contract else None,
+        "average_accomplished": _average(total),
+        "status_counts": status_counts,
+        "by_location": breakdown(PortfolioSummary.LOCATION),
+        "by_month": breakdown(PortfolioSummary.MONTH),
+    }
@@ -0,0 +1,91 @@
+"""
+Per-period progress history.
+
+Every import writes a ``ProgressSnapshot`` for the project's report date, so
+the history of a project is kept even though ``Project`` itself only holds
+the latest period.  A new report period appends a row; re-importing the same
+period replaces that period's row.
+
+The read side answers range queries for one project from the
+``(project, report_date)`` unique index and portfolio rollups by month from
+the ``report_date`` index, so both stay cheap with years of history.
+"""
+from django.db.models import Avg, Count, Max, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import ProgressSnapshot
+
+SNAPSHOT_FIELDS = (
+    "accomplished_to_date",
+    "accomplished_before_period",
+    "accomplished_this_period",
+    "total_expense",
+)
+
+
+def record_snapshots(projects, batch_size=500):
+    """
+    Upsert the current period of each saved ``Project`` (those without a
+    report date are skipped).
+    """
+    snapshots = [
+        ProgressSnapshot(
+            project_id=project.pk,
+            report_date=project.report_date,
+            **{name: getattr(project, name) for name in SNAPSHOT_FIELDS},
+        )
+        for project in projects
+        if project.report_date is not None
+    ]
+    if snapshots:
+        ProgressSnapshot.objects.bulk_create(
+            snapshots,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["project", "report_date"],
+            update_fields=list(SNAPSHOT_FIELDS),
+        )
+
+
+def _in_range(queryset, start=None, end=None):
+    if start is not None:
+        queryset = queryset.filter(report_date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(report_date__lte=end)
+    return queryset
+
+
+def project_history(project, start=None, end=None):
+    """
+    The snapshots of one project between ``start`` and ``end`` (inclusive,
+    either may be None), oldest first, as dicts: the points of its S-curve.
+    """
+    queryset = _in_range(ProgressSnapshot.objects.filter(project=project), start, end)
+    return list(queryset.order_by("report_date").values("report_date", *SNAPSHOT_FIELDS))
+
+
+def monthly_portfolio_progress(start=None, end=None, projects=None):
+    """
+    Portfolio progress per calendar month between ``start`` and ``end``.
+
+    Each row has the ``month`` (first day), the number of projects that
+    reported, their average accomplishment to date, the accomplishment added
+    in the month and the total expense of those reports.
+    ``projects`` optionally narrows the rollup to a queryset of projects.
+    """
+    queryset = _in_range(ProgressSnapshot.objects.all(), start, end)
+    if projects is not None:
+        queryset = queryset.filter(project__in=projects)
+    return list(
+        queryset.annotate(month=TruncMonth("report_date"))
+        .values("month")
+        .annotate(
+            projects=Count("project", distinct=True),
+            reports=Count("id"),
+            average_accomplished=Avg("accomplished_to_date"),
+            accomplished_this_period=Sum("accomplished_this_period"),
+            total_expense=Sum("total_expense"),
+            last_report_date=Max("report_date"),
+        )
+        .order_by("month")
+    )
@@ -0,0 +1,125 @@
+// Project import buttons of the projects page, which loads this file itself
+// (re-run by the tab loader after each AJAX swap, hence the function scope)
+(() => {
+  // Show the file input when the "New Project" button is clicked
+  document
+    .getElementById("newProjectBtn")
+    .addEventListener("click", function () {
+      document.getElementById("fileInput").click();
+    });
+
+  // Prompt the user for confirmation before submitting the form
+  document.getElementById("fileInput").addEventListener("change", function () {
+    if (this.files.length > 0) {
+      const userConfirmed = confirm(
+        "Are you sure you want to upload this project file?"
+      );
+      if (userConfirmed) {
+        // Ensure CSRF token is added to the headers if using AJAX (example)
+        const csrfToken = document.querySelector(
+          "[name=csrfmiddlewaretoken]"
+        ).value;
+
+        const formData = new FormData(document.getElementById("importForm"));
+
+        // Create an AJAX request to submit the form; the server queues the
+        // import and answers with a job to poll
+        fetch(document.getElementById("importForm").action, {
+          method: "POST",
+          headers: {
+            "X-CSRFToken": csrfToken, // Include CSRF token manually in AJAX headers
+            "X-Requested-With": "XMLHttpRequest",
+          },
+          body: formData,
+        })
+          .then((response) => response.json().then((data) => ({ ok: response.ok, data })))
+          .then(({ ok, data }) => {
+            // A refused upload (too large, not a workbook) gets no job
+            if (!ok || data.error) {
+              showUploadErrors(data);
+              return;
+            }
+            pollImportJob(data.status_url);
+          })
+          .catch((error) => {
+            console.error("Error uploading file:", error);
+            document.getElementById("importStatus").textContent = "The upload failed.";
+          });
+      } else {
+        // Clear the file input if the user cancels
+        this.value = "";
+      }
+    }
+  });
+
+  // List the problems the server found with an upload
+  function showUploadErrors(data) {
+    const messages = (data.errors || []).map((error) => error.message);
+    document.getElementById("importStatus").textContent =
+      `The file was not imported: ${messages.length ? messages.join(" ") : data.error}`;
+  }
+
+  // Poll a background import job until it finishes
+  function pollImportJob(statusUrl) {
+    const status = document.getElementById("importStatus");
+    fetch(statusUrl)
+      .then((response) => response.json())
+      .then((job) => {
+        status.textContent = `Importing ${job.file}: ${job.progress}%`;
+        if (job.status === "queued" || job.status === "running") {
+          setTimeout(() => pollImportJob(statusUrl), 1000);
+          return;
+        }
+        if (job.status === "failed") {
+          status.textContent = `Import of ${job.file} failed: ${job.error}`;
+          return;
+        }
+        if (job.warnings.length) {
+          alert(job.warnings.join("\n"));
+        }
+        window.location.reload();
+      })
+      .catch((error) => {
+        console.error("Error checking import status:", error);
+      });
+  }
+
+  // Bulk import: many workbooks or a zip archive of them in one request
+  document
+    .getElementById("bulkImportBtn")
+    .addEventListener("click", function () {
+      document.getElementById("bulkFileInput").click();
+    });
+
+  document.getElementById("bulkFileInput").addEventListener("change", function () {
+    if (this.files.length === 0) return;
+
+    const csrfToken = document.querySelector("[name=csrfmiddlewaretoken]").value;
+    const formData = new FormData(document.getElementById("bulkImportForm"));
+
+    fetch(document.getElementById("bulkImportForm").action, {
+      method: "POST",
+      headers: { "X-CSRFToken": csrfToken },
+      body: formData,
+    })
+      .then((response) => response.json())
+      .then((data) => {
+        if (data.error) {
+          alert(data.error);
+          return;
+        }
+        const failures = data.files
+          .filter((file) => file.status === "failed")
+          .map((file) => `${file.file}: ${file.error}`);
+        alert(
+          `Created ${data.created}, updated ${data.updated}, unchanged ${data.unchanged}, failed ${data.failed}.` +
+            (failures.length ? "\n\n" + failures.join("\n") : "")
+        );
+        window.location.reload();
+      })
+      .catch((error) => {
+        console.error("Error uploading files:", error);
+      });
+    this.value = "";
+  });
+})();
@@ -3,7 +3,7 @@ document.addEventListener("DOMContentLoaded", () => {
   const contentContainer = document.getElementById("content");
   const header = document.querySelector("header");
 
-  function activateTab(tab, redirectUrl) {
+  function activateTab(tab, redirectUrl, push = true) {
     if (!tab) return;
 
     navItems.forEach((item) => {
@@ -21,13 +21,15 @@ document.addEventListener("DOMContentLoaded", () => {
       header.textContent = activeItem.title || "Default Header";
     }
 
-    // Load partial content via AJAX
+    // Load partial content via AJAX; the server answers with the content
+    // block only (or 304, which the browser turns into its cached copy)
     if (redirectUrl) {
       fetch(redirectUrl, { headers: { "X-Requested-With": "XMLHttpRequest" } })
         .then((response) => response.text())
         .then((html) => {
           contentContainer.innerHTML = html;
-          history.pushState({ tab }, "", redirectUrl);
+          runScripts(contentContainer);
+          if (push) history.pushState({ tab }, "", redirectUrl);
         })
         .catch((err) => {
           console.error(err);
@@ -36,11 +38,26 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   }
 
+  // Scripts inserted through innerHTML do not run; re-create them
+  function runScripts(container) {
+    container.querySelectorAll("script").forEach((oldScript) => {
+      const script = document.createElement("script");
+      Array.from(oldScript.attributes).forEach((attr) =>
+        script.setAttribute(attr.name, attr.value)
+      );
+      script.textContent = oldScript.textContent;
+      oldScript.replaceWith(script);
+    });
+  }
+
   navItems.forEach((item) => {
     const tab = item.dataset.tab;
     const redirectUrl = item.dataset.url;
 
-    item.addEventListener("click", () => activateTab(tab, redirectUrl));
+    item.addEventListener("click", (e) => {
+      e.preventDefault();
+      activateTab(tab, redirectUrl);
+    });
     item.addEventListener("keydown", (e) => {
       if (e.key === "Enter" || e.key === " ") {
         e.preventDefault();
@@ -52,213 +69,15 @@ document.addEventListener("DOMContentLoaded", () => {
   // Handle back/forward buttons
   window.addEventListener("popstate", (e) => {
     const tab = e.state?.tab;
-    const activeItem = Array.from(navItems).find((i) => i.dataset.tab === tab);
-    const redirectUrl = activeItem?.dataset.url;
-    if (tab && redirectUrl) {
-      activateTab(tab, redirectUrl);
+    if (tab) {
+      activateTab(tab, location.pathname + location.search, false);
     }
   });
 
-  // Initialize default tab
-  activateTab(
-    "dashboard",
-    document.querySelector('[data-tab="dashboard"]').dataset.url
-  );
-
-  // Get references to DOM elements
-  const fileInput = document.getElementById("fileInputSection1");
-  const projectTableBody = document.getElementById("projectListTableBody");
-
-  // Attach event listener to the hidden file input
-  fileInput.addEventListener("change", handleFileUpload);
-
-  // Trigger file input when the New Project button is clicked
-  document.querySelector(".btnNewProject").addEventListener("click", () => {
-    fileInput.click();
-  });
-
-  function handleFileUpload(event) {
-    const file = event.target.files[0];
-    if (!file) return;
-
-    const reader = new FileReader();
-    reader.onload = function (e) {
-      const data = new Uint8Array(e.target.result);
-      const workbook = XLSX.read(data, { type: "array" });
-      const sheetName = workbook.SheetNames[0]; // Get the first sheet
-      const sheet = workbook.Sheets[sheetName];
-      const projects = XLSX.utils.sheet_to_json(sheet); // Convert sheet to JSON
-      updateProjectTable(projects);
-    };
-    reader.readAsArrayBuffer(file);
-  }
-
-  function updateProjectTable(projects) {
-    // Track existing project names
-    const existingProjectNames = new Set();
-    document
-      .querySelectorAll("#projectListTableBody tr td:first-child")
-      .forEach((cell) => {
-        existingProjectNames.add(cell.textContent.trim());
-      });
-
-    projects.forEach((project) => {
-      const { Name, Start, End, Budget, Expenses, Progress } = project;
-
-      // Check if the project name already exists
-      if (existingProjectNames.has(Name)) {
-        const overwrite = confirm(
-          `Project "${Name}" is already displayed on the web. Do you want to overwrite it?`
-        );
-        if (!overwrite) return;
-
-        // Remove the existing row with the same project name
-        const existingRow = Array.from(
-          projectTableBody.querySelectorAll("tr")
-        ).find(
-          (row) =>
-            row.querySelector("td:first-child").textContent.trim() === Name
-        );
-        if (existingRow) {
-          existingRow.remove();
-        }
-      }
-
-      // Add the project to the set
-      existingProjectNames.add(Name);
-
-      // Calculate new status
-      const newStatus = calculateStatus(
-        parseFloat(Budget),
-        parseFloat(Expenses),
-        parseFloat(Progress),
-        End
-      );
-
-      // Create a new table row
-      const row = document.createElement("tr");
-      row.tabIndex = 0;
-      row.innerHTML = `  
-      <td>${Name}</td>
-      <td><span class="status-tag ${getStatusClass(
-        newStatus
-      )}">${newStatus}</span></td>
-      <td>${Start}</td>
-      <td>${End}</td>
-      <td>${formatCurrency(Budget)}</td>
-      <td>${formatCurrency(Expenses)}</td>
-      <td>${Progress}</td>
-      <td>
-        <button
-          class="updateButton"
-          aria-label="Update ${Name}"
-        >
-          Update
-        </button>
-      </td>
-    `;
-      projectTableBody.appendChild(row);
-    });
-  }
-
-  function calculateStatus(budget, expenses, progress, endDate) {
-    const today = new Date();
-    const end = new Date(endDate);
-    const remainingDays = (end - today) / (1000 * 60 * 60 * 24); // Convert milliseconds to days
-
-    if (progress === 100) return "Completed";
-    if (expenses > budget) return "Budget Overrun";
-    if (progress < 50 && remainingDays < 14) return "Delayed"; // Low progress and less than 2 weeks left
-    return "On Track";
-  }
-
-  function getStatusClass(status) {
-    return (
-      {
-        Completed: "status-completed",
-        "Budget Overrun": "status-delayed",
-        Delayed: "status-delayed",
-        "On Track": "status-ontrack",
-      }[status] || "status-unknown"
-    );
-  }
-
-  function formatCurrency(value) {
-    return new Intl.NumberFormat("en-PH", {
-      style: "currency",
-      currency: "PHP",
-    }).format(value);
-  }
-
-  const expenseForm = document.getElementById("expenseForm");
-  const expensesList = document.getElementById("expensesList");
-  const expenses = [];
-
-  if (expenseForm) {
-    expenseForm.addEventListener("submit", (e) => {
-      e.preventDefault();
-
-      const date = expenseForm.expenseDate.value;
-      const desc = expenseForm.expenseDescription.value.trim();
-      const amount = parseFloat(expenseForm.expenseAmount.value);
-      const category = expenseForm.expenseCategory.value;
-
-      if (!date || !desc || isNaN(amount) || amount <= 0 || !category) {
-        alert("Please fill all expense fields correctly.");
-        return;
-      }
-
-      expenses.push({ date, desc, amount, category });
-      updateExpensesDisplay();
-      expenseForm.reset();
-    });
-  }
-
-  function updateExpensesDisplay() {
-    if (expenses.length === 0) {
-      expensesList.textContent = "No expenses recorded yet.";
-      return;
-    }
-
-    let html = "Expenses:\n";
-    expenses.forEach((exp, i) => {
-      html += `${i + 1}. ${exp.date} - ${exp.desc} [${
-        exp.category
-      }] : ₱${exp.amount.toLocaleString(undefined, {
-        minimumFractionDigits: 2,
-        maximumFractionDigits: 2,
-      })}\n`;
-    });
-
-    expensesList.textContent = html;
-  }
-
-  updateExpensesDisplay();
-
-  const estimationForm = document.getElementById("estimationForm");
-  const estimationResult = document.getElementById("estimationResult");
-
-  if (estimationForm) {
-    estimationForm.addEventListener("submit", (e) => {
-      e.preventDefault();
-
-      const cost = parseFloat(estimationForm.historicalCost.value);
-      const duration = parseInt(estimationForm.historicalDuration.value, 10);
-      const factorPct = parseFloat(estimationForm.adjustmentFactor.value);
-
-      if (isNaN(cost) || isNaN(duration) || isNaN(factorPct)) {
-        alert("Please enter valid numbers.");
-        return;
-      }
-
-      const adjCost = cost + cost * (factorPct / 100);
-      const adjDuration = Math.round(duration + duration * (factorPct / 100));
-
-      estimationResult.textContent = `Estimated Cost: ₱${adjCost.toLocaleString(
-        undefined,
-        { maximumFractionDigits: 2 }
-      )}\nEstimated Duration: ${adjDuration} days`;
-    });
+  // The server already rendered the current tab; just record it
+  const currentTab = document.querySelector(".nav-item.active")?.dataset.tab;
+  if (currentTab) {
+    history.replaceState({ tab: currentTab }, "", location.href);
   }
 
   // The report generation part
@@ -0,0 +1,91 @@
+"""
+Server-side project status engine.
+
+Classifies projects by progress, budget and end date, with the rules the
+project table used to apply per row in the browser, checked in order:
+
+    Completed       accomplished_to_date >= 100 %
+    BudgetOverrun   total_expense > approved_contract
+    Delayed         accomplished_to_date < 50 % and end_date less than two weeks away
+    onTrack         everything else (including projects without an end date)
+
+``refresh_statuses`` evaluates the rules as one SQL ``CASE`` expression over
+a queryset and reads back only the rows whose stored status differs.  Those
+are written grouped by their new status, one ``UPDATE ... WHERE id IN`` per
+status and batch: with four possible values this beats ``bulk_update``,
+which builds a per-row ``CASE`` for every batch.  Imports refresh the
+projects they wrote; ``manage.py refresh_project_statuses`` refreshes
+everything nightly, since "Delayed" depends on the date.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from .caching import PROJECTS, bump
+from .models import Project
+from .portfolio import SUMMARY_FIELDS, apply_project_changes
+
+ON_TRACK = "onTrack"
+DELAYED = "Delayed"
+COMPLETED = "Completed"
+BUDGET_OVERRUN = "BudgetOverrun"
+
+COMPLETED_PROGRESS = Decimal("100")
+DELAYED_PROGRESS = Decimal("50")  # Below this, a project close to its end date is delayed
+DELAYED_DAYS_LEFT = 14
+
+
+def status_expression(today):
+    """
+    The status rules as a database expression, for ``today``.
+    """
+    return Case(
+        When(accomplished_to_date__gte=COMPLETED_PROGRESS, then=Value(COMPLETED)),
+        When(total_expense__gt=F("approved_contract"), then=Value(BUDGET_OVERRUN)),
+        When(
+            accomplished_to_date__lt=DELAYED_PROGRESS,
+            end_date__lt=today + timedelta(days=DELAYED_DAYS_LEFT),
+            then=Value(DELAYED),
+        ),
+        default=Value(ON_TRACK),
+    )
+
+
+def refresh_statuses(queryset=None, today=None, batch_size=1000):
+    """
+    Recompute the status of the projects in ``queryset`` (all by default) as
+    of ``today`` and store the ones that changed.  Returns ``{pk: status}``
+    of the changed projects.
+    """
+    queryset = Project.objects.all() if queryset is None else queryset
+    today = today or timezone.localdate()
+    changed = list(
+        queryset.order_by()
+        .annotate(computed_status=status_expression(today))
+        .filter(~Q(status=F("computed_status")))
+        .values("pk", "computed_status", *SUMMARY_FIELDS)
+    )
+    if not changed:
+        return {}
+
+    by_status = defaultdict(list)
+    summary_changes = []
+    for row in changed:
+        by_status[row["computed_status"]].append(row["pk"])
+        old = {name: row[name] for name in SUMMARY_FIELDS}
+        summary_changes.append((old, dict(old, status=row["computed_status"])))
+
+    now = timezone.now()
+    with transaction.atomic():
+        for status, pks in by_status.items():
+            for start in range(0, len(pks), batch_size):
+                # update() bypasses auto_now
+                Project.objects.filter(pk__in=pks[start:start + batch_size]).update(status=status, updated_at=now)
+        apply_project_changes(summary_changes)
+        # update() sends no post_save
+        bump(PROJECTS)
+    return {row["pk"]: row["computed_status"] for row in changed}
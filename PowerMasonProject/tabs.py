@@ -0,0 +1,105 @@
+"""
+Tab pages: full or partial rendering plus conditional GET.
+
+The sidebar's tab loader (static/js/script.js) fetches pages with
+``X-Requested-With: XMLHttpRequest`` and only swaps ``#content``, so those
+requests get just the content block (``partial.html``) instead of the whole
+``base.html`` shell.  Every tab response carries an ETag and Last-Modified
+computed without rendering, so repeat tab switches are answered with 304.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.db.models import Count, Max
+from django.shortcuts import render
+from django.template.loader import get_template
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+
+from .models import Project
+
+FULL_BASE_TEMPLATE = "base.html"
+PARTIAL_BASE_TEMPLATE = "partial.html"
+
+
+def is_ajax(request):
+    return request.headers.get("X-Requested-With") == "XMLHttpRequest"
+
+
+def render_tab(request, template_name, context):
+    """
+    Render a tab page, only its content block for the AJAX tab loader.
+    """
+    context["base_template"] = PARTIAL_BASE_TEMPLATE if is_ajax(request) else FULL_BASE_TEMPLATE
+    return render(request, template_name, context)
+
+
+def _template_mtime(*template_names):
+    """
+    Latest modification time of the template files, as an aware datetime.
+    """
+    mtime = max(os.path.getmtime(get_template(name).origin.name) for name in template_names)
+    return datetime.fromtimestamp(int(mtime), tz=dt_timezone.utc)
+
+
+def project_state():
+    """
+    Cheap fingerprint of the project table: newest write, row count and
+    highest id (the last two catch deletions).
+    """
+    return Project.objects.aggregate(updated_at=Max("updated_at"), count=Count("id"), max_id=Max("id"))
+
+
+def _tab_validators(request, template_name, state):
+    """
+    ``(etag, last_modified)`` for a tab request, computed once per request.
+    """
+    if not hasattr(request, "_tab_validators"):
+        base = PARTIAL_BASE_TEMPLATE if is_ajax(request) else FULL_BASE_TEMPLATE
+        last_modified = _template_mtime(template_name, base)
+        data = state() if state else {}
+        if data.get("updated_at"):
+            last_modified = max(last_modified, data["updated_at"].replace(microsecond=0))
+
+        fingerprint = "|".join([
+            template_name,
+            base,
+            last_modified.isoformat(),
+            repr(sorted(data.items())),
+            request.get_full_path(),
+            str(request.user.pk) if hasattr(request, "user") else "",
+            # Pages with forms embed a token tied to the CSRF cookie
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+            # Pages link the content-hashed asset names of the last collectstatic
+            getattr(staticfiles_storage, "manifest_hash", ""),
+        ])
+        request._tab_validators = (hashlib.sha1(fingerprint.encode()).hexdigest(), last_modified)
+    return request._tab_validators
+
+
+def tab_page(template_name, state=None):
+    """
+    Decorate a tab view with ETag / Last-Modified handling.
+
+    ``state`` is an optional callable returning a dict that changes whenever
+    the data shown on the page does (see ``project_state``).
+    """
+    def decorator(view):
+        conditional = condition(
+            etag_func=lambda request, *args, **kwargs: _tab_validators(request, template_name, state)[0],
+            last_modified_func=lambda request, *args, **kwargs: _tab_validators(request, template_name, state)[1],
+        )(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditional(request, *args, **kwargs)
+            # Same URL, two representations; always revalidate
+            patch_vary_headers(response, ("X-Requested-With",))
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
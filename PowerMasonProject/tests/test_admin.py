@@ -0,0 +1,67 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .. import admin as project_admin
+from ..models import PortfolioSummary, Project
+from ..portfolio import rebuild_portfolio_summary
+from .utils import CacheIsolationMixin, create_project
+
+
+class ProjectAdminTests(CacheIsolationMixin, TestCase):
+    url = "/admin/PowerMasonProject/project/"
+
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create_superuser("admin", "admin@example.com", "admin")
+        self.client.force_login(user)
+        for index in range(12):
+            create_project(f"P{index:02d}", location="Manila" if index == 3 else "Cebu")
+        rebuild_portfolio_summary()
+
+    def rows(self, response):
+        return len(response.context["cl"].result_list)
+
+    def test_counts_come_from_the_summary(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {"location": "Manila"})
+        self.assertEqual(response.context["cl"].result_count, 1)
+        table = connection.ops.quote_name(Project._meta.db_table)
+        self.assertFalse(any(query["sql"].startswith("SELECT COUNT(") and f"FROM {table}" in query["sql"]
+                             for query in queries.captured_queries))
+        self.assertContains(response, "1 project")
+
+    def test_pages_past_the_count_limit_are_reachable(self):
+        with mock.patch.object(project_admin, "COUNT_LIMIT", 5), \
+                mock.patch.object(project_admin.ProjectAdmin, "list_per_page", 2):
+            response = self.client.get(self.url, {"start_date__gte": "2000-01-01"})
+            self.assertContains(response, "5+ projects")
+            response = self.client.get(self.url, {"start_date__gte": "2000-01-01", "p": 6})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(self.rows(response), 2)
+
+    def test_a_stale_empty_summary_still_lists_the_rows(self):
+        PortfolioSummary.objects.all().delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["cl"].result_count, 12)
+        self.assertEqual(self.rows(response), 12)
+
+        response = self.client.get(self.url, {"status__exact": "onTrack"})
+        self.assertEqual(response.context["cl"].result_count, 12)
+
+    def test_search_is_case_insensitive_and_covers_location(self):
+        for term in ("manila", "MANILA", "p03", "project P0"):
+            with self.subTest(term=term):
+                response = self.client.get(self.url, {"q": term})
+                expected = 10 if term == "project P0" else 1
+                self.assertEqual(self.rows(response), expected)
+
+    def test_deletes_keep_the_summary_in_step(self):
+        selected = Project.objects.filter(location="Cebu").values_list("pk", flat=True)[:3]
+        self.client.post(self.url, {"action": "delete_selected", "post": "yes",
+                                    "_selected_action": [str(pk) for pk in selected]})
+        self.assertEqual(Project.objects.count(), 9)
+        self.assertEqual(PortfolioSummary.objects.get(dimension=PortfolioSummary.LOCATION, key="Cebu").project_count, 8)
@@ -0,0 +1,87 @@
+import gzip
+import json
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+
+from ..api import iter_export
+from ..models import Project
+from .utils import CacheIsolationMixin, create_project
+
+
+class ProjectCollectionTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        for index in range(5):
+            create_project(f"P{index}", location="Cebu" if index % 2 else "Manila",
+                           start_date=date(2024, 1, 1 + index), approved_contract=Decimal("1000.50"))
+
+    def test_pages_follow_the_cursor_links(self):
+        response = self.client.get("/api/projects/", {"per_page": 2, "fields": "proj_id,approved_contract"})
+        data = response.json()
+        self.assertEqual(data["results"], [{"proj_id": "P0", "approved_contract": "1000.50"},
+                                           {"proj_id": "P1", "approved_contract": "1000.50"}])
+        self.assertIsNone(data["previous"])
+
+        seen = [row["proj_id"] for row in data["results"]]
+        while data["next"]:
+            data = self.client.get(data["next"]).json()
+            seen += [row["proj_id"] for row in data["results"]]
+            self.assertEqual(set(data["results"][0]), {"proj_id", "approved_contract"})
+        self.assertEqual(seen, ["P0", "P1", "P2", "P3", "P4"])
+
+        previous = self.client.get(data["previous"]).json()
+        self.assertEqual([row["proj_id"] for row in previous["results"]], ["P2", "P3"])
+
+    def test_filters_and_sort(self):
+        data = self.client.get("/api/projects/", {"location": "Cebu", "sort": "-start_date", "fields": "proj_id"}).json()
+        self.assertEqual(data["results"], [{"proj_id": "P3"}, {"proj_id": "P1"}])
+
+        data = self.client.get("/api/projects/", {"start_from": "2024-01-04", "fields": "proj_id"}).json()
+        self.assertEqual(data["results"], [{"proj_id": "P3"}, {"proj_id": "P4"}])
+
+    def test_bad_parameters(self):
+        for params in ({"fields": "proj_id,secret"}, {"sort": "name"}, {"per_page": "many"}):
+            with self.subTest(params=params):
+                response = self.client.get("/api/projects/", params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.json())
+        self.assertEqual(self.client.post("/api/projects/").status_code, 405)
+
+    def test_gzip_for_clients_that_accept_it(self):
+        response = self.client.get("/api/projects/", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))["results"]), 5)
+
+
+class ProjectExportTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        for index in range(5):
+            create_project(f"P{index}", location="Cebu" if index % 2 else "Manila")
+
+    def test_streamed_json_array(self):
+        response = self.client.get("/api/projects/export/", {"fields": "proj_id,location", "sort": "-proj_id"})
+        self.assertTrue(response.streaming)
+        self.assertIn('filename="projects.json"', response["Content-Disposition"])
+        rows = json.loads(b"".join(response.streaming_content))
+        self.assertEqual([row["proj_id"] for row in rows], ["P4", "P3", "P2", "P1", "P0"])
+        self.assertEqual(rows[0], {"proj_id": "P4", "location": "Manila"})
+
+    def test_ndjson_gzipped_and_filtered(self):
+        response = self.client.get(
+            "/api/projects/export/", {"format": "ndjson", "location": "Cebu", "fields": "proj_id"},
+            headers={"Accept-Encoding": "gzip"},
+        )
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        lines = gzip.decompress(b"".join(response.streaming_content)).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{"proj_id": "P1"}, {"proj_id": "P3"}])
+
+    def test_chunks_join_into_one_document(self):
+        queryset = Project.objects.order_by("pk")
+        chunks = list(iter_export(queryset, ["proj_id"], chunk_size=2))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(len(json.loads(b"".join(chunks))), 5)
+        self.assertEqual(list(iter_export(Project.objects.none(), ["proj_id"])), [b"[]"])
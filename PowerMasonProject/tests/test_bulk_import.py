@@ -0,0 +1,85 @@
+import io
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .. import timing
+from ..importers import PARSER_CONTEXT, parse_workbooks, parser_pool
+from ..ingest import read_project_file
+from ..models import Project
+from .utils import CacheIsolationMixin, workbook_bytes
+
+
+def zip_bytes(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+@override_settings(IMPORT_WORKERS=1)
+class BulkImportTests(CacheIsolationMixin, TestCase):
+    def post(self, *files):
+        uploads = [SimpleUploadedFile(name, data) for name, data in files]
+        return self.client.post("/import_excel/bulk/", {"excel_files": uploads})
+
+    def test_files_and_zip_archives(self):
+        archive = zip_bytes({
+            "reports/b.xlsx": workbook_bytes(seed=2)[0],
+            "reports/c.xlsx": workbook_bytes(seed=3)[0],
+            "__MACOSX/reports/._b.xlsx": b"resource fork",
+            "reports/~$c.xlsx": b"lock file",
+            "reports/notes.txt": b"not a workbook",
+        })
+        response = self.post(("a.xlsx", workbook_bytes(seed=1)[0]), ("batch.zip", archive))
+
+        summary = response.json()
+        self.assertEqual(
+            [(entry["file"], entry["status"]) for entry in summary["files"]],
+            [("a.xlsx", "created"), ("batch.zip/reports/b.xlsx", "created"), ("batch.zip/reports/c.xlsx", "created")],
+        )
+        self.assertEqual(sorted(Project.objects.values_list("proj_id", flat=True)),
+                         ["PM-000001", "PM-000002", "PM-000003"])
+
+        response = self.post(("a.xlsx", workbook_bytes(seed=1)[0]), ("batch.zip", archive))
+        self.assertEqual(response.json()["unchanged"], 3)
+
+    def test_failures_do_not_stop_the_batch(self):
+        response = self.post(("bad.xlsx", b"not a workbook"), ("good.xlsx", workbook_bytes(seed=1)[0]))
+        summary = response.json()
+        self.assertEqual((summary["created"], summary["failed"]), (1, 1))
+        self.assertEqual(summary["files"][0]["errors"][0]["code"], "not_xlsx")
+
+    def test_last_report_of_a_project_wins(self):
+        first, _ = workbook_bytes(seed=1, proj_id="PM-SAME")
+        second, header = workbook_bytes(seed=2, proj_id="PM-SAME")
+        summary = self.post(("first.xlsx", first), ("second.xlsx", second)).json()
+
+        self.assertEqual([entry["status"] for entry in summary["files"]], ["superseded", "created"])
+        self.assertEqual(Project.objects.get().name, header["name"])
+
+    def test_nothing_uploaded(self):
+        self.assertEqual(self.client.post("/import_excel/bulk/").status_code, 400)
+        self.assertEqual(self.post(("broken.zip", b"PK not really")).status_code, 400)
+
+
+class ParserPoolTests(SimpleTestCase):
+    def test_parses_in_input_order_on_a_reused_pool(self):
+        files = [(f"{seed}.xlsx", workbook_bytes(seed=seed)[0]) for seed in range(4)]
+        results = parse_workbooks(files, workers=2)
+
+        self.assertEqual([result["fields"]["proj_id"] for result in results], [f"PM-{seed:06d}" for seed in range(4)])
+        self.assertIs(parser_pool(2), parser_pool(2))
+
+    def test_workers_do_not_inherit_held_locks(self):
+        data, header = workbook_bytes(seed=1)
+        with ProcessPoolExecutor(max_workers=1, mp_context=PARSER_CONTEXT) as pool:
+            # Held by this process while the worker starts, as another
+            # request's thread could hold it in a server
+            with timing._samples_lock:
+                future = pool.submit(read_project_file, "report.xlsx", data)
+            result = future.result(timeout=60)
+        self.assertEqual(result["fields"]["proj_id"], header["proj_id"])
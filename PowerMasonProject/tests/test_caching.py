@@ -0,0 +1,83 @@
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase
+from django.utils import timezone
+
+from ..caching import PROJECTS, _version_key, bump, cache_stats, cached, reset_stats
+from ..importers import import_workbook
+from ..models import Project
+from .utils import CacheIsolationMixin, create_project, workbook_bytes
+
+
+class CacheTests(CacheIsolationMixin, TestCase):
+    def test_bump_invalidates_after_commit(self):
+        compute = mock.Mock(side_effect=[1, 2])
+        self.assertEqual(cached(PROJECTS, "value", compute), 1)
+        self.assertEqual(cached(PROJECTS, "value", compute), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump(PROJECTS)
+            # Not before the write commits
+            self.assertEqual(cached(PROJECTS, "value", compute), 1)
+        self.assertEqual(cached(PROJECTS, "value", compute), 2)
+
+    def test_saving_a_project_invalidates(self):
+        compute = mock.Mock(side_effect=[1, 2])
+        cached(PROJECTS, "value", compute)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_project("P1")
+        self.assertEqual(cached(PROJECTS, "value", compute), 2)
+
+    def test_params_are_part_of_the_key(self):
+        self.assertEqual(cached(PROJECTS, "value", lambda: "a", {"page": 1, "sort": None}), "a")
+        self.assertEqual(cached(PROJECTS, "value", lambda: "b", [("sort", None), ("page", 1)]), "a")
+        self.assertEqual(cached(PROJECTS, "value", lambda: "c", {"page": 2}), "c")
+
+    def test_writes_from_other_processes_invalidate(self):
+        project = create_project("P1")
+        compute = mock.Mock(side_effect=[1, 2, 3])
+        cached(PROJECTS, "value", compute)
+
+        # Another process's write: no signal and no bump reach this one
+        Project.objects.filter(pk=project.pk).update(name="Renamed", updated_at=timezone.now())
+        self.assertEqual(cached(PROJECTS, "value", compute), 2)
+
+        # An evicted version counter starts a new version
+        caches[settings.VIEW_CACHE_ALIAS].delete(_version_key(PROJECTS))
+        self.assertEqual(cached(PROJECTS, "value", compute), 3)
+
+    def test_stats(self):
+        reset_stats()
+        cached(PROJECTS, "value", lambda: 1)
+        cached(PROJECTS, "value", lambda: 1)
+        stats = self.client.get("/api/cache/").json()["namespaces"][PROJECTS]
+        self.assertEqual((stats["hits"], stats["misses"], stats["hit_rate"]), (1, 1, 0.5))
+        self.assertEqual(cache_stats()[PROJECTS]["version"], stats["version"])
+
+
+class CachedPageTests(CacheIsolationMixin, TestCase):
+    def test_etag_changes_when_a_location_is_added(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            import_workbook(workbook_bytes(seed=1)[0])
+        for path in ("/reports/", "/projects/"):
+            with self.subTest(path=path):
+                self.client.get(path)  # Sets the CSRF cookie, part of the fingerprint
+                etag = self.client.get(path)["ETag"]
+                self.assertEqual(self.client.get(path, headers={"If-None-Match": etag}).status_code, 304)
+
+                with self.captureOnCommitCallbacks(execute=True):
+                    create_project(f"NEW-{path}", location=f"Zamboanga {path}")
+                response = self.client.get(path, headers={"If-None-Match": etag})
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, f"Zamboanga {path}")
+
+    def test_project_list_follows_writes_from_other_processes(self):
+        project = create_project("P1", name="Before")
+        self.assertContains(self.client.get("/projects/"), "Before")
+
+        Project.objects.filter(pk=project.pk).update(name="After", updated_at=timezone.now())
+        response = self.client.get("/projects/")
+        self.assertContains(response, "After")
+        self.assertNotContains(response, "Before")
@@ -0,0 +1,88 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+
+from ..costs import cost_by_category, cost_by_period, cost_by_project
+from ..importers import import_workbook
+from ..models import CostItem
+from .utils import CacheIsolationMixin, workbook_bytes
+
+CENTS = Decimal("0.01")
+
+
+class CostItemTests(CacheIsolationMixin, TestCase):
+    def import_report(self, seed, proj_id, report_date):
+        data, _ = workbook_bytes(seed=seed, proj_id=proj_id, cells={"report_date": report_date})
+        return import_workbook(data)[0]
+
+    def test_cost_items_follow_the_report(self):
+        data, _ = workbook_bytes(seed=4)
+        project, _, _ = import_workbook(data)
+        items = CostItem.objects.filter(project=project)
+        self.assertTrue(items.exists())
+        self.assertEqual(set(items.values_list("report_date", flat=True)), {project.report_date})
+        self.assertEqual(sum(item.expense for item in items).quantize(Decimal("1")),
+                         project.total_expense.quantize(Decimal("1")))
+
+    def test_periods_add_and_reimports_replace(self):
+        project = self.import_report(1, "PM-A", date(2024, 1, 31))
+        first = CostItem.objects.filter(project=project).count()
+        self.import_report(2, "PM-A", date(2024, 2, 29))
+        self.assertEqual(CostItem.objects.filter(project=project, report_date=date(2024, 1, 31)).count(), first)
+
+        self.import_report(3, "PM-A", date(2024, 2, 29))
+        february = CostItem.objects.filter(project=project, report_date=date(2024, 2, 29))
+        self.assertEqual(february.count(), february.values("row").distinct().count())  # Replaced, not added
+        project.refresh_from_db()
+        self.assertEqual(sum(item.expense for item in february).quantize(Decimal("1")),
+                         project.total_expense.quantize(Decimal("1")))
+
+
+class CostAggregationTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        for seed, proj_id, report_date in ((1, "PM-A", date(2024, 1, 31)), (2, "PM-A", date(2024, 2, 29)),
+                                           (3, "PM-B", date(2024, 2, 15))):
+            data, _ = workbook_bytes(seed=seed, proj_id=proj_id, cells={"report_date": report_date})
+            import_workbook(data)
+        self.current = CostItem.objects.exclude(project__proj_id="PM-A", report_date=date(2024, 1, 31))
+
+    def test_by_project_uses_the_current_report(self):
+        rows = cost_by_project()
+        expected = defaultdict(Decimal)
+        for item in self.current.select_related("project"):
+            expected[item.project.proj_id] += item.expense or 0
+        self.assertEqual({row["proj_id"]: row["expense"] for row in rows},
+                         {proj_id: total.quantize(CENTS) for proj_id, total in expected.items()})
+        self.assertEqual([row["expense"] for row in rows], sorted((row["expense"] for row in rows), reverse=True))
+        self.assertEqual(len(cost_by_project(limit=1)), 1)
+        self.assertEqual([row["proj_id"] for row in cost_by_project(proj_id="PM-B")], ["PM-B"])
+
+    def test_by_category(self):
+        rows = cost_by_category()
+        self.assertEqual(sum(row["item_count"] for row in rows), self.current.count())
+        category = rows[0]["category"]
+        self.assertEqual([row["category"] for row in cost_by_category(category=category)], [category])
+
+    def test_by_period(self):
+        rows = cost_by_period()
+        self.assertEqual([(row["month"], row["project_count"]) for row in rows],
+                         [(date(2024, 1, 1), 1), (date(2024, 2, 1), 2)])
+        january = CostItem.objects.filter(report_date__month=1)
+        self.assertEqual(rows[0]["item_count"], january.count())
+        self.assertEqual([row["month"] for row in cost_by_period(limit=1)], [date(2024, 2, 1)])
+        self.assertEqual(len(cost_by_period(start=date(2024, 2, 1))), 1)
+
+    def test_api_and_page(self):
+        response = self.client.get("/api/costs/", {"group": "period"})
+        self.assertEqual(response.json()["group"], "period")
+        self.assertEqual([row["month"] for row in response.json()["results"]], ["2024-01-01", "2024-02-01"])
+
+        response = self.client.get("/api/costs/", {"limit": 1})
+        self.assertEqual(len(response.json()["results"]), 1)
+        for params in ({"group": "site"}, {"limit": "all"}):
+            self.assertEqual(self.client.get("/api/costs/", params).status_code, 400)
+
+        self.assertContains(self.client.get("/costs/"), "PM-B")
@@ -0,0 +1,81 @@
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from powermason_django.database import database_config
+
+
+def pragma(path, name):
+    with closing(sqlite3.connect(path)) as connection:
+        return connection.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+class DatabaseConfigTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.base_dir = directory.name
+
+    def apply(self, config):
+        """
+        Run the connection's init_command on a fresh database file.
+        """
+        path = os.path.join(self.base_dir, "check.sqlite3")
+        with closing(sqlite3.connect(path)) as connection:
+            connection.executescript(config["OPTIONS"]["init_command"])
+            connection.execute("CREATE TABLE t (id INTEGER)")
+        return path
+
+    def test_sqlite_defaults_leave_the_journal_mode_alone(self):
+        config = database_config(self.base_dir, env={})
+        self.assertEqual(config["ENGINE"], "django.db.backends.sqlite3")
+        self.assertEqual(config["NAME"], os.path.join(self.base_dir, "db.sqlite3"))
+        init_command = config["OPTIONS"]["init_command"]
+        self.assertNotIn("journal_mode", init_command)
+        self.assertNotIn("synchronous", init_command)
+        self.assertIn("PRAGMA busy_timeout=5000", init_command)
+        self.assertEqual(config["OPTIONS"]["timeout"], 5)
+        self.assertEqual(config["OPTIONS"]["transaction_mode"], "IMMEDIATE")
+
+        self.assertEqual(pragma(self.apply(config), "journal_mode"), "delete")
+
+    def test_wal_when_asked_for(self):
+        config = database_config(self.base_dir, env={"SQLITE_JOURNAL_MODE": "WAL", "SQLITE_BUSY_TIMEOUT_MS": "250"})
+        init_command = config["OPTIONS"]["init_command"]
+        self.assertIn("PRAGMA journal_mode=WAL", init_command)
+        self.assertIn("PRAGMA synchronous=NORMAL", init_command)
+        self.assertEqual(config["OPTIONS"]["timeout"], 0.25)
+
+        self.assertEqual(pragma(self.apply(config), "journal_mode"), "wal")
+
+        config = database_config(self.base_dir, env={"SQLITE_JOURNAL_MODE": "WAL", "SQLITE_SYNCHRONOUS": "FULL"})
+        self.assertIn("PRAGMA synchronous=FULL", config["OPTIONS"]["init_command"])
+
+    def test_sqlite_name_and_transaction_mode(self):
+        config = database_config(self.base_dir, env={"DB_NAME": "/tmp/other.sqlite3", "SQLITE_TRANSACTION_MODE": ""})
+        self.assertEqual(config["NAME"], "/tmp/other.sqlite3")
+        self.assertNotIn("transaction_mode", config["OPTIONS"])
+
+    def test_postgres_persistent_connections(self):
+        config = database_config(self.base_dir, env={
+            "DB_ENGINE": "PostgreSQL", "DB_NAME": "pm", "DB_HOST": "db", "DB_SSLMODE": "require",
+        })
+        self.assertEqual(config["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual((config["NAME"], config["HOST"]), ("pm", "db"))
+        self.assertEqual(config["OPTIONS"], {"sslmode": "require"})
+        self.assertEqual(config["CONN_MAX_AGE"], 600)
+        self.assertTrue(config["CONN_HEALTH_CHECKS"])
+
+    def test_postgres_pool(self):
+        config = database_config(self.base_dir, env={"DB_ENGINE": "postgres", "DB_POOL": "yes", "DB_POOL_MAX_SIZE": "4"})
+        self.assertEqual(config["OPTIONS"]["pool"], {"min_size": 2, "max_size": 4})
+        self.assertEqual(config["CONN_MAX_AGE"], 0)
+        self.assertNotIn("CONN_HEALTH_CHECKS", config)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ImproperlyConfigured):
+            database_config(self.base_dir, env={"DB_ENGINE": "oracle"})
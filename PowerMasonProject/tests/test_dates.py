@@ -0,0 +1,72 @@
+import io
+from datetime import date
+
+from django.test import SimpleTestCase
+
+from ..benchmarks.dates import legacy_parse_date_string, synthetic_dates
+from ..dates import DateParser, clear_cache, parse_date_string
+from ..ingest import read_project_report
+from .utils import workbook_bytes
+
+
+class DateParsingTests(SimpleTestCase):
+    def setUp(self):
+        clear_cache()
+
+    def test_september_is_not_mangled(self):
+        self.assertEqual(parse_date_string("September 5, 2023"), date(2023, 9, 5))
+        self.assertEqual(parse_date_string("5 September 2023"), date(2023, 9, 5))
+        self.assertEqual(parse_date_string("Sept 5, 2023"), date(2023, 9, 5))
+
+    def test_matches_the_strptime_loop(self):
+        for value in synthetic_dates(3000, seed=1):
+            try:
+                expected = legacy_parse_date_string(value)
+            except ValueError:
+                expected = None
+            try:
+                parsed = parse_date_string(value)
+            except ValueError:
+                parsed = None
+            if expected is None and "September" in value:
+                # The old parser turned "September" into "SEPember"
+                self.assertIsNotNone(parsed, value)
+            else:
+                self.assertEqual(parsed, expected, value)
+
+    def test_unparseable_strings_raise(self):
+        for value in ("", "June", "31/02/2023", "2023-13-01", "07/24/23"):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_date_string(value)
+
+
+class DateParserSourceTests(SimpleTestCase):
+    def test_ambiguous_dates_follow_the_source(self):
+        parser = DateParser()
+        self.assertEqual(parser.parse("05/06/2023", "site-a"), date(2023, 5, 6))  # Priority order: %m/%d/%Y
+        self.assertEqual(parser.parse("25/06/2023", "site-a"), date(2023, 6, 25))
+        self.assertEqual(parser.parse("05/06/2023", "site-a"), date(2023, 6, 5))
+        self.assertEqual(parser.parse("05/06/2023", "site-b"), date(2023, 5, 6))
+        self.assertEqual(parser.parse("05/06/2023"), date(2023, 5, 6))
+
+        parser.forget("site-a")
+        self.assertEqual(parser.parse("05/06/2023", "site-a"), date(2023, 5, 6))
+
+
+class WorkbookDateTests(SimpleTestCase):
+    def read(self, start, report):
+        data, _ = workbook_bytes(seed=1, cells={"start_date": start, "report_date": report})
+        fields, _, _ = read_project_report(io.BytesIO(data))
+        return fields["start_date"], fields["report_date"]
+
+    def test_the_workbook_settles_the_day_month_order(self):
+        # The report date comes after the start date it decides
+        self.assertEqual(self.read("05/06/2023", "25/06/2024"), (date(2023, 6, 5), date(2024, 6, 25)))
+        self.assertEqual(self.read("25/06/2023", "05/07/2024"), (date(2023, 6, 25), date(2024, 7, 5)))
+
+    def test_without_a_hint_the_priority_order_decides(self):
+        self.assertEqual(self.read("05/06/2023", "07/08/2024"), (date(2023, 5, 6), date(2024, 7, 8)))
+
+    def test_workbooks_do_not_share_their_order(self):
+        self.read("05/06/2023", "25/06/2024")
+        self.assertEqual(self.read("05/06/2023", "07/08/2024")[0], date(2023, 5, 6))
@@ -0,0 +1,86 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..estimation import COST, SUM_COLUMNS, budget_param, estimate, rebuild_estimator
+from ..models import EstimatorStatistics, Project
+from ..portfolio import apply_project_changes, summary_values
+from .utils import CacheIsolationMixin, create_project
+
+
+def statistics():
+    return {
+        (row["target"], row["location"]): [row[name] for name in SUM_COLUMNS]
+        for row in EstimatorStatistics.objects.values("target", "location", *SUM_COLUMNS)
+    }
+
+
+class EstimatorTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        # Cost at completion = 1.1 x the approved contract, everywhere
+        for index in range(7):
+            contract = Decimal(1_000_000 * (index + 1))
+            create_project(f"P{index}", location="Cebu" if index < 5 else "Manila", approved_contract=contract,
+                           accomplished_to_date=Decimal("50"), total_expense=contract * Decimal("0.55"))
+        create_project("early", location="Cebu", approved_contract=Decimal("1000000"),
+                       accomplished_to_date=Decimal("5"), total_expense=Decimal("900000"))  # Too early to project
+
+    def test_rebuild_fits_the_lines(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(rebuild_estimator(), 3)
+        self.assertEqual(statistics()[COST, ""][0], 7)
+
+        result = estimate(Decimal("2000000"), "Cebu")[COST]
+        self.assertEqual((result["estimate"], result["low"], result["high"]),
+                         (Decimal("2200000.00"), Decimal("2200000.00"), Decimal("2200000.00")))
+        self.assertEqual((result["scope"], result["samples"]), ("location", 5))
+
+        # Too few projects of its own: the portfolio line
+        result = estimate(Decimal("10000000"), "Manila")[COST]
+        self.assertEqual((result["estimate"], result["scope"], result["samples"]),
+                         (Decimal("11000000.00"), "portfolio", 7))
+
+    def test_incremental_changes_match_a_rebuild(self):
+        projects = list(Project.objects.all())
+        apply_project_changes([(None, summary_values(project)) for project in projects])
+        moved = projects[0]
+        old = summary_values(moved)
+        moved.location, moved.total_expense = "Iloilo", Decimal("800000")
+        apply_project_changes([(old, summary_values(moved)), (summary_values(projects[1]), None)])
+        Project.objects.filter(pk=moved.pk).update(location="Iloilo", total_expense=Decimal("800000"))
+        projects[1].delete()
+
+        incremental = statistics()
+        rebuild_estimator()
+        rebuilt = statistics()
+        self.assertEqual(set(key for key, sums in incremental.items() if sums[0]), set(rebuilt))
+        for key, sums in rebuilt.items():
+            for expected, value in zip(sums, incremental[key]):
+                self.assertAlmostEqual(value, expected, delta=1e-6 * max(abs(expected), 1))
+
+    def test_no_estimate_without_enough_projects(self):
+        Project.objects.exclude(proj_id__in=["P0", "P1"]).delete()
+        rebuild_estimator()
+        self.assertEqual(estimate(Decimal("1000000")), {COST: None})
+
+    def test_budget_param(self):
+        self.assertEqual(budget_param({"budget": "1,250,000.50"}), Decimal("1250000.50"))
+        for value in ("", "abc", "-5", "0", "NaN", "Infinity", "1e20"):
+            with self.subTest(value=value):
+                self.assertIsNone(budget_param({"budget": value}))
+
+    def test_api_page_and_command(self):
+        output = StringIO()
+        call_command("rebuild_estimator", stdout=output)
+        self.assertIn("Rebuilt 3 estimator statistics rows.", output.getvalue())
+
+        response = self.client.get("/api/estimate/", {"budget": "3000000", "location": "Cebu"})
+        self.assertEqual(response.json()["cost"]["estimate"], "3300000.00")
+        self.assertEqual(self.client.get("/api/estimate/", {"budget": "lots"}).status_code, 400)
+
+        response = self.client.get("/estimation/", {"budget": "3000000", "location": "Cebu"})
+        self.assertContains(response, "3,300,000")
+        self.assertContains(self.client.get("/estimation/", {"budget": "-1"}), "positive amount")
@@ -0,0 +1,62 @@
+import contextlib
+import io
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from openpyxl import load_workbook
+
+from ..benchmarks.expenses import legacy_total_expense, synthetic_columns
+from ..expenses import (
+    ROW_BLANK, ROW_FORMULA, ROW_INVALID, ROW_OK, ROW_ZERO_QUANTITY, calculate_expense, describe_row_statuses,
+    safe_decimal,
+)
+from ..ingest import EXPENSE_FIRST_ROW, EXPENSE_LAST_ROW, read_project_report
+from .utils import workbook_bytes
+
+
+class ExpenseTests(SimpleTestCase):
+    def test_vectorized_total_matches_the_decimal_loop(self):
+        for seed in range(5):
+            columns = synthetic_columns(2000, seed=seed)
+            total, _ = calculate_expense(*columns)
+            self.assertEqual(total, legacy_total_expense(*columns), f"seed {seed}")
+
+    def test_workbook_total_matches_the_decimal_loop(self):
+        data, _ = workbook_bytes(seed=3)
+        sheet = load_workbook(io.BytesIO(data), read_only=True).active
+        rows = list(sheet.iter_rows(min_row=EXPENSE_FIRST_ROW, max_row=EXPENSE_LAST_ROW, values_only=True))
+        c_values, e_values, f_values = zip(*[(row[2], row[4], row[5]) for row in rows])
+
+        fields, _, items = read_project_report(io.BytesIO(data))
+
+        self.assertEqual(fields["total_expense"], legacy_total_expense(c_values, e_values, f_values))
+        self.assertEqual(len(items), sum(1 for row in rows if row[2] is not None))
+
+    def test_half_cent_rounds_up_like_decimal(self):
+        # 0.005 as a float is just below half a cent
+        columns = ([1, 3], [Decimal("0.005"), Decimal("0.01")], [1, 0])
+        total, _ = calculate_expense(*columns)
+        self.assertEqual(total, Decimal("0.01"))
+        self.assertEqual(total, legacy_total_expense(*columns))
+
+    def test_row_statuses(self):
+        total, statuses = calculate_expense(
+            [10, None, 0, "2*5", 4, "8"],
+            [100, 100, 100, 100, "lot", 80],
+            [5, 5, 5, 5, 1, "4"],
+        )
+        self.assertEqual(list(statuses), [ROW_OK, ROW_BLANK, ROW_ZERO_QUANTITY, ROW_FORMULA, ROW_INVALID, ROW_OK])
+        self.assertEqual(total, Decimal("90.00"))
+        self.assertEqual(
+            describe_row_statuses([10, 11, 12, 13, 14, 15], statuses),
+            ["Skipped 1 expense row(s) with formula cells: rows 13.",
+             "Skipped 1 expense row(s) with invalid value cells: rows 14."],
+        )
+
+    def test_text_cells_count_as_zero_silently(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(safe_decimal("lot"), Decimal("0.00"))
+            self.assertEqual(safe_decimal("1+2"), Decimal("0.00"))
+        self.assertEqual(safe_decimal("12.50"), Decimal("12.50"))
+        self.assertEqual(output.getvalue(), "")
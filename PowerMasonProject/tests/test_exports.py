@@ -0,0 +1,71 @@
+import csv
+import io
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from openpyxl import load_workbook
+
+from ..exports import REPORT_COLUMNS
+from ..models import ProgressSnapshot, Project
+from .utils import create_project
+
+
+class ReportExportTests(TestCase):
+    def setUp(self):
+        for index in range(3):
+            project = create_project(f"P{index}", location="Cebu" if index % 2 else "Manila",
+                                     name=f"Project, “{index}”", approved_contract=Decimal("1500.25"))
+            for month in (1, 2):
+                ProgressSnapshot.objects.create(project=project, report_date=date(2024, month, 28),
+                                                accomplished_to_date=Decimal(10 * month))
+
+    def csv_rows(self, path, params=None):
+        response = self.client.get(path, params or {})
+        self.assertTrue(response.streaming)
+        self.assertIn(".csv", response["Content-Disposition"])
+        text = b"".join(response.streaming_content).decode("utf-8-sig")
+        return list(csv.reader(io.StringIO(text)))
+
+    def xlsx_rows(self, path, params=None):
+        response = self.client.get(path, params or {})
+        self.assertIn(".xlsx", response["Content-Disposition"])
+        workbook = load_workbook(io.BytesIO(b"".join(response.streaming_content)), read_only=True)
+        return workbook, list(workbook.active.iter_rows(values_only=True))
+
+    def test_projects_csv(self):
+        rows = self.csv_rows("/reports/export/projects/csv/")
+        headers = [header for header, _ in REPORT_COLUMNS["projects"][1]]
+        self.assertEqual(rows[0], headers)
+        self.assertEqual([row[0] for row in rows[1:]], ["P0", "P1", "P2"])
+        self.assertEqual(rows[1][1], "Project, “0”")
+        self.assertEqual(rows[1][headers.index("Approved Contract (PHP)")], "1500.25")
+
+    def test_projects_xlsx(self):
+        workbook, rows = self.xlsx_rows("/reports/export/projects/xlsx/", {"location": "Cebu"})
+        self.assertEqual(workbook.active.title, "Projects")
+        self.assertEqual(rows[0][0], "Project ID")
+        self.assertEqual([row[0] for row in rows[1:]], ["P1"])
+        self.assertEqual(rows[1][4].date(), date(2024, 1, 1))
+
+    def test_progress_filters(self):
+        rows = self.csv_rows("/reports/export/progress/csv/", {"location": "Manila", "start": "2024-02-01"})
+        self.assertEqual([(row[0], row[2]) for row in rows[1:]], [("P0", "2024-02-28"), ("P2", "2024-02-28")])
+
+        _, rows = self.xlsx_rows("/reports/export/progress/xlsx/")
+        self.assertEqual(len(rows), 1 + ProgressSnapshot.objects.count())
+        self.assertEqual(rows[1][:2], ("P0", "Project, “0”"))
+
+    def test_unknown_report_or_format(self):
+        self.assertEqual(self.client.get("/reports/export/secrets/csv/").status_code, 404)
+        self.assertEqual(self.client.get("/reports/export/projects/pdf/").status_code, 404)
+
+    def test_admin_exports_the_selection(self):
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "password"))
+        selected = Project.objects.filter(proj_id__in=["P0", "P2"]).values_list("pk", flat=True)
+        response = self.client.post("/admin/PowerMasonProject/project/", {
+            "action": "export_csv", "_selected_action": [str(pk) for pk in selected],
+        })
+        text = b"".join(response.streaming_content).decode("utf-8-sig")
+        self.assertEqual([row[0] for row in csv.reader(io.StringIO(text))][1:], ["P0", "P2"])
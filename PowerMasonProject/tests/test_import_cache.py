@@ -0,0 +1,71 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .. import importers
+from ..importers import CREATED, UNCHANGED, UPDATED, import_workbook, workbook_digest
+from ..layouts import PROGRESS_REPORT_V1, register_layout, unregister_layout
+from ..models import ImportCacheEntry, Project
+from .utils import CacheIsolationMixin, workbook_bytes
+
+
+class ImportCacheTests(CacheIsolationMixin, TestCase):
+    def test_reimport_is_unchanged(self):
+        data, header = workbook_bytes(seed=1)
+        project, outcome, _ = import_workbook(data)
+        self.assertEqual(outcome, CREATED)
+        self.assertEqual(project.proj_id, header["proj_id"])
+
+        # From the import cache, then parsed again
+        with mock.patch.object(importers, "read_project_report", wraps=importers.read_project_report) as read:
+            self.assertEqual(import_workbook(data)[1], UNCHANGED)
+            read.assert_not_called()
+            ImportCacheEntry.objects.all().delete()
+            self.assertEqual(import_workbook(data)[1], UNCHANGED)
+            read.assert_called_once()
+        self.assertEqual(Project.objects.count(), 1)
+
+    def test_only_changed_fields_are_written(self):
+        data, _ = workbook_bytes(seed=1)
+        project, _, _ = import_workbook(data)
+        renamed, _ = workbook_bytes(seed=1, cells={"name": "Renamed Project"})
+
+        with CaptureQueriesContext(connection) as queries:
+            project, outcome, _ = import_workbook(renamed)
+
+        self.assertEqual(outcome, UPDATED)
+        self.assertEqual(Project.objects.get(pk=project.pk).name, "Renamed Project")
+        table = connection.ops.quote_name(Project._meta.db_table)
+        update = next(query["sql"] for query in queries if query["sql"].startswith(f"UPDATE {table}"))
+        self.assertIn('"name"', update)
+        self.assertNotIn('"location"', update)
+
+    def test_new_report_updates_the_project(self):
+        import_workbook(workbook_bytes(seed=1, proj_id="PM-UPDATE")[0])
+        updated_data, updated_header = workbook_bytes(seed=2, proj_id="PM-UPDATE")
+
+        project, outcome, _ = import_workbook(updated_data)
+
+        self.assertEqual(outcome, UPDATED)
+        project.refresh_from_db()
+        self.assertEqual(project.name, updated_header["name"])
+        self.assertEqual(project.report_date, updated_header["report_date"])
+        self.assertEqual(Project.objects.count(), 1)
+
+    def test_changing_a_layout_changes_the_key(self):
+        data, _ = workbook_bytes(seed=1)
+        before = workbook_digest(data)
+        register_layout(dict(PROGRESS_REPORT_V1, name="test-layout", labels={"A1": "Test"}))
+        self.addCleanup(unregister_layout, "test-layout")
+        self.assertNotEqual(workbook_digest(data), before)
+
+    @override_settings(IMPORT_CACHE_MAX_ENTRIES=2)
+    def test_cache_is_bounded(self):
+        digests = []
+        for seed in range(3):
+            data, _ = workbook_bytes(seed=seed)
+            import_workbook(data)
+            digests.append(workbook_digest(data))
+        self.assertEqual(set(ImportCacheEntry.objects.values_list("sha256", flat=True)), set(digests[1:]))
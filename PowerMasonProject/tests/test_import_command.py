@@ -0,0 +1,54 @@
+import os
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from ..models import Project
+from .utils import CacheIsolationMixin, workbook_bytes
+
+
+class ImportProjectsCommandTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        (self.root / "site-a").mkdir()
+        (self.root / "site-a" / "one.xlsx").write_bytes(workbook_bytes(seed=1)[0])
+        (self.root / "site-a" / "~$one.xlsx").write_bytes(b"lock file")
+        (self.root / "two.xlsx").write_bytes(workbook_bytes(seed=2)[0])
+        (self.root / "bad.xlsx").write_bytes(b"not a workbook")
+        (self.root / "notes.txt").write_text("not a workbook")
+
+    def run_command(self, *args):
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_projects", *args, "--workers", "1", stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_imports_a_directory_tree(self):
+        stdout, stderr = self.run_command(str(self.root), "--chunk-size", "2")
+
+        self.assertEqual(sorted(Project.objects.values_list("proj_id", flat=True)), ["PM-000001", "PM-000002"])
+        self.assertIn("3 files so far: created 2, failed 1", stdout)
+        self.assertIn("Imported 3 files", stdout)
+        self.assertIn(f"{self.root / 'bad.xlsx'}: ", stderr)
+
+        stdout, _ = self.run_command(str(self.root))
+        self.assertIn("unchanged 2", stdout)
+
+    def test_glob_patterns(self):
+        self.run_command(os.path.join(str(self.root), "**", "one.xlsx"))
+        self.assertEqual(list(Project.objects.values_list("proj_id", flat=True)), ["PM-000001"])
+
+    def test_dry_run_writes_nothing(self):
+        stdout, _ = self.run_command(str(self.root), "--dry-run")
+        self.assertIn("3 files so far: failed 1, parsed 2", stdout)
+        self.assertIn("(dry run, nothing written)", stdout)
+        self.assertFalse(Project.objects.exists())
+
+    def test_rejects_bad_options(self):
+        with self.assertRaises(CommandError):
+            call_command("import_projects", str(self.root), "--chunk-size", "0")
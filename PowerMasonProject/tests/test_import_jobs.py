@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from ..importers import JOB_PROGRESS_DONE, enqueue_import_job, process_import_job
+from ..models import ImportJob, Project
+from .utils import CacheIsolationMixin, workbook_bytes
+
+
+@override_settings(IMPORT_JOB_THREADS=0)
+class ImportJobTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+
+    def enqueue(self, data, name="report.xlsx"):
+        return enqueue_import_job(ContentFile(data, name=name))
+
+    def test_ajax_upload_is_queued_and_polled_to_completion(self):
+        data, header = workbook_bytes(seed=1)
+        response = self.client.post(
+            "/import_excel/", {"excel_file": SimpleUploadedFile("report.xlsx", data)},
+            headers={"X-Requested-With": "XMLHttpRequest"},
+        )
+        self.assertEqual(response.status_code, 202)
+        status_url = response.json()["status_url"]
+        self.assertEqual(self.client.get(status_url).json()["status"], ImportJob.QUEUED)
+        self.assertFalse(Project.objects.exists())
+
+        job = process_import_job(response.json()["job_id"])
+
+        status = self.client.get(status_url).json()
+        self.assertEqual((status["status"], status["progress"]), (ImportJob.DONE, JOB_PROGRESS_DONE))
+        self.assertEqual(status["project_id"], Project.objects.get(proj_id=header["proj_id"]).pk)
+        self.assertFalse(ImportJob.objects.get(pk=job.pk).file)
+
+    def test_stored_upload_is_deleted_when_the_job_fails(self):
+        job = self.enqueue(b"not a workbook")
+        path = job.file.path
+        self.assertTrue(os.path.exists(path))
+
+        job = process_import_job(job.pk)
+
+        self.assertEqual(job.status, ImportJob.FAILED)
+        self.assertIn("not an .xlsx workbook", job.error)
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(ImportJob.objects.get(pk=job.pk).file)
+
+    def test_a_job_runs_once(self):
+        job = self.enqueue(workbook_bytes(seed=1)[0])
+        self.assertIsNotNone(process_import_job(job.pk))
+        self.assertIsNone(process_import_job(job.pk))
+
+    def test_command_processes_the_queue(self):
+        self.enqueue(workbook_bytes(seed=1)[0], "one.xlsx")
+        self.enqueue(b"broken", "two.xlsx")
+        output = StringIO()
+        call_command("process_import_jobs", stdout=output)
+
+        self.assertEqual(
+            list(ImportJob.objects.order_by("pk").values_list("status", flat=True)),
+            [ImportJob.DONE, ImportJob.FAILED],
+        )
+        self.assertIn("one.xlsx: done", output.getvalue())
+
+    def test_refused_ajax_upload_gets_errors_and_no_job(self):
+        data, _ = workbook_bytes(seed=1)
+        with override_settings(IMPORT_LIMITS={"max_bytes": 1024}):
+            response = self.client.post(
+                "/import_excel/", {"excel_file": SimpleUploadedFile("report.xlsx", data)},
+                headers={"X-Requested-With": "XMLHttpRequest"},
+            )
+        self.assertEqual(response.status_code, 413)
+        self.assertNotIn("status_url", response.json())
+        self.assertEqual(response.json()["errors"][0]["code"], "too_large")
+        self.assertFalse(ImportJob.objects.exists())
@@ -0,0 +1,76 @@
+import io
+from datetime import date
+from unittest import mock
+
+from django.contrib import messages
+from django.contrib.messages import get_messages
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase
+
+from ..ingest import EXPENSE_FIRST_ROW, EXPENSE_LAST_ROW, read_project_report, read_sheet_values
+from ..models import Project
+from ..validation import WorkbookRejected
+from .utils import CacheIsolationMixin, workbook_bytes
+
+
+class ReadWorkbookTests(SimpleTestCase):
+    def test_one_pass_collects_header_and_expense_block(self):
+        data, header = workbook_bytes(seed=1)
+        values, expense_rows = read_sheet_values(io.BytesIO(data))
+
+        self.assertEqual(values["proj_id"], header["proj_id"])
+        self.assertEqual(values["approved_contract"], header["approved_contract"])
+        self.assertEqual([row[0] for row in expense_rows], list(range(EXPENSE_FIRST_ROW, EXPENSE_LAST_ROW + 1)))
+
+    def test_unreadable_report_date_is_a_warning(self):
+        data, _ = workbook_bytes(seed=1, cells={"report_date": "sometime in June"})
+        fields, warnings, _ = read_project_report(io.BytesIO(data))
+        self.assertIsNone(fields["report_date"])
+        self.assertEqual(len(warnings), 1)
+        self.assertIn("Invalid report date format", warnings[0])
+
+    def test_missing_required_field_is_rejected(self):
+        data, _ = workbook_bytes(seed=1, cells={"location": None})
+        with self.assertRaises(WorkbookRejected):
+            read_project_report(io.BytesIO(data))
+
+    def test_text_start_date(self):
+        data, _ = workbook_bytes(seed=1, cells={"start_date": "2023-02-01"})
+        fields, _, _ = read_project_report(io.BytesIO(data))
+        self.assertEqual(fields["start_date"], date(2023, 2, 1))
+
+
+class ImportExcelViewTests(CacheIsolationMixin, TestCase):
+    def post(self, data, name="report.xlsx"):
+        return self.client.post("/import_excel/", {"excel_file": SimpleUploadedFile(name, data)})
+
+    def test_import_creates_the_project(self):
+        data, header = workbook_bytes(seed=2)
+        response = self.post(data)
+
+        self.assertRedirects(response, "/projects/", fetch_redirect_response=False)
+        self.assertTrue(Project.objects.filter(proj_id=header["proj_id"]).exists())
+        self.assertEqual(
+            [(message.level, message.message) for message in get_messages(response.wsgi_request)],
+            [(messages.SUCCESS, "Project data imported successfully.")],
+        )
+
+    def test_parse_warnings_are_warnings(self):
+        data, _ = workbook_bytes(seed=2, cells={"report_date": "sometime in June"})
+        response = self.post(data)
+        levels = [message.level for message in get_messages(response.wsgi_request)]
+        self.assertEqual(levels, [messages.WARNING, messages.SUCCESS])
+
+    def test_failure_is_logged_with_its_traceback(self):
+        data, _ = workbook_bytes(seed=2)
+        with mock.patch("PowerMasonProject.views.import_workbook", side_effect=RuntimeError("disk full")), \
+                self.assertLogs("powermason.imports", "ERROR") as logs:
+            response = self.post(data, name="broken.xlsx")
+
+        self.assertEqual(logs.records[0].getMessage(), "Import of broken.xlsx failed")
+        self.assertIsNotNone(logs.records[0].exc_info)
+        self.assertEqual(
+            [message.message for message in get_messages(response.wsgi_request)],
+            ["Error processing Excel file: disk full"],
+        )
+        self.assertFalse(Project.objects.exists())
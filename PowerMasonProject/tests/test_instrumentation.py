@@ -0,0 +1,62 @@
+import re
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .. import timing
+from .utils import CacheIsolationMixin, create_project
+
+
+class TimingTests(SimpleTestCase):
+    def setUp(self):
+        timing.reset()
+        self.addCleanup(timing.reset)
+
+    def test_spans_are_charged_to_the_profile(self):
+        with timing.profile("job") as active:
+            with timing.span("parse"):
+                pass
+            with timing.span("parse"):
+                pass
+            active.name = "job:renamed"
+        self.assertIn("parse", active.spans)
+        self.assertIsNone(timing.current_profile())
+
+        counts = {row["key"]: row["count"] for row in timing.summary()}
+        self.assertEqual(counts, {"job:renamed": 1, "span:parse": 2})
+
+    def test_percentiles(self):
+        values = list(range(1, 101))
+        self.assertEqual([timing.percentile(values, point) for point in (50, 90, 99)], [50, 90, 99])
+        self.assertEqual(timing.percentile([7], 50), 7)
+
+
+class InstrumentationMiddlewareTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        timing.reset()
+        self.addCleanup(timing.reset)
+        create_project("P1")
+
+    def test_server_timing_counts_queries(self):
+        response = self.client.get("/api/projects/")
+        header = response["Server-Timing"]
+        self.assertRegex(header, r"^app;dur=[\d.]+, db;dur=[\d.]+;desc=\"\d+ queries\"")
+        self.assertGreater(int(re.search(r'"(\d+) queries"', header).group(1)), 0)
+
+        row = next(row for row in timing.summary() if row["key"] == "GET /api/projects/")
+        self.assertEqual(row["count"], 1)
+        self.assertGreater(row["mean_queries"], 0)
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged(self):
+        with self.assertLogs("powermason.performance", "WARNING") as logs:
+            self.client.get("/api/projects/", {"location": "Cebu"})
+        self.assertIn("Slow request GET /api/projects/?location=Cebu", logs.output[0])
+
+    def test_report_is_for_staff(self):
+        self.assertEqual(self.client.get("/reports/performance/").status_code, 302)
+
+        self.client.get("/api/projects/")
+        self.client.force_login(User.objects.create_user("staff", password="password", is_staff=True))
+        self.assertContains(self.client.get("/reports/performance/"), "GET /api/projects/")
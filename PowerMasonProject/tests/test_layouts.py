@@ -0,0 +1,100 @@
+import io
+from datetime import date
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from openpyxl import Workbook
+
+from .. import layouts
+from ..ingest import read_project_report, read_sheet, validate_workbook
+from ..layouts import DEFAULT_LAYOUT, PROGRESS_REPORT_V1, register_layout, registry_fingerprint, unregister_layout
+from .utils import workbook_bytes
+
+# The standard fields moved around, with a title identifying the template
+SITE_REPORT = {
+    "name": "site-report-v2",
+    "cells": {
+        "proj_id": "C2",
+        "name": "C3",
+        "location": "C4",
+        "start_date": "C5",
+        "report_date": "F2",
+        "accomplished_to_date": "F3",
+        "accomplished_before_period": "F4",
+        "progress_report_month_year": "A7",
+        "approved_contract": "D30",
+    },
+    "expense_rows": (10, 20),
+    "expense_columns": {"quantity": "B", "amount": "C", "accomplished": "D"},
+    "labels": {"A1": "Site Progress Report", "E2": "Report date"},
+}
+
+
+def site_report(title="SITE PROGRESS REPORT (rev. 2)"):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet["A1"], sheet["E2"] = title, "Report date:"
+    for address, value in {
+        "C2": "SITE-1", "C3": "Bridge", "C4": "Iloilo", "C5": date(2024, 3, 1),
+        "F2": date(2024, 6, 30), "F3": 40, "F4": 25, "A7": "JUNE 2024", "D30": 5000,
+    }.items():
+        sheet[address] = value
+    for row in (10, 11):
+        sheet[f"B{row}"], sheet[f"C{row}"], sheet[f"D{row}"] = 2, 100, 1  # 50.00 spent per line
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+class LayoutTests(SimpleTestCase):
+    def setUp(self):
+        register_layout(SITE_REPORT)
+        self.addCleanup(unregister_layout, SITE_REPORT["name"])
+
+    def test_detects_the_layout_from_its_labels(self):
+        plan, header, expense_rows = read_sheet(io.BytesIO(site_report()))
+        self.assertEqual(plan.name, "site-report-v2")
+        self.assertEqual(header["proj_id"], "SITE-1")
+        self.assertEqual(header["approved_contract"], 5000)
+        self.assertEqual([row[0] for row in expense_rows], list(range(10, 21)))
+
+        fields, warnings, items = read_project_report(io.BytesIO(site_report()))
+        self.assertEqual(
+            (fields["proj_id"], fields["location"], fields["start_date"], fields["report_date"]),
+            ("SITE-1", "Iloilo", date(2024, 3, 1), date(2024, 6, 30)),
+        )
+        self.assertEqual(fields["total_expense"], Decimal("100.00"))
+        self.assertEqual(fields["accomplished_this_period"], Decimal("2"))  # Of the 5000.00 contract
+        self.assertEqual(fields["accomplished_to_date"], Decimal("27"))
+
+    def test_other_workbooks_use_the_default_layout(self):
+        data, header = workbook_bytes(seed=1)
+        plan, _, _ = read_sheet(io.BytesIO(data))
+        self.assertEqual(plan.name, DEFAULT_LAYOUT)
+        self.assertEqual(read_project_report(io.BytesIO(data))[0]["proj_id"], header["proj_id"])
+
+        # Every label must match
+        plan, _, _ = read_sheet(io.BytesIO(site_report(title="Weekly summary")))
+        self.assertEqual(plan.name, DEFAULT_LAYOUT)
+
+    def test_a_layout_can_be_forced(self):
+        plan, header, _ = read_sheet(io.BytesIO(site_report()), layout=DEFAULT_LAYOUT)
+        self.assertEqual(plan.name, DEFAULT_LAYOUT)
+        with self.assertRaises(ValueError):
+            read_sheet(io.BytesIO(site_report()), layout="missing")
+
+    def test_validation_reports_the_layout(self):
+        report = validate_workbook(io.BytesIO(site_report()))
+        self.assertEqual((report["valid"], report["layout"], report["proj_id"]), (True, "site-report-v2", "SITE-1"))
+
+    def test_registry(self):
+        self.assertIn("site-report-v2", layouts.registered_layouts())
+        self.assertGreaterEqual(layouts.read_bounds()[2], 2)
+        before = registry_fingerprint()
+        register_layout(dict(SITE_REPORT, expense_rows=(10, 25)))
+        self.assertNotEqual(registry_fingerprint(), before)
+
+        with self.assertRaises(ValueError):
+            register_layout({**SITE_REPORT, "name": "incomplete", "cells": {"proj_id": "A1"}})
+        with self.assertRaises(ValueError):
+            unregister_layout(PROGRESS_REPORT_V1["name"])
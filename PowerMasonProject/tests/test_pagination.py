@@ -0,0 +1,86 @@
+import re
+from datetime import date, timedelta
+from html import unescape
+
+from django.test import TestCase
+
+from ..models import Project
+from ..pagination import decode_cursor, encode_cursor, keyset_page
+from .utils import CacheIsolationMixin, create_project
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        for index in range(23):
+            # Repeated report dates and a few NULLs
+            report_date = None if index % 7 == 0 else date(2024, 1, 1) + timedelta(days=index % 5)
+            create_project(f"P{index:02d}", report_date=report_date)
+
+    def walk(self, descending):
+        pages, cursor = [], None
+        while True:
+            page = keyset_page(Project.objects.all(), "report_date", descending, after=cursor, per_page=4)
+            pages.append([project.pk for project in page["items"]])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return pages, page
+
+    def test_pages_cover_every_row_once_in_order(self):
+        for descending in (False, True):
+            pages, _ = self.walk(descending)
+            seen = [pk for page in pages for pk in page]
+            expected = Project.objects.order_by(
+                *(("-report_date", "-pk") if descending else ("report_date", "pk"))
+            ).values_list("pk", flat=True)
+            self.assertEqual(seen, list(expected))
+
+    def test_previous_cursor_returns_the_previous_page(self):
+        pages, last = self.walk(False)
+        page = last
+        for expected in reversed(pages[:-1]):
+            page = keyset_page(Project.objects.all(), "report_date", before=page["previous_cursor"], per_page=4)
+            self.assertEqual([project.pk for project in page["items"]], expected)
+        self.assertIsNone(page["previous_cursor"])
+
+    def test_cursors_round_trip_and_bad_ones_start_over(self):
+        field = Project._meta.get_field("report_date")
+        self.assertEqual(decode_cursor(encode_cursor(date(2024, 1, 2), 7), field), (date(2024, 1, 2), 7))
+        self.assertEqual(decode_cursor(encode_cursor(None, 7), field), (None, 7))
+        self.assertIsNone(decode_cursor("not-a-cursor", field))
+
+        page = keyset_page(Project.objects.all(), "report_date", after="not-a-cursor", per_page=4)
+        self.assertEqual(page["items"], list(Project.objects.order_by("report_date", "pk")[:4]))
+
+
+class ProjectListTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        for index in range(5):
+            create_project(f"P{index}", name=f"Project {index}", start_date=date(2024, 1, 1 + index),
+                           location="Cebu" if index % 2 else "Manila")
+
+    def names(self, response):
+        body = response.content.decode().split('id="projectListTableBody"', 1)[1].split("</tbody>", 1)[0]
+        return re.findall(r"<td>(Project \d)</td>", body)
+
+    def link(self, response, rel):
+        match = re.search(rf'href="\?([^"]*)">[^<]*{rel}', response.content.decode())
+        return unescape(match.group(1)) if match else None
+
+    def test_newest_first_in_pages(self):
+        response = self.client.get("/projects/", {"per_page": 2})
+        self.assertEqual(self.names(response), ["Project 4", "Project 3"])
+
+        next_query = self.link(response, "Next")
+        response = self.client.get(f"/projects/?{next_query}")
+        self.assertEqual(self.names(response), ["Project 2", "Project 1"])
+
+        response = self.client.get(f"/projects/?{self.link(response, 'Previous')}")
+        self.assertEqual(self.names(response), ["Project 4", "Project 3"])
+
+    def test_filters_and_sort(self):
+        response = self.client.get("/projects/", {"location": "Cebu", "sort": "start_date"})
+        self.assertEqual(self.names(response), ["Project 1", "Project 3"])
+
+        response = self.client.get("/projects/", {"sort": "name"})  # Not sortable
+        self.assertEqual(self.names(response)[0], "Project 4")
@@ -0,0 +1,70 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from ..importers import import_workbook
+from ..models import PortfolioSummary, Project
+from ..portfolio import (
+    apply_project_changes, dashboard_summary, rebuild_portfolio_summary, summary_count, summary_values,
+)
+from .utils import CacheIsolationMixin, create_project, workbook_bytes
+
+
+def summary():
+    return sorted(
+        PortfolioSummary.objects.filter(project_count__gt=0).values_list(
+            "dimension", "key", "project_count", "approved_contract", "total_expense", "accomplished_to_date",
+        )
+    )
+
+
+class PortfolioSummaryTests(CacheIsolationMixin, TestCase):
+    def test_summary_deltas_match_a_rebuild(self):
+        for seed in range(4):
+            import_workbook(workbook_bytes(seed=seed)[0])
+        import_workbook(workbook_bytes(seed=9, proj_id="PM-000001")[0])  # Update
+        import_workbook(workbook_bytes(seed=2)[0])  # Unchanged
+
+        project = Project.objects.get(proj_id="PM-000003")
+        apply_project_changes([(summary_values(project), None)])
+        project.delete()
+
+        incremental = summary()
+        self.assertEqual(rebuild_portfolio_summary(), len(incremental))
+        self.assertEqual(incremental, summary())
+        self.assertEqual(summary_count(), 3)
+
+    def test_dashboard_figures(self):
+        create_project("P1", location="Cebu", status="Delayed", approved_contract=Decimal("1000.00"),
+                       total_expense=Decimal("250.00"), accomplished_to_date=Decimal("40.00"))
+        create_project("P2", location="Cebu", status="Completed", approved_contract=Decimal("3000.00"),
+                       total_expense=Decimal("750.00"), accomplished_to_date=Decimal("100.00"))
+        create_project("P3", status="Delayed", approved_contract=Decimal("1000.00"),
+                       accomplished_to_date=Decimal("10.00"))
+        rebuild_portfolio_summary()
+
+        figures = dashboard_summary()
+
+        self.assertEqual(figures["project_count"], 3)
+        self.assertEqual(figures["approved_contract"], Decimal("5000.00"))
+        self.assertEqual(figures["burn_rate"], Decimal("20"))
+        self.assertEqual(figures["average_accomplished"], Decimal("50"))
+        self.assertEqual(figures["status_counts"]["Delayed"], 2)
+        self.assertEqual(figures["status_counts"]["Completed"], 1)
+        self.assertEqual(
+            [(row["key"], row["project_count"], row["average_accomplished"]) for row in figures["by_location"]],
+            [("Unspecified", 1, Decimal("10")), ("Cebu", 2, Decimal("70"))],
+        )
+
+    def test_empty_portfolio(self):
+        figures = dashboard_summary()
+        self.assertEqual(figures["project_count"], 0)
+        self.assertIsNone(figures["burn_rate"])
+        self.assertEqual(figures["by_location"], [])
+
+    def test_dashboard_renders_the_summary(self):
+        create_project("P1", location="Zamboanga", approved_contract=Decimal("1234567.00"))
+        rebuild_portfolio_summary()
+        response = self.client.get("/")
+        self.assertContains(response, "Zamboanga")
+        self.assertContains(response, "1,234,567")
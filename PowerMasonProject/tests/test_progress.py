@@ -0,0 +1,59 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+
+from ..importers import import_workbook
+from ..models import ProgressSnapshot, Project
+from ..progress import monthly_portfolio_progress, project_history
+from .utils import CacheIsolationMixin, workbook_bytes
+
+
+class ProgressHistoryTests(CacheIsolationMixin, TestCase):
+    def import_report(self, seed, proj_id, report_date, **cells):
+        data, _ = workbook_bytes(seed=seed, proj_id=proj_id, cells={"report_date": report_date, **cells})
+        return import_workbook(data)[0]
+
+    def setUp(self):
+        super().setUp()
+        self.project = self.import_report(1, "PM-A", date(2024, 1, 31))
+        self.import_report(2, "PM-A", date(2024, 2, 29))
+        self.import_report(3, "PM-B", date(2024, 2, 15))
+
+    def test_each_period_is_kept(self):
+        history = project_history(self.project)
+        self.assertEqual([row["report_date"] for row in history], [date(2024, 1, 31), date(2024, 2, 29)])
+        self.assertEqual(history[-1]["accomplished_to_date"], Project.objects.get(proj_id="PM-A").accomplished_to_date)
+
+        self.assertEqual(len(project_history(self.project, start=date(2024, 2, 1))), 1)
+        self.assertEqual(len(project_history(self.project, end=date(2024, 1, 31))), 1)
+
+    def test_reimporting_a_period_replaces_it(self):
+        self.import_report(4, "PM-A", date(2024, 2, 29))
+        project = Project.objects.get(proj_id="PM-A")
+        snapshot = ProgressSnapshot.objects.get(project=project, report_date=date(2024, 2, 29))
+        self.assertEqual(snapshot.total_expense, project.total_expense)
+        self.assertEqual(ProgressSnapshot.objects.filter(project=project).count(), 2)
+
+    def test_monthly_rollup(self):
+        months = monthly_portfolio_progress()
+        self.assertEqual([(row["month"], row["projects"]) for row in months],
+                         [(date(2024, 1, 1), 1), (date(2024, 2, 1), 2)])
+        february = ProgressSnapshot.objects.filter(report_date__month=2)
+        self.assertEqual(months[1]["total_expense"], sum(row.total_expense for row in february))
+        self.assertEqual(months[1]["last_report_date"], date(2024, 2, 29))
+
+        only_a = monthly_portfolio_progress(projects=Project.objects.filter(proj_id="PM-A"))
+        self.assertEqual([row["projects"] for row in only_a], [1, 1])
+
+    def test_json_endpoints(self):
+        response = self.client.get("/projects/PM-A/progress/", {"start": "2024-02-01"})
+        self.assertEqual(response.json()["proj_id"], "PM-A")
+        self.assertEqual([row["report_date"] for row in response.json()["snapshots"]], ["2024-02-29"])
+        self.assertEqual(self.client.get("/projects/PM-X/progress/").status_code, 404)
+
+        response = self.client.get("/reports/progress/", {"end": "2024-01-31"})
+        months = response.json()["months"]
+        self.assertEqual([row["month"] for row in months], ["2024-01-01"])
+        self.assertEqual(Decimal(months[0]["average_accomplished"]),
+                         ProgressSnapshot.objects.get(report_date=date(2024, 1, 31)).accomplished_to_date)
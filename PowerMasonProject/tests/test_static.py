@@ -0,0 +1,31 @@
+import re
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from .utils import CacheIsolationMixin
+
+MANIFEST_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
+ASSET_URL = re.compile(r'(?:src|href)="(/static/[^"]+)"')
+
+
+class ManifestStorageTests(CacheIsolationMixin, TestCase):
+    def test_missing_manifest_fails_loudly(self):
+        with tempfile.TemporaryDirectory() as static_root, \
+                override_settings(DEBUG=False, STATIC_ROOT=static_root, STORAGES=MANIFEST_STORAGES):
+            with self.assertRaisesMessage(ValueError, "Missing staticfiles manifest entry"):
+                self.client.get("/projects/")
+
+    def test_pages_link_the_hashed_names(self):
+        with tempfile.TemporaryDirectory() as static_root, \
+                override_settings(DEBUG=False, STATIC_ROOT=static_root, STORAGES=MANIFEST_STORAGES):
+            call_command("collectstatic", interactive=False, verbosity=0)
+            urls = ASSET_URL.findall(self.client.get("/projects/").content.decode())
+            self.assertTrue(urls)
+            for url in urls:
+                with self.subTest(url=url):
+                    self.assertRegex(url, r"\.[0-9a-f]{12}\.\w+$")
@@ -0,0 +1,62 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from ..models import PortfolioSummary, Project
+from ..portfolio import rebuild_portfolio_summary, summary_count
+from ..status import BUDGET_OVERRUN, COMPLETED, DELAYED, ON_TRACK, refresh_statuses
+from .utils import CacheIsolationMixin, create_project
+
+TODAY = date(2024, 6, 1)
+
+
+class StatusTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        soon = TODAY + timedelta(days=5)
+        self.projects = {
+            COMPLETED: create_project("done", accomplished_to_date=Decimal("100"), total_expense=Decimal("9"),
+                                      approved_contract=Decimal("1")),
+            BUDGET_OVERRUN: create_project("over", total_expense=Decimal("11"), approved_contract=Decimal("10"),
+                                           end_date=soon),
+            DELAYED: create_project("late", accomplished_to_date=Decimal("20"), end_date=soon),
+            ON_TRACK: create_project("fine", accomplished_to_date=Decimal("20"), end_date=TODAY + timedelta(days=60)),
+        }
+        create_project("open", accomplished_to_date=Decimal("20"))  # No end date
+
+    def test_rules_apply_in_order(self):
+        refresh_statuses(today=TODAY)
+
+        for status, project in self.projects.items():
+            project.refresh_from_db()
+            self.assertEqual(project.status, status, project.proj_id)
+        self.assertEqual(Project.objects.get(proj_id="open").status, ON_TRACK)
+        self.assertEqual(refresh_statuses(today=TODAY), {})
+
+    def test_only_changed_rows_are_written_and_summarized(self):
+        rebuild_portfolio_summary()
+        fine = self.projects[ON_TRACK]
+        before = Project.objects.get(pk=fine.pk).updated_at
+
+        with self.captureOnCommitCallbacks(execute=True):
+            changed = refresh_statuses(today=TODAY, batch_size=1)
+
+        self.assertEqual(set(changed), {self.projects[status].pk for status in (COMPLETED, BUDGET_OVERRUN, DELAYED)})
+        self.assertEqual(Project.objects.get(pk=fine.pk).updated_at, before)
+        self.assertEqual(summary_count(PortfolioSummary.STATUS, DELAYED), 1)
+        self.assertEqual(summary_count(PortfolioSummary.STATUS, ON_TRACK), 2)
+
+    def test_a_queryset_narrows_the_refresh(self):
+        changed = refresh_statuses(Project.objects.filter(proj_id="late"), today=TODAY)
+        self.assertEqual(list(changed.values()), [DELAYED])
+        self.assertEqual(Project.objects.get(proj_id="done").status, ON_TRACK)
+
+    def test_command(self):
+        output = StringIO()
+        call_command("refresh_project_statuses", "--date", TODAY.isoformat(), stdout=output)
+        self.assertIn("Updated the status of 3 projects.", output.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("refresh_project_statuses", "--date", "June 1st")
@@ -0,0 +1,54 @@
+from django.test import TestCase
+
+from ..importers import import_workbook
+from .utils import CacheIsolationMixin, workbook_bytes
+
+TAB_PATHS = ("/", "/projects/", "/costs/", "/estimation/", "/reports/")
+AJAX = {"X-Requested-With": "XMLHttpRequest"}
+
+
+class TabPageTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            import_workbook(workbook_bytes(seed=1)[0])
+
+    def test_partial_for_the_tab_loader(self):
+        for path in TAB_PATHS:
+            with self.subTest(path=path):
+                full = self.client.get(path)
+                partial = self.client.get(path, headers=AJAX)
+                self.assertContains(full, "<html")
+                self.assertNotContains(partial, "<html")
+                self.assertContains(full, 'id="content"')
+                self.assertNotContains(partial, 'id="content"')
+                self.assertLess(len(partial.content), len(full.content))
+                self.assertNotEqual(full["ETag"], partial["ETag"])
+
+        self.assertContains(self.client.get("/projects/", headers=AJAX), "js/import.js")
+
+    def test_matching_etag_gets_304(self):
+        for path in TAB_PATHS:
+            for headers in ({}, AJAX):
+                with self.subTest(path=path, ajax=bool(headers)):
+                    self.client.get(path)  # Sets the CSRF cookie, part of the fingerprint
+                    response = self.client.get(path, headers=headers)
+                    self.assertEqual(response.status_code, 200)
+
+                    cached = self.client.get(path, headers={**headers, "If-None-Match": response["ETag"]})
+                    self.assertEqual(cached.status_code, 304)
+                    self.assertEqual(cached.content, b"")
+
+                    cached = self.client.get(
+                        path, headers={**headers, "If-Modified-Since": response["Last-Modified"]},
+                    )
+                    self.assertEqual(cached.status_code, 304)
+
+    def test_responses_always_revalidate(self):
+        response = self.client.get("/projects/")
+        self.assertIn("X-Requested-With", response["Vary"])
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertIn("private", response["Cache-Control"])
+
+        response = self.client.get("/projects/", headers={"If-None-Match": '"stale"'})
+        self.assertEqual(response.status_code, 200)
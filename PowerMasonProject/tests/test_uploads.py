@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+
+from .. import uploads
+from ..importers import CREATED, UNCHANGED, parser_pool
+from ..models import Project
+from .utils import CacheIsolationMixin, workbook_bytes
+
+
+class AsyncUploadTests(CacheIsolationMixin, TestCase):
+    def post(self, data, client=None, **kwargs):
+        client = client or self.client
+        return client.post("/import_excel/async/", {"excel_file": SimpleUploadedFile("r.xlsx", data)}, **kwargs)
+
+    def test_declared_size_over_the_limit_is_refused_before_parsing(self):
+        data, _ = workbook_bytes()
+        with mock.patch("PowerMasonProject.uploads.import_limits", return_value={"max_bytes": 1024}), \
+                mock.patch("PowerMasonProject.uploads.BODY_OVERHEAD", 0), \
+                mock.patch("PowerMasonProject.uploads.WorkbookUploadHandler.new_file") as new_file:
+            response = self.post(data)
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json()["errors"][0]["code"], "too_large")
+        new_file.assert_not_called()
+
+    def test_file_over_the_limit_is_stopped_while_streaming(self):
+        data, _ = workbook_bytes()
+        with mock.patch("PowerMasonProject.uploads.import_limits", return_value={"max_bytes": 1024}):
+            response = self.post(data)
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Project.objects.exists())
+
+    def test_csrf_token_in_the_header_is_checked_before_the_body(self):
+        client = Client(enforce_csrf_checks=True)
+        data, _ = workbook_bytes()
+        with mock.patch("PowerMasonProject.uploads.WorkbookUploadHandler.new_file") as new_file:
+            response = self.post(data, client=client, headers={"X-CSRFToken": "x" * 32})
+        self.assertEqual(response.status_code, 403)
+        new_file.assert_not_called()
+
+        # Without any token the body is parsed, then refused
+        self.assertEqual(self.post(data, client=client).status_code, 403)
+        self.assertFalse(Project.objects.exists())
+
+    @override_settings(ASYNC_IMPORT_EXECUTOR="thread")
+    def test_imports_the_workbook(self):
+        data, header = workbook_bytes(seed=3)
+        response = self.post(data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()["proj_id"], response.json()["status"]), (header["proj_id"], CREATED))
+        self.assertTrue(Project.objects.filter(proj_id=header["proj_id"]).exists())
+
+        # From the import cache the second time
+        with mock.patch("PowerMasonProject.uploads._get_parse_executor") as executor:
+            self.assertEqual(self.post(data).json()["status"], UNCHANGED)
+        executor.assert_not_called()
+
+        response = self.post(b"not a workbook")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["errors"][0]["code"], "not_xlsx")
+        self.assertEqual(self.client.post("/import_excel/async/").status_code, 400)
+        self.assertEqual(self.client.get("/import_excel/async/").status_code, 405)
+
+    def test_parses_on_the_shared_process_pool(self):
+        self.assertIs(uploads._get_parse_executor(), parser_pool())
+        data, header = workbook_bytes(seed=4)
+        response = self.post(data)
+        self.assertEqual(response.json()["status"], CREATED)
+        self.assertEqual(Project.objects.get().proj_id, header["proj_id"])
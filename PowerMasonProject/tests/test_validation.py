@@ -0,0 +1,137 @@
+import io
+import zipfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ..ingest import validate_workbook
+from ..models import Project
+from ..validation import MIB, check_container, check_header
+from .utils import CacheIsolationMixin, workbook_bytes
+
+
+def zip_bytes(members, encrypted=False):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    data = bytearray(buffer.getvalue())
+    if encrypted:
+        # zipfile cannot encrypt; set the flag bit in each central directory entry
+        offset = data.find(b"PK\x01\x02")
+        while offset != -1:
+            data[offset + 8] |= 0x1
+            offset = data.find(b"PK\x01\x02", offset + 4)
+    return bytes(data)
+
+
+def codes(errors):
+    return [error["code"] for error in errors]
+
+
+class ContainerCheckTests(SimpleTestCase):
+    def check(self, data, **limits):
+        return check_container(io.BytesIO(data), len(data), limits)
+
+    def test_a_real_workbook_passes(self):
+        self.assertEqual(self.check(workbook_bytes()[0]), [])
+
+    def test_too_large(self):
+        self.assertEqual(codes(self.check(workbook_bytes()[0], max_bytes=1024)), ["too_large"])
+
+    def test_not_a_workbook(self):
+        self.assertEqual(codes(self.check(b"plain text")), ["not_xlsx"])
+        errors = self.check(zip_bytes({"notes.txt": b"hello"}))
+        self.assertEqual(codes(errors), ["not_xlsx"])
+        self.assertIn("xl/workbook.xml", errors[0]["message"])
+
+    def test_encrypted(self):
+        data = zip_bytes({"[Content_Types].xml": b"<x/>", "xl/workbook.xml": b"<x/>"}, encrypted=True)
+        self.assertEqual(codes(self.check(data)), ["encrypted"])
+
+    def test_zip_bomb(self):
+        data = zip_bytes({"[Content_Types].xml": b"<x/>", "xl/workbook.xml": b"<x/>",
+                          "xl/worksheets/sheet1.xml": bytes(16 * MIB)})
+        self.assertLess(len(data), MIB)
+        self.assertEqual(codes(self.check(data)), ["compression_ratio"])
+        self.assertEqual(codes(self.check(data, max_compression_ratio=10_000, max_uncompressed_bytes=8 * MIB)),
+                         ["too_large_uncompressed"])
+        # Small members are never refused for their ratio
+        small = zip_bytes({"[Content_Types].xml": b"<x/>", "xl/workbook.xml": bytes(MIB - 1)})
+        self.assertEqual(self.check(small), [])
+
+    def test_too_many_members(self):
+        members = {"[Content_Types].xml": b"<x/>", "xl/workbook.xml": b"<x/>"}
+        members.update({f"xl/media/{index}.bin": b"" for index in range(10)})
+        self.assertEqual(codes(self.check(zip_bytes(members), max_members=5)), ["too_many_members"])
+
+
+class HeaderCheckTests(SimpleTestCase):
+    CELLS = {"proj_id": "B1", "name": "B2", "location": "B3", "start_date": "B4", "report_date": "H1",
+             "approved_contract": "E117", "accomplished_before_period": "H3"}
+
+    def header(self, **values):
+        header = {"proj_id": "P1", "name": "Bridge", "location": "Cebu", "start_date": "2024-01-01",
+                  "report_date": "2024-06-30", "approved_contract": 100, "accomplished_before_period": "5"}
+        header.update(values)
+        return header
+
+    def test_every_problem_names_its_cell(self):
+        errors, warnings = check_header(self.header(name=None, location=None, start_date="someday"), self.CELLS)
+        self.assertEqual([(error["code"], error["cell"]) for error in errors],
+                         [("missing", "B2"), ("missing", "B3"), ("invalid_date", "B4")])
+        self.assertEqual(warnings, [])
+
+        errors, _ = check_header(self.header(start_date=42), self.CELLS)
+        self.assertEqual(codes(errors), ["invalid_date"])
+
+    def test_text_that_counts_as_zero_warns(self):
+        errors, warnings = check_header(self.header(approved_contract="=E115+E116", accomplished_before_period="n/a"),
+                                        self.CELLS)
+        self.assertEqual(errors, [])
+        self.assertEqual([(warning["code"], warning["cell"]) for warning in warnings],
+                         [("not_a_number", "E117"), ("not_a_number", "H3")])
+
+
+class ValidateEndpointTests(CacheIsolationMixin, TestCase):
+    def validate(self, data, name="report.xlsx"):
+        return self.client.post("/import_excel/validate/", {"excel_file": SimpleUploadedFile(name, data)}).json()
+
+    def test_valid_workbook(self):
+        data, header = workbook_bytes(seed=1)
+        report = self.validate(data)
+        self.assertEqual((report["valid"], report["layout"], report["proj_id"]),
+                         (True, "progress-report-v1", header["proj_id"]))
+        self.assertFalse(Project.objects.exists())
+
+    def test_header_errors_per_cell(self):
+        data, _ = workbook_bytes(seed=1, cells={"location": None, "start_date": "sometime soon",
+                                                "approved_contract": "TBD"})
+        report = validate_workbook(io.BytesIO(data))
+        self.assertEqual([(error["code"], error["cell"]) for error in report["errors"]],
+                         [("missing", "B3"), ("invalid_date", "B4")])
+
+        report = self.validate(data)
+        self.assertFalse(report["valid"])
+        self.assertEqual([error["cell"] for error in report["errors"]], ["B3", "B4"])
+
+        data, _ = workbook_bytes(seed=1, cells={"approved_contract": "TBD"})
+        report = self.validate(data)
+        self.assertTrue(report["valid"])
+        self.assertEqual([(warning["code"], warning["cell"]) for warning in report["warnings"]],
+                         [("not_a_number", "E117")])
+
+    def test_container_problems(self):
+        self.assertEqual(codes(self.validate(b"plain text")["errors"]), ["not_xlsx"])
+        with override_settings(IMPORT_LIMITS={"max_bytes": 1024}):
+            report = self.validate(workbook_bytes()[0])
+        self.assertEqual((report["valid"], codes(report["errors"])), (False, ["too_large"]))
+        self.assertEqual(self.client.post("/import_excel/validate/").status_code, 400)
+
+    @override_settings(IMPORT_WORKERS=1)
+    def test_bulk_zip_over_the_limits(self):
+        archive = zip_bytes({"one.xlsx": workbook_bytes(seed=1)[0], "bomb.xlsx": bytes(16 * MIB)})
+        response = self.client.post("/import_excel/bulk/", {"excel_files": [SimpleUploadedFile("reports.zip", archive)]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(codes(response.json()["errors"]), ["compression_ratio"])
+        self.assertFalse(Project.objects.exists())
@@ -0,0 +1,45 @@
+import io
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from openpyxl import load_workbook
+
+from ..benchmarks.workbooks import DIVISION_ROWS, build_progress_report, build_progress_reports
+from ..ingest import EXPENSE_FIRST_ROW, EXPENSE_LAST_ROW, HEADER_CELLS, read_project_report
+from .utils import workbook_bytes
+
+
+class SyntheticWorkbookTests(SimpleTestCase):
+    def test_import_reads_back_the_generated_header(self):
+        data, header = workbook_bytes(seed=5, proj_id="PM-GEN")
+        fields, warnings, items = read_project_report(io.BytesIO(data))
+
+        for name in ("proj_id", "name", "location", "start_date", "report_date", "progress_report_month_year"):
+            self.assertEqual(fields[name], header[name], name)
+        self.assertEqual(fields["approved_contract"], Decimal(str(header["approved_contract"])))
+        self.assertEqual(warnings, [])
+        # One heading row per division, the rest are line items
+        divisions = (EXPENSE_LAST_ROW - EXPENSE_FIRST_ROW + 1) // DIVISION_ROWS
+        self.assertEqual(len(items), divisions * (DIVISION_ROWS - 1))
+
+    def test_same_seed_same_report(self):
+        first, second = io.BytesIO(), io.BytesIO()
+        self.assertEqual(build_progress_report(first, seed=7), build_progress_report(second, seed=7))
+        self.assertEqual(read_project_report(first), read_project_report(second))
+
+    def test_extra_rows_grow_the_sheet_only(self):
+        small, large = io.BytesIO(), io.BytesIO()
+        build_progress_report(small, seed=2)
+        build_progress_report(large, seed=2, extra_rows=500)
+
+        sheet = load_workbook(large, read_only=True).active
+        contract_row = int(HEADER_CELLS["approved_contract"][1:])
+        self.assertEqual(sheet.max_row, contract_row + 500)
+        self.assertEqual(read_project_report(small), read_project_report(large))
+
+    def test_batches_have_distinct_project_ids(self):
+        reports = list(build_progress_reports(4, start=10))
+        self.assertEqual([name for name, _, _ in reports], [f"report-{seed:06d}.xlsx" for seed in range(10, 14)])
+        self.assertEqual(len({header["proj_id"] for _, _, header in reports}), 4)
+        for _, data, header in reports:
+            self.assertEqual(read_project_report(io.BytesIO(data))[0]["proj_id"], header["proj_id"])
@@ -0,0 +1,49 @@
+"""
+Helpers shared by the test modules.
+"""
+import io
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import caches
+from openpyxl import load_workbook
+
+from ..benchmarks.workbooks import build_progress_report
+from ..ingest import HEADER_CELLS
+from ..models import Project
+
+
+def workbook_bytes(seed=0, proj_id=None, cells=None):
+    """
+    A synthetic progress report (``benchmarks.workbooks``) and its header
+    values.  ``cells`` overwrites cells after generation, by header field
+    name or by address.
+    """
+    buffer = io.BytesIO()
+    header = build_progress_report(buffer, seed=seed, proj_id=proj_id)
+    if cells:
+        workbook = load_workbook(io.BytesIO(buffer.getvalue()))
+        sheet = workbook.active
+        for target, value in cells.items():
+            sheet[HEADER_CELLS.get(target, target)] = value
+            if target in header:
+                header[target] = value
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+    return buffer.getvalue(), header
+
+
+def create_project(proj_id, **fields):
+    fields.setdefault("name", f"Project {proj_id}")
+    fields.setdefault("start_date", date(2024, 1, 1))
+    return Project.objects.create(proj_id=proj_id, **fields)
+
+
+class CacheIsolationMixin:
+    """
+    The view cache outlives each test's rolled-back transaction; start empty.
+    """
+
+    def setUp(self):
+        super().setUp()
+        caches[settings.VIEW_CACHE_ALIAS].clear()
@@ -0,0 +1,115 @@
+"""
+Timing API: named spans, per-request profiles and percentile aggregates.
+
+``span("load")`` times a block (or decorates a function).  The time is added
+to the profile of the current request or job, if one is active, and always
+goes into the process-wide samples that ``summary()`` turns into
+percentiles.  Samples are kept per key in bounded reservoirs (the most
+recent ``SAMPLE_LIMIT``), so memory stays flat however long the server runs.
+
+Like ``ingest``, this module has no Django imports.  Spans recorded inside
+parser worker processes stay in those processes.
+"""
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+SAMPLE_LIMIT = 1000
+PERCENTILES = (50, 90, 99)
+
+_current = ContextVar("powermason_profile", default=None)
+_samples = defaultdict(lambda: deque(maxlen=SAMPLE_LIMIT))
+_samples_lock = threading.Lock()
+
+
+class Profile:
+    """
+    Wall time, SQL work and span times of one request or job.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.seconds = None
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.spans = defaultdict(float)
+
+
+def current_profile():
+    return _current.get()
+
+
+@contextmanager
+def profile(name):
+    """
+    Collect spans into a new ``Profile`` for the duration of the block and
+    record it under ``name`` (which the block may still change) at the end.
+    """
+    active = Profile(name)
+    token = _current.set(active)
+    try:
+        yield active
+    finally:
+        _current.reset(token)
+        active.seconds = time.perf_counter() - active.started
+        record(active.name, active.seconds, queries=active.queries, sql_seconds=active.sql_seconds)
+
+
+@contextmanager
+def span(name):
+    """
+    Time a named step such as "load", "extract", "compute" or "persist".
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        active = _current.get()
+        if active is not None:
+            active.spans[name] += elapsed
+        record(f"span:{name}", elapsed)
+
+
+def record(key, seconds, queries=None, sql_seconds=None):
+    with _samples_lock:
+        _samples[key].append((seconds, queries, sql_seconds))
+
+
+def percentile(sorted_values, point):
+    """
+    Nearest-rank percentile of an already sorted, non-empty list.
+    """
+    rank = max(int(round(point / 100 * len(sorted_values))), 1)
+    return sorted_values[rank - 1]
+
+
+def summary():
+    """
+    One dict per key: sample count, wall-time percentiles and mean / p90 SQL
+    figures (times in milliseconds), slowest p90 first.
+    """
+    with _samples_lock:
+        snapshot = {key: list(samples) for key, samples in _samples.items()}
+    rows = []
+    for key, samples in snapshot.items():
+        seconds = sorted(sample[0] for sample in samples)
+        row = {"key": key, "count": len(samples)}
+        for point in PERCENTILES:
+            row[f"p{point}_ms"] = percentile(seconds, point) * 1000
+        row["max_ms"] = seconds[-1] * 1000
+        queries = [sample[1] for sample in samples if sample[1] is not None]
+        if queries:
+            row["mean_queries"] = sum(queries) / len(queries)
+            sql = sorted(sample[2] for sample in samples if sample[1] is not None)
+            row["p90_sql_ms"] = percentile(sql, 90) * 1000
+        rows.append(row)
+    return sorted(rows, key=lambda row: row["p90_ms"], reverse=True)
+
+
+def reset():
+    with _samples_lock:
+        _samples.clear()
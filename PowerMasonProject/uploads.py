@@ -0,0 +1,197 @@
+"""
+Async upload path for progress reports, meant to be served over ASGI.
+
+Under ASGI, Django has already received the whole request body (spooled to
+a temporary file past ``FILE_UPLOAD_MAX_MEMORY_SIZE``) before the view runs.
+``import_excel/async/`` therefore does the cheap checks before parsing it: a
+``Content-Length`` over the size limit gets a 413 and a CSRF token sent in
+the ``X-CSRFToken`` header is verified, so a rejected request never has its
+workbook copied out of the body.  A token sent as a form field can only be
+checked once the body is parsed.
+
+The body is parsed through ``WorkbookUploadHandler``, which copies the
+workbook to a temporary file chunk by chunk, hashed as it goes (the import
+cache key needs no second read), and stops copying with a 413 once the file
+passes the limit.  The workbook is parsed from that path on the shared
+parser pool of spawned worker processes (``importers.parser_pool``), or on a
+thread pool with ``ASYNC_IMPORT_EXECUTOR = "thread"``, and the database work
+runs through ``sync_to_async``.  The event loop only waits, so one slow
+workbook never holds up other requests.
+"""
+import asyncio
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.http import JsonResponse, QueryDict
+from django.middleware.csrf import CsrfViewMiddleware
+from django.views.decorators.csrf import csrf_exempt
+
+from .importers import (
+    discard_parser_pool, import_limits, layout_digest, lookup_import_cache, normalize_fields, parser_pool,
+    remember_workbooks, save_project,
+)
+from .ingest import read_project_file
+from .validation import MIB, problem
+
+# Room for the multipart boundaries, part headers and form fields around the
+# workbook when comparing Content-Length with the size limit
+BODY_OVERHEAD = 64 * 1024
+
+_thread_executor = None
+
+
+def _too_large(max_bytes):
+    errors = [problem("too_large", f"The file is larger than the {max_bytes / MIB:.1f} MiB limit.")]
+    return JsonResponse({"error": errors[0]["message"], "errors": errors}, status=413)
+
+
+class WorkbookUploadHandler(FileUploadHandler):
+    """
+    Write each uploaded file straight to a temporary file, whatever its
+    size, and keep a SHA-256 of its bytes on ``file.content_sha256``.
+
+    Once a file outgrows ``max_bytes`` the upload is stopped, the rest of
+    the body is skipped and ``too_large`` is set.
+    """
+
+    def __init__(self, request=None, max_bytes=None):
+        super().__init__(request)
+        self.max_bytes = max_bytes
+        self.too_large = False
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.file = TemporaryUploadedFile(self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
+        self.content_sha256 = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.max_bytes is not None and start + len(raw_data) > self.max_bytes:
+            self.too_large = True
+            raise StopUpload(connection_reset=False)
+        self.file.write(raw_data)
+        self.content_sha256.update(raw_data)
+
+    def file_complete(self, file_size):
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.content_sha256 = self.content_sha256
+        return self.file
+
+    def upload_interrupted(self):
+        if hasattr(self, "file"):
+            path = self.file.temporary_file_path()
+            self.file.close()
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _get_parse_executor():
+    """
+    The executor parsing uploads: the process pool bulk imports share, or
+    one thread pool for the life of the process.
+    """
+    global _thread_executor
+    if getattr(settings, "ASYNC_IMPORT_EXECUTOR", "process") != "thread":
+        return parser_pool()
+    if _thread_executor is None:
+        workers = getattr(settings, "IMPORT_WORKERS", None) or os.cpu_count() or 1
+        _thread_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upload-parse")
+    return _thread_executor
+
+
+def _check_csrf(request):
+    return CsrfViewMiddleware(lambda request: None).process_view(request, None, (), {})
+
+
+def _receive_upload(request):
+    """
+    Check the declared size and the CSRF token, then parse the request body
+    through ``WorkbookUploadHandler``.  Returns ``(upload, rejection
+    response)``.
+    """
+    max_bytes = import_limits()["max_bytes"]
+    try:
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        length = 0
+    if max_bytes is not None and length > max_bytes + BODY_OVERHEAD:
+        return None, _too_large(max_bytes)
+
+    token_in_header = settings.CSRF_HEADER_NAME in request.META
+    if token_in_header:
+        # With an empty POST the check reads the header instead of parsing the body
+        request._post = QueryDict()
+        rejected = _check_csrf(request)
+        del request._post
+        if rejected is not None:
+            return None, rejected
+
+    handler = WorkbookUploadHandler(request, max_bytes=max_bytes)
+    request.upload_handlers = [handler]
+    files = request.FILES  # Parses the body through the handler
+    if not token_in_header:
+        rejected = _check_csrf(request)
+        if rejected is not None:
+            return None, rejected
+    if handler.too_large:
+        return None, _too_large(max_bytes)
+    return files.get("excel_file"), None
+
+
+def _store_and_save(digest, fields, warnings, items, user):
+    remember_workbooks({digest: (fields, warnings, items)})
+    return save_project(fields, user, items)
+
+
+@csrf_exempt  # Checked in _receive_upload, before the body is parsed when the token is in the header
+async def import_excel_async(request):
+    """
+    Import one workbook posted as ``excel_file`` and answer with JSON: the
+    ``proj_id``, whether the project was created, updated or unchanged, and
+    any warnings.  A workbook that cannot be read gets a 400 listing the
+    problems (see ``validation``), an oversized one a 413.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST a workbook as excel_file."}, status=405)
+
+    upload, rejected = await sync_to_async(_receive_upload)(request)
+    if rejected is not None:
+        return rejected
+    if upload is None:
+        return JsonResponse({"error": "No file was uploaded."}, status=400)
+
+    try:
+        user = await request.auser()
+        user = user if user.is_authenticated else None
+        digest = layout_digest(upload.content_sha256)
+        cached = await sync_to_async(lookup_import_cache)([digest])
+        if digest in cached:
+            fields, warnings, items = cached[digest]
+            project, outcome = await sync_to_async(save_project)(fields, user, items)
+        else:
+            loop = asyncio.get_running_loop()
+            read = partial(read_project_file, limits=import_limits())
+            executor = _get_parse_executor()
+            try:
+                result = await loop.run_in_executor(executor, read, upload.name, upload.temporary_file_path())
+            except BrokenProcessPool:
+                # A worker died (killed, out of memory); the next upload starts a new pool
+                discard_parser_pool(executor)
+                raise
+            if result["error"] is not None:
+                return JsonResponse({"file": upload.name, "error": result["error"], "errors": result["errors"]}, status=400)
+            fields, warnings = normalize_fields(result["fields"]), result["warnings"]
+            project, outcome = await sync_to_async(_store_and_save)(digest, fields, warnings, result["items"], user)
+    finally:
+        upload.close()
+
+    return JsonResponse({"file": upload.name, "proj_id": project.proj_id, "status": outcome, "warnings": warnings})
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.urls import path
-from . import views
+from . import api, uploads, views
 
 urlpatterns = [
     path('admin/', admin.site.urls),  # Admin interface URL
@@ -9,5 +9,18 @@ urlpatterns = [
     path('costs/', views.costs, name='costs'),
     path('estimation/', views.estimation, name='estimation'),
     path('reports/', views.reports, name='reports'),
+    path('reports/progress/', views.portfolio_progress, name='portfolio_progress'),
+    path('reports/performance/', views.performance_report, name='performance_report'),
+    path('reports/export/<str:report>/<str:fmt>/', views.report_export, name='report_export'),
+    path('projects/<str:proj_id>/progress/', views.project_progress, name='project_progress'),
     path('import_excel/', views.import_excel, name='import_excel'),
+    path('import_excel/bulk/', views.import_excel_bulk, name='import_excel_bulk'),
+    path('import_excel/async/', uploads.import_excel_async, name='import_excel_async'),
+    path('import_excel/validate/', views.import_excel_validate, name='import_excel_validate'),
+    path('import_jobs/<int:job_id>/', views.import_job_status, name='import_job_status'),
+    path('api/projects/', api.project_collection, name='api_projects'),
+    path('api/projects/export/', api.project_export, name='api_projects_export'),
+    path('api/costs/', api.cost_summary, name='api_costs'),
+    path('api/estimate/', api.project_estimate, name='api_estimate'),
+    path('api/cache/', api.cache_statistics, name='api_cache_statistics'),
 ]
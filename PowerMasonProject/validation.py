@@ -0,0 +1,170 @@
+"""
+Upload checks run before a workbook is handed to openpyxl.
+
+``check_container`` looks only at the file size and the zip directory of the
+.xlsx: it refuses files that are too large, that are not zip archives or not
+workbooks, that are encrypted, and archives whose members would expand past
+the limits (zip bombs).  The central directory is all that is read, so a bad
+upload is rejected in milliseconds.  Sizes declared there can be trusted:
+``zipfile`` never decompresses more than a member's declared size.
+
+``check_header`` validates the header cells streamed from the sheet (see
+``ingest.validate_workbook``) and names the cell at fault.
+
+Problems are reported as dicts ``{"code", "message", "cell"}`` and raised
+together as ``WorkbookRejected``.  Like ``ingest``, this module has no Django
+imports.
+"""
+import zipfile
+from decimal import Decimal, InvalidOperation
+
+from .dates import parse_date_string
+
+MIB = 1024 * 1024
+
+DEFAULT_LIMITS = {
+    # Size of the uploaded .xlsx file
+    "max_bytes": 20 * MIB,
+    # Total size of the archive members once decompressed
+    "max_uncompressed_bytes": 200 * MIB,
+    # Sheets compress about 10:1; a member expanding much further is a bomb
+    "max_compression_ratio": 100,
+    "max_members": 1000,
+}
+# Members smaller than this are never refused for their compression ratio
+RATIO_FLOOR_BYTES = MIB
+
+# Parts every .xlsx package has
+REQUIRED_PARTS = ("[Content_Types].xml", "xl/workbook.xml")
+
+REQUIRED_FIELDS = ("proj_id", "name", "location", "start_date", "report_date")
+# Header fields read with safe_decimal, where a formula silently counts as 0
+NUMERIC_HEADER_FIELDS = ("approved_contract", "accomplished_before_period")
+
+
+def problem(code, message, cell=None):
+    return {"code": code, "message": message, "cell": cell}
+
+
+def _label(field):
+    return field.replace("_", " ").capitalize()
+
+
+def _counts_as_zero(value):
+    """
+    Whether ``safe_decimal`` turns this text into 0 although it is not zero:
+    formulas (any of + - * /) and text that is not a number.
+    """
+    try:
+        Decimal(value)
+    except InvalidOperation:
+        return True
+    return any(character in value for character in "+-*/")
+
+
+class WorkbookRejected(ValueError):
+    """
+    The upload cannot be imported; ``errors`` lists every problem found.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(" ".join(error["message"] for error in errors))
+
+
+def merge_limits(limits=None):
+    return dict(DEFAULT_LIMITS, **(limits or {}))
+
+
+def check_size(size, limits=None):
+    """
+    Problems with an upload of ``size`` bytes (at most one).
+    """
+    max_bytes = merge_limits(limits)["max_bytes"]
+    if size > max_bytes:
+        return [problem("too_large", f"The file is {size / MIB:.1f} MiB; the limit is {max_bytes / MIB:.1f} MiB.")]
+    return []
+
+
+def check_archive(archive, limits=None):
+    """
+    Zip-bomb checks on an open ``ZipFile``: member count, total expanded size
+    and per-member compression ratio.
+    """
+    limits = merge_limits(limits)
+    members = archive.infolist()
+    if len(members) > limits["max_members"]:
+        return [problem("too_many_members", f"The archive holds {len(members)} files; the limit is {limits['max_members']}.")]
+
+    errors = []
+    expanded = sum(member.file_size for member in members)
+    if expanded > limits["max_uncompressed_bytes"]:
+        errors.append(problem(
+            "too_large_uncompressed",
+            f"The archive expands to {expanded / MIB:.1f} MiB; the limit is {limits['max_uncompressed_bytes'] / MIB:.1f} MiB.",
+        ))
+    for member in members:
+        if member.file_size < RATIO_FLOOR_BYTES:
+            continue
+        ratio = member.file_size / max(member.compress_size, 1)
+        if ratio > limits["max_compression_ratio"]:
+            errors.append(problem(
+                "compression_ratio",
+                f"{member.filename} expands {ratio:.0f} times; the limit is {limits['max_compression_ratio']}.",
+            ))
+            break
+    return errors
+
+
+def check_container(source, size, limits=None):
+    """
+    Problems with the .xlsx package ``source`` (a path or binary file object
+    of ``size`` bytes), found without decompressing anything.
+    """
+    errors = check_size(size, limits)
+    if errors:
+        return errors
+    try:
+        archive = zipfile.ZipFile(source)
+    except zipfile.BadZipFile:
+        return [problem("not_xlsx", "The file is not an .xlsx workbook (not a zip archive).")]
+    with archive:
+        names = set(archive.namelist())
+        missing = [part for part in REQUIRED_PARTS if part not in names]
+        if missing:
+            return [problem("not_xlsx", f"The file is not an .xlsx workbook ({', '.join(missing)} missing).")]
+        if any(member.flag_bits & 0x1 for member in archive.infolist()):
+            return [problem("encrypted", "The workbook is password protected.")]
+        return check_archive(archive, limits)
+
+
+def check_header(header, cells):
+    """
+    Validate the raw header values read with a layout whose field -> cell
+    map is ``cells``.  Returns ``(errors, warnings)``; the errors are the
+    ones ``ingest.build_project_fields`` would fail on, reported per cell.
+    """
+    errors = []
+    for field in REQUIRED_FIELDS:
+        if header[field] is None:
+            errors.append(problem("missing", f"{_label(field)} ({cells[field]}) is empty.", cells[field]))
+
+    start = header["start_date"]
+    if isinstance(start, str):
+        try:
+            parse_date_string(start.strip())
+        except ValueError as e:
+            errors.append(problem("invalid_date", f"Start date ({cells['start_date']}): {e}", cells["start_date"]))
+    elif start is not None and not hasattr(start, "year"):
+        errors.append(problem("invalid_date", f"Start date ({cells['start_date']}) is not a date.", cells["start_date"]))
+
+    warnings = []
+    for field in NUMERIC_HEADER_FIELDS:
+        value = header[field]
+        if isinstance(value, str) and _counts_as_zero(value):
+            warnings.append(problem(
+                "not_a_number",
+                f"{_label(field)} ({cells[field]}) holds {value!r}, which counts as 0.",
+                cells[field],
+            ))
+    return errors, warnings
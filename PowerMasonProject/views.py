@@ -1,221 +1,202 @@
-from django.shortcuts import render, redirect
-from django.http import HttpResponse
-from openpyxl import load_workbook
-from .models import Project  # Assuming you have a Project model
-from decimal import Decimal, ROUND_HALF_UP
-from datetime import datetime, date
-from django.contrib.auth.models import User  # Import User model
+import logging
+import zipfile
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.shortcuts import render, redirect, get_object_or_404
+from django.http import Http404, HttpResponse, JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import require_POST
+from .models import ImportJob, Project  # Assuming you have a Project model
+from .ingest import validate_workbook
+from .importers import (
+    CREATED, UNCHANGED, bulk_save_projects, check_upload, collect_workbook_files, enqueue_import_job,
+    import_limits, import_workbook, parse_workbooks_cached, summarize_results,
+)
 from django.contrib import messages  # Import the messages framework
+from django.contrib.admin.views.decorators import staff_member_required
 from django.db import transaction  # Import transaction
-from django.db import IntegrityError  # Import IntegrityError
 from django.template.exceptions import TemplateDoesNotExist # Import this
-
-
+from .caching import PROJECTS, cached, cached_fragment
+from .costs import cost_overview, cost_state
+from .estimation import budget_param, estimate, estimate_locations, estimator_state
+from .exports import EXPORT_FORMATS, REPORT_COLUMNS, export_response
+from .filters import date_param, filter_projects
+from .pagination import DEFAULT_PAGE_SIZE, keyset_page
+from .portfolio import dashboard_summary, portfolio_state
+from .progress import monthly_portfolio_progress, project_history
+from .tabs import project_state, render_tab, tab_page
+from .timing import SAMPLE_LIMIT, summary as timing_summary
+from .validation import WorkbookRejected
+
+logger = logging.getLogger("powermason.imports")
+
+# Columns the project table shows; everything else stays out of the query
+PROJECT_LIST_COLUMNS = (
+    "name", "status", "location", "start_date", "end_date", "report_date",
+    "approved_contract", "total_expense", "accomplished_to_date",
+)
+PROJECT_LIST_SORTS = ("start_date", "report_date")
+PROJECT_LIST_DEFAULT_SORT = "-start_date"
+
+
+@tab_page('dashboard.html', state=portfolio_state)
 def dashboard(request):
-    return render(request, 'dashboard.html', {'active_tab': 'dashboard'})
+    summary = cached_fragment(PROJECTS, 'dashboard_summary.html', lambda: {'portfolio': dashboard_summary()})
+    return render_tab(request, 'dashboard.html', {'portfolio_summary': summary, 'active_tab': 'dashboard'})
 
 
+@tab_page('projects.html', state=project_state)
 def projects(request):
-    projects = Project.objects.all()
-    return render(request, 'projects.html', {'projects': projects, 'active_tab': 'projects'})
+    context = _project_list_context(request)
+    context['active_tab'] = 'projects'
+    return render_tab(request, 'projects.html', context)
 
 
+@tab_page('costs.html', state=cost_state)
 def costs(request):
-    return render(request, 'costs.html', {'active_tab': 'costs'})
+    summary = cached_fragment(PROJECTS, 'cost_summary.html', lambda: {'costs': cost_overview()})
+    return render_tab(request, 'costs.html', {'cost_summary': summary, 'active_tab': 'costs'})
 
 
+@tab_page('estimation.html', state=estimator_state)
 def estimation(request):
-    return render(request, 'estimation.html', {'active_tab': 'estimation'})
-
-
+    context = {'locations': estimate_locations(), 'active_tab': 'estimation'}
+    if 'budget' in request.GET:
+        budget = budget_param(request.GET)
+        location = request.GET.get('location') or None
+        context.update(budget=budget, location=location, budget_input=request.GET['budget'])
+        if budget is None:
+            context['estimate_error'] = "Enter the approved contract as a positive amount."
+        else:
+            context['estimate'] = estimate(budget, location)
+    return render_tab(request, 'estimation.html', context)
+
+
+@tab_page('reports.html', state=project_state)
 def reports(request):
-    return render(request, 'reports.html', {'active_tab': 'reports'})
+    return render_tab(request, 'reports.html', {
+        'status_choices': Project.STATUS_CHOICES,
+        'locations': _project_locations(),
+        'active_tab': 'reports',
+    })
 
 
+@tab_page('projects.html', state=project_state)
 def project_list(request):
-    projects = Project.objects.all()  # Get all projects
-    return render(request, 'projects.html', {'projects': projects})
+    return render_tab(request, 'projects.html', _project_list_context(request))
 
 
-def normalize_date_string(date_string):
+def _project_locations():
     """
-    Replace uncommon month abbreviations with standard ones.
+    Distinct non-empty project locations, for the filter drop-downs.
     """
-    replacements = {
-        "SEPT": "SEP",
-        "Sept": "SEP",  # Handle different cases
-    }
-    for old, new in replacements.items():
-        date_string = date_string.replace(old, new)
-    return date_string
+    return cached(PROJECTS, "locations", lambda: list(
+        Project.objects.exclude(location__isnull=True).exclude(location="")
+        .order_by("location").values_list("location", flat=True).distinct()
+    ))
 
 
-def parse_date_string(date_str):
-    """
-    Helper function to parse date strings with flexible formats.
+def _project_list_context(request):
     """
-    formats = [
-        "%Y-%m-%d",
-        "%m/%d/%Y",
-        "%d-%m-%Y",
-        "%d/%m/%Y",
-        "%Y/%m/%d",
-        "%m-%d-%Y",
-        "%B %d, %Y",  # e.g., "July 24, 2023"
-        "%b %d, %Y",  # e.g., "Jul 24, 2023"
-        "%d %B %Y",  # e.g., 24 July 2023
-        "%d %b %Y",  # e.g., 24 Jul 2023
-        "%Y-%m-%d %H:%M:%S",  # Include time
-        "%m/%d/%Y %H:%M:%S",
-        "%d-%m-%Y %H:%M:%S",
-        "%d/%m/%Y %H:%M:%S",
-        "%Y/%m/%d %H:%M:%S",
-        "%m-%d-%Y %H:%M:%S",
-        "%B %d, %Y",
-        "%b %d, %Y",
-    ]
-    date_str = normalize_date_string(date_str)  # Normalize the date string before parsing
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str, fmt).date()  # Changed to datetime.strptime
-        except ValueError:
-            continue  # Try the next format
-    raise ValueError(f"Date string '{date_str}' does not match any expected format.  Input was: '{date_str}'")
+    One keyset page of the filtered, sorted project list plus the query
+    strings for the pager and the sortable column headers.
 
-
-def safe_decimal(value):
-    """
-    Helper function to safely convert values to Decimal.
-    Handles None, int, float, and existing Decimal values.
+    The table and pager are rendered once per filter/sort/page combination
+    and then served from the cache until a project changes.
     """
-    if value is None:
-        return Decimal('0.00')
-    if isinstance(value, (int, float)):
-        return Decimal(str(value))  # Convert through string for precision
-    if isinstance(value, Decimal):
-        return value
+    params = request.GET
+    queryset, filters = filter_projects(Project.objects.only(*PROJECT_LIST_COLUMNS), params)
+
+    sort = params.get("sort", PROJECT_LIST_DEFAULT_SORT)
+    if sort.lstrip("-") not in PROJECT_LIST_SORTS:
+        sort = PROJECT_LIST_DEFAULT_SORT
     try:
-        # Check if the value is a string and looks like a formula
-        if isinstance(value, str) and ('+' in value or '-' in value or '*' in value or '/' in value):
-            raise ValueError("Invalid value: Excel formula detected")
-        return Decimal(str(value))
-    except (TypeError, ValueError):
-        return Decimal('0.00')  # Return 0.00 for unconvertible values
-    except Exception as e:  # Catch other exceptions
-        print(f"safe_decimal: Unexpected error converting value: {value}. Error: {e}, Value: {value}")
-        return Decimal('0.00')
+        per_page = int(params.get("per_page", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        per_page = DEFAULT_PAGE_SIZE
+    after, before = params.get("after"), params.get("before")
+
+    def table_context():
+        page = keyset_page(
+            queryset, sort.lstrip("-"), descending=sort.startswith("-"),
+            after=after, before=before, per_page=per_page,
+        )
+
+        # Links keep the filters and sort; changing either starts from page one
+        base = dict(filters, sort=sort)
+        if per_page != DEFAULT_PAGE_SIZE:
+            base["per_page"] = per_page
+        sort_queries = {
+            field: urlencode(dict(base, sort=field if sort == f"-{field}" else f"-{field}"))
+            for field in PROJECT_LIST_SORTS
+        }
+        return {
+            'projects': page['items'],
+            'sort': sort,
+            'sort_queries': sort_queries,
+            'next_query': urlencode(dict(base, after=page['next_cursor'])) if page['next_cursor'] else None,
+            'previous_query': urlencode(dict(base, before=page['previous_cursor'])) if page['previous_cursor'] else None,
+        }
+
+    table = cached_fragment(
+        PROJECTS, 'project_table.html', table_context,
+        params=dict(filters, sort=sort, per_page=per_page, after=after, before=before),
+    )
+    return {
+        'project_table': table,
+        'filters': filters,
+        'sort': sort,
+        'status_choices': Project.STATUS_CHOICES,
+        'locations': _project_locations(),
+    }
 
 
 @transaction.atomic  # Wrap the entire process in a transaction
 def import_excel(request):
     if request.method == "POST" and request.FILES.get("excel_file"):
         excel_file = request.FILES["excel_file"]
+        is_ajax = request.headers.get("X-Requested-With") == "XMLHttpRequest"
 
+        # Oversized files are refused before they are read or queued
         try:
-            workbook = load_workbook(excel_file)
-            sheet = workbook.active
-
-            # Extract values from the Excel sheet
-            proj_id = sheet["B1"].value
-            name = sheet["B2"].value
-            location = sheet["B3"].value
-            start_date_raw = sheet["B4"].value
-            report_date_raw = sheet["H1"].value
-            accomplished_to_date = safe_decimal(sheet["H2"].value)
-            accomplished_before_period = safe_decimal(sheet["H3"].value)
-            approved_contract = safe_decimal(sheet["E117"].value)
-
-            # Get the progress report month and year from A6
-            progress_report_month_year = sheet["A6"].value
-
-            # Initialize total_expense here
-            total_expense = Decimal('0.00')
-
-            # Loop through the rows from 10 to 113 to calculate total expense
-            for row in range(10, 114):  # Rows 10 to 113
-                try:
-                    # Get values for the formula F(row) / C(row) * E(row)
-                    f_value = sheet[f"F{row}"].value
-                    c_value = sheet[f"C{row}"].value
-                    e_value = sheet[f"E{row}"].value
-
-                    if f_value is not None and c_value is not None and e_value is not None:
-                        # Safely convert the values to Decimal
-                        f_value = safe_decimal(f_value)
-                        c_value = safe_decimal(c_value)
-                        e_value = safe_decimal(e_value)
-
-                        if c_value != Decimal('0.00'):  # Avoid division by zero
-                            total_expense += (f_value / c_value) * e_value
-                except Exception as e:
-                    print(f"Error calculating expense for row {row}: {e}")  # Log row errors
-                    messages.error(request, f"Error calculating expense for row {row}.  Skipping row.")
-                    # Don't pass, handle the error.
-                    continue
-
-            # Round off the total expense to 2 decimal places for saving in the model
-            total_expense = total_expense.quantize(Decimal('0.00'), rounding=ROUND_HALF_UP)
-
-            # Validate required fields (including raw start date)
-            if any(val is None for val in [proj_id, name, location, start_date_raw, report_date_raw]):
-                error_message = "One or more required fields are missing."
-                messages.error(request, error_message)
-                raise ValueError(error_message)
-
-            # Parse and validate start date
-            start_date = None
-            if isinstance(start_date_raw, str):
-                start_date_raw = start_date_raw.strip()
-                try:
-                    start_date = parse_date_string(start_date_raw)
-                except ValueError as e:
-                    error_message = f"Invalid start date format: {e}"
-                    messages.error(request, error_message)
-                    raise ValueError(error_message)
-            elif isinstance(start_date_raw, datetime):
-                start_date = start_date_raw.date()
-            elif isinstance(start_date_raw, date):
-                start_date = start_date_raw
-            else:
-                error_message = "Unexpected type for start date."
-                messages.error(request, error_message)
-                raise ValueError(error_message)
-
-            if start_date is None:
-                error_message = "Failed to obtain a valid start date."
-                messages.error(request, error_message)
-                raise ValueError(error_message)
-
-            # Parse report date
-            report_date = None
-            if report_date_raw:
-                if isinstance(report_date_raw, str):
-                    report_date_raw = report_date_raw.strip()
-                    try:
-                        report_date = parse_date_string(report_date_raw)
-                    except ValueError as e:
-                        error_message = f"Invalid report date format: {e}"
-                        messages.error(request, error_message)
-                        report_date = None  # important: set it to None, so the program does not crash.
-                elif isinstance(report_date_raw, datetime):
-                    report_date = report_date_raw.date()
-                elif isinstance(report_date_raw, date):
-                    report_date = report_date_raw
-
-            # Calculate accomplished this period
-            accomplished_this_period = total_expense / approved_contract * 100 if approved_contract else Decimal('0.00')
-            accomplished_to_date = accomplished_this_period + accomplished_before_period
+            check_upload(excel_file)
+        except WorkbookRejected as e:
+            if is_ajax:
+                return JsonResponse({"error": str(e), "errors": e.errors}, status=413)
+            for error in e.errors:
+                messages.error(request, error["message"])
+            return import_excel_form(request)
+
+        # AJAX uploads are queued and processed in the background; the page
+        # polls import_job_status for progress
+        if is_ajax:
+            user = request.user if request.user.is_authenticated else None
+            job = enqueue_import_job(excel_file, user)
+            return JsonResponse(
+                {"job_id": job.pk, "status_url": reverse("import_job_status", args=[job.pk])},
+                status=202,
+            )
 
+        try:
             # Get the current user (assuming user is logged in)
             user = request.user if request.user.is_authenticated else None
 
-            # Call a function to handle the database operations
-            return _process_project_data(request, proj_id, name, location, start_date, report_date, progress_report_month_year, accomplished_to_date, accomplished_before_period, accomplished_this_period, approved_contract, total_expense, user)
+            # Identical re-uploads come from the import cache without re-parsing
+            project, outcome, warnings = import_workbook(excel_file.read(), user)
+            for warning in warnings:
+                messages.warning(request, warning)
+
+            return _report_import_outcome(request, outcome)
 
+        except WorkbookRejected as e:
+            for error in e.errors:
+                messages.error(request, error["message"])
+            return import_excel_form(request)
         except Exception as e:
             error_message = f"Error processing Excel file: {e}"
             messages.error(request, error_message)  # Use messages framework
-            print(error_message)
+            logger.exception("Import of %s failed", excel_file.name)
             try:
                 return render(request, 'import_excel.html', {'form': None, 'active_tab': 'import_excel'})  # Removed ExcelUploadForm()
             except TemplateDoesNotExist:
@@ -228,6 +209,111 @@ def import_excel(request):
 
 
 
+def import_job_status(request, job_id):
+    """
+    JSON progress of a background import job.
+    """
+    job = get_object_or_404(ImportJob, pk=job_id)
+    return JsonResponse({
+        "job_id": job.pk,
+        "file": job.original_name,
+        "status": job.status,
+        "progress": job.progress,
+        "warnings": job.warnings,
+        "error": job.error,
+        "project_id": job.project_id,
+    })
+
+
+def _date_range(request):
+    """
+    ``start`` / ``end`` query parameters (YYYY-MM-DD) as dates, or None.
+    """
+    return date_param(request.GET, "start"), date_param(request.GET, "end")
+
+
+def project_progress(request, proj_id):
+    """
+    JSON progress history (S-curve points) of one project.
+    """
+    project = get_object_or_404(Project.objects.only("id", "proj_id", "name"), proj_id=proj_id)
+    start, end = _date_range(request)
+    return JsonResponse({
+        "proj_id": project.proj_id,
+        "name": project.name,
+        "snapshots": project_history(project, start, end),
+    })
+
+
+def portfolio_progress(request):
+    """
+    JSON monthly rollup of portfolio progress.
+    """
+    start, end = _date_range(request)
+    return JsonResponse({"months": monthly_portfolio_progress(start, end)})
+
+
+def report_export(request, report, fmt):
+    """
+    Download a report ("projects" or "progress") as CSV or .xlsx.
+    """
+    if report not in REPORT_COLUMNS or fmt not in EXPORT_FORMATS:
+        raise Http404("Unknown report or format.")
+    return export_response(report, fmt, request.GET)
+
+
+@staff_member_required
+def performance_report(request):
+    """
+    Latency percentiles per URL route, import job and pipeline span, as
+    recorded by this server process.
+    """
+    return render(request, 'performance.html', {
+        'rows': timing_summary(),
+        'sample_limit': SAMPLE_LIMIT,
+        'slow_request_ms': settings.SLOW_REQUEST_MS,
+    })
+
+
+@require_POST
+def import_excel_bulk(request):
+    """
+    Import many progress reports at once: several .xlsx files and/or .zip
+    archives of them.  Workbooks are parsed in parallel and all projects are
+    upserted together; responds with a per-file JSON summary.
+    """
+    uploads = request.FILES.getlist("excel_files")
+    if not uploads:
+        return JsonResponse({"error": "No files were uploaded."}, status=400)
+
+    try:
+        files = collect_workbook_files(uploads)
+    except zipfile.BadZipFile as e:
+        return JsonResponse({"error": f"Invalid zip archive: {e}"}, status=400)
+    except WorkbookRejected as e:
+        return JsonResponse({"error": str(e), "errors": e.errors}, status=400)
+
+    user = request.user if request.user.is_authenticated else None
+    results = bulk_save_projects(parse_workbooks_cached(files), user=user)
+    return JsonResponse(summarize_results(results))
+
+
+@require_POST
+def import_excel_validate(request):
+    """
+    Check the workbook posted as ``excel_file`` without importing it and
+    return the validation report (see ``ingest.validate_workbook``).
+    """
+    excel_file = request.FILES.get("excel_file")
+    if excel_file is None:
+        return JsonResponse({"error": "No file was uploaded."}, status=400)
+    try:
+        check_upload(excel_file)
+    except WorkbookRejected as e:
+        return JsonResponse({"valid": False, "layout": None, "proj_id": None, "errors": e.errors, "warnings": []})
+    return JsonResponse(validate_workbook(excel_file, import_limits()))
+
+
 def import_excel_form(request):
     try:
         return render(request, 'import_excel.html', {'form': None, 'active_tab': 'import_excel'})  # Removed ExcelUploadForm()
@@ -236,42 +322,15 @@ def import_excel_form(request):
 
 
 
-def _process_project_data(request, proj_id, name, location, start_date, report_date, progress_report_month_year, accomplished_to_date, accomplished_before_period, accomplished_this_period, approved_contract, total_expense, user):
+def _report_import_outcome(request, outcome):
     """
-    Handles the creation or update of a Project record.
+    Tell the user what an import did to the Project record.
     This function is called from within the import_excel view.
     """
-    try:
-        project = Project.objects.create(
-            proj_id=proj_id,
-            name=name,
-            location=location,
-            start_date=start_date,
-            report_date=report_date,
-            progress_report_month_year=progress_report_month_year,
-            accomplished_to_date=accomplished_to_date,
-            accomplished_before_period=accomplished_before_period,
-            accomplished_this_period=accomplished_this_period,
-            approved_contract=approved_contract,
-            total_expense=total_expense,
-            created_by=user if user else None
-        )
+    if outcome == CREATED:
         messages.success(request, "Project data imported successfully.")
-        return redirect("projects")
-    except IntegrityError:
-        # Handle the case where proj_id already exists.
-        Project.objects.filter(proj_id=proj_id).update(
-            name=name,
-            location=location,
-            start_date=start_date,
-            report_date=report_date,
-            progress_report_month_year=progress_report_month_year,
-            accomplished_to_date=accomplished_to_date,
-            accomplished_before_period=accomplished_before_period,
-            accomplished_this_period=accomplished_this_period,
-            approved_contract=approved_contract,
-            total_expense=total_expense,
-            created_by=user if user else None
-        )
+    elif outcome == UNCHANGED:
+        messages.info(request, "This report was already imported.  Nothing changed.")
+    else:
         messages.warning(request, "Project with this ID already exists.  Updated the existing project.")
-        return redirect("projects")
+    return redirect("projects")
@@ -3,6 +3,11 @@ ASGI config for powermason_django project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve it with uvicorn workers so the async upload endpoint
+(``import_excel/async/``) runs on an event loop:
+
+    gunicorn powermason_django.asgi:application -k uvicorn.workers.UvicornWorker
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -0,0 +1,108 @@
+"""
+Database settings selected through environment variables.
+
+``DB_ENGINE=sqlite`` (the default) keeps the single-file database but tunes
+every connection for concurrent imports: a busy timeout instead of immediate
+"database is locked" errors, a memory-mapped read path, and ``BEGIN
+IMMEDIATE`` transactions so two writers cannot deadlock upgrading read locks.
+
+WAL journaling (readers never block the writer) is only switched on with
+``SQLITE_JOURNAL_MODE=WAL``: the journal mode is stored in the database file
+itself, so setting it on every connection would rewrite a checked-in
+``db.sqlite3`` the first time the project is run.  With WAL,
+``synchronous`` defaults to ``NORMAL`` (safe in that mode); otherwise
+SQLite's own ``FULL`` is kept.
+
+``DB_ENGINE=postgres`` uses PostgreSQL with persistent, health-checked
+connections, or a psycopg connection pool with ``DB_POOL=1``.
+
+SQLite variables: DB_NAME, SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS,
+SQLITE_BUSY_TIMEOUT_MS, SQLITE_MMAP_SIZE, SQLITE_TRANSACTION_MODE.
+PostgreSQL variables: DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT,
+DB_CONN_MAX_AGE, DB_POOL, DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_SSLMODE.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+SQLITE_DEFAULTS = {
+    # Empty: leave the file's own journal mode and SQLite's synchronous level
+    "SQLITE_JOURNAL_MODE": "",
+    "SQLITE_SYNCHRONOUS": "",
+    "SQLITE_BUSY_TIMEOUT_MS": "5000",
+    "SQLITE_MMAP_SIZE": str(128 * 1024 * 1024),
+    "SQLITE_TRANSACTION_MODE": "IMMEDIATE",
+}
+
+
+def _flag(value):
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+def sqlite_config(env, base_dir):
+    setting = {name: env.get(name, default) for name, default in SQLITE_DEFAULTS.items()}
+    busy_timeout_ms = int(setting["SQLITE_BUSY_TIMEOUT_MS"])
+    journal_mode = setting["SQLITE_JOURNAL_MODE"].strip()
+    synchronous = setting["SQLITE_SYNCHRONOUS"].strip()
+    if not synchronous and journal_mode.upper() == "WAL":
+        synchronous = "NORMAL"
+    pragmas = []
+    if journal_mode:
+        pragmas.append(f"PRAGMA journal_mode={journal_mode}")
+    if synchronous:
+        pragmas.append(f"PRAGMA synchronous={synchronous}")
+    pragmas += [
+        f"PRAGMA busy_timeout={busy_timeout_ms}",
+        f"PRAGMA mmap_size={int(setting['SQLITE_MMAP_SIZE'])}",
+    ]
+    options = {
+        "init_command": ";".join(pragmas),
+        # sqlite3.connect's own busy handler; keep it in step with the pragma
+        "timeout": busy_timeout_ms / 1000,
+    }
+    if setting["SQLITE_TRANSACTION_MODE"]:
+        options["transaction_mode"] = setting["SQLITE_TRANSACTION_MODE"]
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": env.get("DB_NAME") or os.path.join(base_dir, "db.sqlite3"),
+        "OPTIONS": options,
+    }
+
+
+def postgres_config(env):
+    options = {}
+    if env.get("DB_SSLMODE"):
+        options["sslmode"] = env["DB_SSLMODE"]
+    config = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": env.get("DB_NAME", "powermason"),
+        "USER": env.get("DB_USER", ""),
+        "PASSWORD": env.get("DB_PASSWORD", ""),
+        "HOST": env.get("DB_HOST", ""),
+        "PORT": env.get("DB_PORT", ""),
+        "OPTIONS": options,
+    }
+    if _flag(env.get("DB_POOL", "")):
+        # Django's pool hands out connections itself; it refuses CONN_MAX_AGE
+        options["pool"] = {
+            "min_size": int(env.get("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(env.get("DB_POOL_MAX_SIZE", "10")),
+        }
+        config["CONN_MAX_AGE"] = 0
+    else:
+        config["CONN_MAX_AGE"] = int(env.get("DB_CONN_MAX_AGE", "600"))
+        config["CONN_HEALTH_CHECKS"] = True
+    return config
+
+
+def database_config(base_dir, env=None):
+    """
+    The ``DATABASES['default']`` entry for the environment.
+    """
+    env = os.environ if env is None else env
+    engine = env.get("DB_ENGINE", "sqlite").strip().lower()
+    if engine in ("sqlite", "sqlite3"):
+        return sqlite_config(env, base_dir)
+    if engine in ("postgres", "postgresql"):
+        return postgres_config(env)
+    raise ImproperlyConfigured(f"Unsupported DB_ENGINE '{engine}'; use 'sqlite' or 'postgres'.")
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from .database import database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -43,14 +46,17 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Right after security: static files are answered before sessions, CSRF
+    # or auth run.  Made async capable so ASGI requests are not serialized
+    'powermason_django.middleware.AsyncWhiteNoiseMiddleware',
+    # Ahead of the rest, so its timings cover the rest of the stack
+    'PowerMasonProject.instrumentation.InstrumentationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
 ]
 
 ROOT_URLCONF = 'powermason_django.urls'
@@ -75,12 +81,10 @@ WSGI_APPLICATION = 'powermason_django.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# Selected with DB_ENGINE (sqlite or postgres); see powermason_django/database.py
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(BASE_DIR),
 }
 
 
@@ -119,15 +123,110 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = '/static/'
-import os
-
-STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')  # Required for collectstatic
-STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]  # Optional, if you have a 'static' folder
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
-
+# collectstatic gathers the apps' static directories (PowerMasonProject/static)
+# here; there is no project-level static directory
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+
+# collectstatic writes every asset under a content-hashed name plus gzip and,
+# with the Brotli package installed, Brotli copies.  WhiteNoise serves the
+# hashed names with a ten-year "immutable" Cache-Control and picks the
+# precompressed copy the browser accepts; {% static %} emits the hashed
+# names when DEBUG is off.
+# Deploying with DEBUG off requires `python manage.py collectstatic` first:
+# without its manifest {% static %} raises rather than link an unhashed name.
+# The test run uses plain storage instead (see test_settings.py).
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
 
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Excel import
+# Number of worker processes used to parse workbooks in bulk imports
+# (defaults to the number of CPUs when unset or 0).
+
+IMPORT_WORKERS = int(os.environ.get('IMPORT_WORKERS', '0')) or None
+
+# Threads that process background import jobs inside the web process.  Set to
+# 0 to leave queued jobs to `manage.py process_import_jobs` instead.
+
+IMPORT_JOB_THREADS = int(os.environ.get('IMPORT_JOB_THREADS', '2'))
+
+# Executor that parses workbooks posted to the async upload endpoint:
+# "process" (the spawned parser processes bulk imports use too) or "thread"
+
+ASYNC_IMPORT_EXECUTOR = os.environ.get('ASYNC_IMPORT_EXECUTOR', 'process')
+
+# Limits checked before an uploaded workbook is opened, in bytes (see
+# PowerMasonProject/validation.py).  Compression ratios beyond the limit mark
+# zip bombs.
+
+IMPORT_LIMITS = {
+    'max_bytes': int(os.environ.get('IMPORT_MAX_BYTES', 20 * 1024 * 1024)),
+    'max_uncompressed_bytes': int(os.environ.get('IMPORT_MAX_UNCOMPRESSED_BYTES', 200 * 1024 * 1024)),
+    'max_compression_ratio': 100,
+    'max_members': 1000,
+}
+
+# Bounds of the content-hash cache of already imported workbooks
+
+IMPORT_CACHE_MAX_ENTRIES = 1000
+IMPORT_CACHE_MAX_AGE_DAYS = 30
+
+# Uploaded files (stored import jobs)
+
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Cache of rendered page fragments and query results (see
+# PowerMasonProject/caching.py).  Keys follow the database state, so local
+# memory stays correct with several workers; point CACHE_DIR at a shared
+# directory to let them share entries.
+
+if os.environ.get('CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['CACHE_DIR'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'powermason',
+        }
+    }
+
+VIEW_CACHE_ALIAS = 'default'
+
+# Entries are invalidated by version bumps and database state; this only
+# bounds how long superseded versions linger
+
+VIEW_CACHE_TIMEOUT = int(os.environ.get('VIEW_CACHE_TIMEOUT', str(24 * 60 * 60)))
+
+# Request instrumentation (see PowerMasonProject/instrumentation.py): requests
+# slower than this are logged to "powermason.performance"
+
+SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', '500'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'powermason.performance': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+        'powermason.imports': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
@@ -0,0 +1,15 @@
+"""
+Settings for the test run (``python manage.py test`` selects them).
+
+The tests render pages without running collectstatic first, so static files
+use plain storage: the manifest storage of the real settings refuses names
+it has no manifest entry for.
+"""
+from .settings import *  # noqa: F401,F403
+
+STORAGES = {
+    **STORAGES,  # noqa: F405
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}